@@ -0,0 +1,39 @@
+"""
+Comando de mantenimiento: recalcula las columnas de búsqueda normalizadas de 'libros'.
+
+Las columnas titulo_norm, autor_norm, editorial_norm y categorias_norm se crean y se
+rellenan con la migración 2 de schemas.json. Después las escribe la aplicación al
+guardar un libro (BookService.guardar_libro y EnrichmentService); no hay triggers,
+así que la base se puede modificar con cualquier herramienta SQLite. Los libros
+insertados o editados fuera de la aplicación quedan con esas columnas vacías o
+desactualizadas (la búsqueda sin FTS5 no los encontraría): este comando las recalcula.
+
+Uso (desde la raíz del proyecto):
+    python -m app.backfill_search_columns
+"""
+
+import sys
+import os
+
+# Añadir el directorio raíz del proyecto al sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.dependencies import DependencyFactory
+
+
+def main() -> int:
+    # get_sql_manager() aplica antes las migraciones pendientes (crea las columnas).
+    sql_manager = DependencyFactory.get_sql_manager()
+    actualizados = sql_manager.rellenar_columnas_normalizadas()
+    if actualizados < 0:
+        print("\033[1;31m❌ No se pudieron recalcular las columnas de búsqueda. Revise los errores anteriores.\033[0m")
+        return 1
+    print(f"✅ Columnas de búsqueda recalculadas para {actualizados} libros.")
+    sql_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import atexit
 import json
 import os
 import sqlite3 # Importar sqlite3 para Optional[sqlite3.Cursor] y sqlite3.Error
@@ -9,14 +10,18 @@ from typing import List, Optional, Dict, Any # Añadir Dict y Any
 # Una forma común es tener un script de ejecución en la raíz del proyecto.
 try:
     from core.sqlmanager import SQLManager
+    from core.schema_migrator import SchemaMigrator
     from core.interfaces import DataManagerInterface, BookApiInterface, HttpClientInterface
     from core.http_client import RequestsClient
     from core.data_manager import DataManager
     from features.book_info import GetBookInfo
+    from features.book_cache import BookInfoCache
     from features.book_api import GoogleBooksApi
+    from features.local_isbn_index import LocalIsbnIndex, LocalIsbnIndexApi
     from features.delete_service import DeleteService
     from features.egreso_service import EgresoService
     from features.book_service import BookService
+    from features.enrichment_service import EnrichmentService
     from features.reservation_service import ReservationService
     from features.sell_service import SellService
     from features.return_service import ReturnService
@@ -31,14 +36,18 @@ except ImportError as e:
     # print(f"Ruta del proyecto añadida a sys.path: {PROJECT_ROOT_FOR_IMPORT}")
     
     from core.sqlmanager import SQLManager
+    from core.schema_migrator import SchemaMigrator
     from core.interfaces import DataManagerInterface, BookApiInterface, HttpClientInterface
     from core.http_client import RequestsClient
     from core.data_manager import DataManager
     from features.book_info import GetBookInfo
+    from features.book_cache import BookInfoCache
     from features.book_api import GoogleBooksApi
+    from features.local_isbn_index import LocalIsbnIndex, LocalIsbnIndexApi
     from features.delete_service import DeleteService
     from features.egreso_service import EgresoService
     from features.book_service import BookService
+    from features.enrichment_service import EnrichmentService
     from features.reservation_service import ReservationService
     from features.sell_service import SellService
     from features.return_service import ReturnService
@@ -54,6 +63,11 @@ DATABASE_NAME = "library_app.db"
 # Guardar la BD en la raíz del proyecto por defecto, o en una carpeta 'data'
 # DATABASE_PATH = PROJECT_ROOT
 DATABASE_PATH = os.path.join(PROJECT_ROOT, "data") # Guardar en una carpeta 'data'
+# Índice local de ISBN para consultas sin conexión (se construye con app/import_isbn_index.py)
+ISBN_INDEX_PATH = os.path.join(DATABASE_PATH, "isbn_index.db")
+# Perfilado de consultas SQL: BOOKOS_SQL_PROFILE=1 lo activa; BOOKOS_SQL_SLOW_MS fija el umbral de consulta lenta
+SQL_PROFILE_ENABLED = os.environ.get("BOOKOS_SQL_PROFILE", "").lower() in ("1", "true", "si", "sí")
+SQL_SLOW_QUERY_MS = float(os.environ.get("BOOKOS_SQL_SLOW_MS", "100"))
 
 
 class DependencyFactory:
@@ -64,6 +78,7 @@ class DependencyFactory:
     _delete_service_instance: Optional[DeleteService] = None
     _egreso_service_instance: Optional[EgresoService] = None
     _book_service_instance: Optional[BookService] = None
+    _enrichment_service_instance: Optional[EnrichmentService] = None
     _reservation_service_instance: Optional[ReservationService] = None
     _sell_service_instance: Optional[SellService] = None
     _return_service_instance: Optional[ReturnService] = None
@@ -85,6 +100,11 @@ class DependencyFactory:
             print(f"Inicializando SQLManager con base de datos en: {db_full_path}")
             
             cls._sql_manager_instance = SQLManager(db_name=DATABASE_NAME, db_path=DATABASE_PATH)
+            if SQL_PROFILE_ENABLED:
+                cls._sql_manager_instance.activar_perfilado(SQL_SLOW_QUERY_MS)
+                # Volcar el resumen al salir de la aplicación
+                atexit.register(cls._sql_manager_instance.imprimir_perfil)
+                print(f"Perfilado de consultas SQL activado (umbral de consulta lenta: {SQL_SLOW_QUERY_MS} ms).")
             cls._initialize_database_schema(cls._sql_manager_instance)
         return cls._sql_manager_instance
 
@@ -109,7 +129,6 @@ class DependencyFactory:
 
     @classmethod
     def _initialize_database_schema(cls, sql_manager: SQLManager) -> None:
-        print(f"Intentando cargar esquemas desde: {SCHEMAS_PATH}")
         if not os.path.exists(SCHEMAS_PATH):
             print(f"Error Crítico: No se encontró el archivo de esquemas en {SCHEMAS_PATH}")
             print("La aplicación no puede continuar sin el archivo de esquemas.")
@@ -119,30 +138,41 @@ class DependencyFactory:
             return
 
         try:
-            with open(SCHEMAS_PATH, 'r', encoding='utf-8') as f: # Especificar encoding
-                schemas = json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"Error Crítico: Error al decodificar el archivo JSON de esquemas {SCHEMAS_PATH}: {e}")
-            return 
+            with open(SCHEMAS_PATH, 'rb') as f:
+                contenido = f.read()
         except Exception as e:
             print(f"Error Crítico: Error inesperado al leer {SCHEMAS_PATH}: {e}")
             return
+
+        migrator = SchemaMigrator(sql_manager)
+        huella = SchemaMigrator.huella(contenido)
+
+        # Arranque en caliente: si la base ya tiene aplicado este mismo schemas.json
+        # no hace falta parsearlo ni verificar tabla por tabla.
+        try:
+            if migrator.esta_al_dia(huella):
+                print("Esquema de base de datos al día.")
+                return
+        except Exception as e:
+            print(f"Advertencia: No se pudo leer la huella del esquema, se verificará completo: {e}")
+
+        print(f"Cargando esquemas desde: {SCHEMAS_PATH}")
+        try:
+            schemas = json.loads(contenido.decode('utf-8'))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            print(f"Error Crítico: Error al decodificar el archivo JSON de esquemas {SCHEMAS_PATH}: {e}")
+            return 
             
         if 'tablas' not in schemas or not isinstance(schemas['tablas'], list):
             print(f"Error Crítico: El archivo de esquemas {SCHEMAS_PATH} no tiene el formato esperado (falta la lista 'tablas').")
             return
 
-        print("Creando/Verificando tablas de la base de datos...")
         try:
-            for tabla_info in schemas['tablas']:
-                nombre_tabla = tabla_info.get('nombre')
-                definicion_tabla = tabla_info.get('definicion')
-                
-                if nombre_tabla and definicion_tabla:
-                    print(f"Procesando tabla: {nombre_tabla}...")
-                    sql_manager.crear_hoja_si_no_existe(nombre_tabla, definicion_tabla)
-                else:
-                    print(f"Advertencia: Entrada de tabla incompleta en schemas.json (faltan 'nombre' o 'definicion'): {tabla_info}")
+            # Tablas base, migraciones pendientes e índices faltantes (ver core/schema_migrator.py)
+            migrator.aplicar(schemas)
+            # La huella solo se guarda si todo quedó aplicado; si no, se reintenta en el próximo arranque.
+            if migrator.verificar(schemas):
+                migrator.guardar_huella(huella)
             print("Inicialización de esquemas de base de datos completada.")
         except Exception as e:
             print(f"Error durante la inicialización del esquema de la base de datos: {e}")
@@ -164,10 +194,28 @@ class DependencyFactory:
             
             # Crear la instancia de GoogleBooksApi
             google_books_api = GoogleBooksApi(http_client=http_client)
+            apis = [google_books_api]
+
+            # El índice local (si se importó) va primero: responde sin red en microsegundos
+            indice_local = LocalIsbnIndex(ISBN_INDEX_PATH)
+            if indice_local.disponible():
+                apis.insert(0, LocalIsbnIndexApi(indice_local))
+                print(f"Índice local de ISBN disponible en: {ISBN_INDEX_PATH}")
             
-            # Crear GetBookInfo con la API de Google Books
-            cls._get_book_info_instance = GetBookInfo(apis=[google_books_api])
-            print("Servicio de información de libros inicializado con Google Books API.")
+            # Caché persistente por ISBN: repetir un ISBN no vuelve a consultar la API
+            cache = BookInfoCache(cls.get_data_manager())
+            # Purga al arrancar: sin ella la tabla solo crece. Las entradas caducadas hace
+            # menos de un TTL se conservan, porque sirven de respaldo sin conexión.
+            borradas = cache.limpiar_expirados(margen_segundos=cache.ttl_segundos)
+            if borradas:
+                print(f"Caché de la API: {borradas} entradas caducadas eliminadas.")
+
+            # Crear GetBookInfo con las APIs. Con varias, se consultan en paralelo
+            # y gana la primera que conozca el libro (máximo 8 s).
+            cls._get_book_info_instance = GetBookInfo(
+                apis=apis, cache=cache, modo="primero", plazo_segundos=8.0
+            )
+            print("Servicio de información de libros inicializado con Google Books API y caché local.")
         return cls._get_book_info_instance
 
     @classmethod
@@ -191,10 +239,20 @@ class DependencyFactory:
         if cls._book_service_instance is None:
             data_manager = cls.get_data_manager()
             book_info_service = cls.get_book_info_service()
-            cls._book_service_instance = BookService(data_manager, book_info_service)
+            enrichment_service = cls.get_enrichment_service()
+            cls._book_service_instance = BookService(data_manager, book_info_service, enrichment_service)
             print("BookService inicializado.")
         return cls._book_service_instance
 
+    @classmethod
+    def get_enrichment_service(cls) -> EnrichmentService:
+        if cls._enrichment_service_instance is None:
+            data_manager = cls.get_data_manager()
+            book_info_service = cls.get_book_info_service()
+            cls._enrichment_service_instance = EnrichmentService(data_manager, book_info_service)
+            print("EnrichmentService inicializado.")
+        return cls._enrichment_service_instance
+
     @classmethod
     def get_reservation_service(cls) -> ReservationService:
         if cls._reservation_service_instance is None:
@@ -261,9 +319,9 @@ if __name__ == '__main__':
         # Necesitaríamos una implementación concreta de BookApiInterface para probar
         # from core.interfaces import BookApiInterface # Ya importada
         # class MockBookApi(BookApiInterface):
-        #     def json_data(self, isbn: str) -> Optional[Dict[str, Any]]:
+        #     def obtener_metadatos(self, isbn: str) -> Optional[BookMetadata]:
         #         if isbn == "123":
-        #             return {"items": [{"volumeInfo": {"title": "Mock Book"}}]}
+        #             return BookMetadata(isbn=isbn, titulo="Mock Book")
         #         return None
         #
         # mock_apis = [MockBookApi()]
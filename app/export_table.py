@@ -0,0 +1,49 @@
+"""
+Comando de mantenimiento: exporta tablas de la base de datos a archivos CSV.
+
+Las filas se leen por lotes (SQLManager.exportar_hoja_csv), así que la memoria
+usada es la misma para una tabla de cien filas que para una de millones.
+
+Uso (desde la raíz del proyecto):
+    python -m app.export_table libros inventario --destino exportaciones/
+    python -m app.export_table ventas detalles_venta ingresos egresos --lote 10000
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Añadir el directorio raíz del proyecto al sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.dependencies import DependencyFactory
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Exporta tablas de la base de datos a archivos CSV.")
+    parser.add_argument("tablas", nargs="+", help="Tablas a exportar (cada una a <tabla>.csv)")
+    parser.add_argument("--destino", default=".", help="Directorio de los archivos CSV (por defecto, el actual)")
+    parser.add_argument("--lote", type=int, default=5000, help="Filas leídas por lote (por defecto 5000)")
+    args = parser.parse_args()
+
+    os.makedirs(args.destino, exist_ok=True)
+    sql_manager = DependencyFactory.get_sql_manager()
+    errores = 0
+    for tabla in args.tablas:
+        ruta = os.path.join(args.destino, f"{tabla}.csv")
+        inicio = time.monotonic()
+        filas = sql_manager.exportar_hoja_csv(tabla, ruta, args.lote)
+        if filas < 0:
+            print(f"\033[1;31m❌ No se pudo exportar la tabla '{tabla}'.\033[0m")
+            errores += 1
+            continue
+        print(f"✅ {tabla}: {filas:,} filas en {ruta} ({time.monotonic() - inicio:.1f} s)")
+    sql_manager.close()
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
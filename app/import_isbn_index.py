@@ -0,0 +1,58 @@
+"""
+Comando de mantenimiento: construye el índice local de ISBN a partir de un volcado.
+
+Con el índice, las búsquedas por ISBN responden sin conexión y antes que cualquier
+API en línea (ver features/local_isbn_index.py). El volcado se lee por bloques, así
+que puede ser mucho más grande que la memoria disponible.
+
+Uso (desde la raíz del proyecto):
+    python -m app.import_isbn_index ruta/al/volcado.txt.gz
+    python -m app.import_isbn_index ol_dump_editions.txt.gz --autores ol_dump_authors.txt.gz
+    python -m app.import_isbn_index libros.csv --formato csv --lote 10000
+"""
+
+import argparse
+import sys
+import os
+import time
+
+# Añadir el directorio raíz del proyecto al sys.path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from app.dependencies import ISBN_INDEX_PATH
+from features.local_isbn_index import LocalIsbnIndex
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Construye el índice local de ISBN a partir de un volcado.")
+    parser.add_argument("volcado", help="Archivo JSON por líneas (p. ej. volcado de Open Library) o CSV; admite .gz")
+    parser.add_argument("--formato", choices=["jsonl", "csv"], help="Formato del volcado (por defecto, según la extensión)")
+    parser.add_argument("--autores", help="Volcado de autores de Open Library, para los autores citados solo por clave")
+    parser.add_argument("--lote", type=int, default=5000, help="Filas por transacción (por defecto 5000)")
+    parser.add_argument("--destino", default=ISBN_INDEX_PATH, help=f"Archivo del índice (por defecto {ISBN_INDEX_PATH})")
+    args = parser.parse_args()
+
+    for ruta in (args.volcado, args.autores):
+        if ruta and not os.path.exists(ruta):
+            print(f"\033[1;31m❌ No se encontró el archivo: {ruta}\033[0m")
+            return 1
+
+    inicio = time.monotonic()
+
+    def progreso(lineas: int, filas: int) -> None:
+        print(f"\r  {lineas:,} registros leídos, {filas:,} ISBN escritos ({time.monotonic() - inicio:.0f} s)", end="", flush=True)
+
+    print(f"Importando {args.volcado} en {args.destino}...")
+    try:
+        total = LocalIsbnIndex(args.destino).importar(args.volcado, args.formato, args.lote, progreso, args.autores)
+    except (OSError, ValueError) as e:
+        print(f"\n\033[1;31m❌ No se pudo construir el índice: {e}\033[0m")
+        return 1
+    print(f"\n✅ Índice construido con {total:,} ISBN en {time.monotonic() - inicio:.1f} s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
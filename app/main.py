@@ -23,6 +23,7 @@ from PySide6.QtCore import QTimer
 from app.dependencies import DependencyFactory                                                      
 from gui.main_window import VentanaGestionLibreria
 from gui.common.utils import load_fonts
+from gui.components.image_manager import shutdown_shared_image_manager
 
 def main():
     """
@@ -45,6 +46,13 @@ def main():
         print("Inicializando dependencias (esto configurará la base de datos)...")
         sql_manager = DependencyFactory.get_sql_manager()
         book_info_service = DependencyFactory.get_book_info_service()
+        # Completar en segundo plano los libros guardados sin datos
+        enrichment_service = DependencyFactory.get_enrichment_service()
+        enrichment_service.iniciar()
+        app.aboutToQuit.connect(enrichment_service.detener)
+        # Cerrar las conexiones de todos los hilos al salir (hace checkpoint del WAL)
+        app.aboutToQuit.connect(sql_manager.close)
+        app.aboutToQuit.connect(DependencyFactory.get_http_client().close)
         print("Dependencias inicializadas.")
     except Exception as e:
         print(f"Error Crítico al inicializar dependencias: {e}")
@@ -58,6 +66,9 @@ def main():
         # Si el error es fatal, descomentar:
         # return 1
 
+    # Detener las descargas de portadas pendientes al salir
+    app.aboutToQuit.connect(shutdown_shared_image_manager)
+
     # Crear y mostrar la ventana principal
     ventana = VentanaGestionLibreria()
     ventana.show()
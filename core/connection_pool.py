@@ -0,0 +1,151 @@
+import os
+import pathlib
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+
+class SQLiteConnectionPool:
+    """
+    Pool de conexiones SQLite con una conexión por hilo.
+
+    sqlite3 no permite compartir una conexión entre hilos de forma segura, así que
+    cada hilo que pide una conexión recibe la suya propia, que se reutiliza en
+    llamadas posteriores desde ese mismo hilo. Todas las conexiones se abren en
+    modo WAL y con un 'busy timeout', de forma que los lectores en segundo plano
+    (reportes, backups, descarga de imágenes) no bloquean al hilo de la GUI que
+    escribe, y las escrituras concurrentes esperan en lugar de fallar con
+    "database is locked".
+
+    Cuando un hilo termina (Python descarta sus datos thread-local), su conexión se
+    aparta y la cierra el siguiente hilo que use el pool, así que los hilos de corta
+    vida (executors, QThreadPool) no acumulan conexiones abiertas.
+    """
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = 5000,
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 solo_lectura: bool = False):
+        """
+        Args:
+            db_path: Ruta al archivo de la base de datos SQLite.
+            busy_timeout_ms: Milisegundos que una conexión espera un bloqueo antes de fallar.
+            on_connect: Función opcional que se llama con cada conexión nueva
+                        (p. ej. para registrar funciones SQL personalizadas).
+            solo_lectura: Abre las conexiones en modo solo lectura, sin cambiar el
+                          modo de diario del archivo (p. ej. para índices de consulta).
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.on_connect = on_connect
+        self.solo_lectura = solo_lectura
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[sqlite3.Connection] = []
+        # Conexiones de hilos que ya terminaron, a la espera de que otro hilo las cierre
+        self._por_cerrar: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        """Abre y configura una conexión nueva para el hilo actual."""
+        # check_same_thread=False solo para poder cerrarlas todas desde close_all();
+        # el pool garantiza que cada conexión se usa desde un único hilo.
+        if self.solo_lectura:
+            uri = f"{pathlib.Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if self.on_connect:
+                self.on_connect(conn)
+            return conn
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};")
+        conn.execute("PRAGMA journal_mode = WAL;")
+        # synchronous se deja en FULL (el valor por defecto): con NORMAL, en WAL, un corte de
+        # energía puede perder las últimas ventas y pagos ya confirmados.
+        conn.execute("PRAGMA foreign_keys = ON;")
+        if self.on_connect:
+            self.on_connect(conn)
+        return conn
+
+    def get(self) -> sqlite3.Connection:
+        """Devuelve la conexión del hilo actual, creándola si aún no existe."""
+        if self._por_cerrar:
+            self._cerrar_pendientes()
+        propia = getattr(self._local, "propia", None)
+        if propia is None:
+            conn = self._open()
+            propia = _ConexionDelHilo(conn)
+            # Se dispara cuando el hilo termina y Python descarta sus datos thread-local
+            propia.al_terminar = weakref.finalize(propia, SQLiteConnectionPool._al_terminar_hilo, weakref.ref(self), conn)
+            self._local.propia = propia
+            with self._lock:
+                self._connections.append(conn)
+        return propia.conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Context manager que entrega la conexión del hilo actual.
+
+        La conexión no se cierra al salir: sigue perteneciendo al hilo y se
+        reutiliza en la siguiente llamada.
+        """
+        yield self.get()
+
+    def release(self) -> None:
+        """Cierra ya la conexión del hilo actual (p. ej. al terminar un hilo de trabajo)."""
+        propia = getattr(self._local, "propia", None)
+        if propia is None:
+            return
+        self._local.propia = None
+        propia.al_terminar.detach()
+        with self._lock:
+            if propia.conn in self._connections:
+                self._connections.remove(propia.conn)
+        self._cerrar(propia.conn)
+
+    @staticmethod
+    def _al_terminar_hilo(pool_ref: "weakref.ref[SQLiteConnectionPool]", conn: sqlite3.Connection) -> None:
+        # Corre mientras Python desmonta el estado del hilo (en los hilos de Qt, tras cada
+        # QRunnable): cerrar ahí la conexión puede tumbar el proceso, así que solo se aparta
+        # y la cierra el próximo hilo que use el pool.
+        pool = pool_ref()
+        if pool is None:
+            return
+        with pool._lock:
+            if conn in pool._connections:
+                pool._connections.remove(conn)
+                pool._por_cerrar.append(conn)
+
+    def _cerrar_pendientes(self) -> None:
+        with self._lock:
+            pendientes, self._por_cerrar = self._por_cerrar, []
+        for conn in pendientes:
+            self._cerrar(conn)
+
+    @staticmethod
+    def _cerrar(conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error al cerrar una conexión del pool: {e}")
+
+    def close_all(self) -> None:
+        """Cierra todas las conexiones abiertas por el pool."""
+        with self._lock:
+            connections, self._connections = self._connections + self._por_cerrar, []
+            self._por_cerrar = []
+        for conn in connections:
+            self._cerrar(conn)
+        self._local = threading.local()
+
+
+class _ConexionDelHilo:
+    """Conexión guardada en el thread-local de un hilo; su finalizador avisa al pool."""
+
+    __slots__ = ("conn", "al_terminar", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.al_terminar: Optional[weakref.finalize] = None
@@ -1,4 +1,5 @@
 import pandas as pd
+from contextlib import nullcontext
 from typing import List, Optional # Importamos Optional por si algún método lo necesitara
 from .interfaces import DataManagerInterface
 # Importamos SQLManager para el type hint en el constructor, aunque podría ser solo DataManagerInterface
@@ -72,6 +73,16 @@ class DataManager:
         else:
             raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'execute_query'.")
 
+    def ejecutar_consulta_por_lotes(self, query: str, params_list: List[tuple]):
+        """
+        Ejecuta la misma sentencia para cada tupla de parámetros, con un solo commit,
+        si la base de datos subyacente es SQL.
+        """
+        if hasattr(self.base_de_datos, 'execute_many'):
+            return self.base_de_datos.execute_many(query, params_list)
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'execute_many'.")
+
     def obtener_datos_con_consulta(self, query: str, params: Optional[tuple] = None) -> List[dict]:
         """
         Permite obtener datos con una consulta SELECT si la base de datos subyacente es SQL.
@@ -82,6 +93,35 @@ class DataManager:
         else:
             raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'fetch_query'.")
 
+    def fetch_iter(self, query: str, params: Optional[tuple] = None, batch_size: int = 500, formato: str = "dict"):
+        """
+        Devuelve un iterador perezoso sobre las filas de una consulta SELECT, si la
+        estrategia lo soporta. 'formato' puede ser "dict", "row" o "tuple".
+        """
+        if hasattr(self.base_de_datos, 'fetch_iter'):
+            return self.base_de_datos.fetch_iter(query, params, batch_size, formato)
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'fetch_iter'.")
+
+    def leer_hoja_por_lotes(self, hoja_nombre: str, tamano_lote: int = 5000):
+        """
+        Delega la lectura por lotes de una "hoja" (tabla). Devuelve un iterador de DataFrames.
+        """
+        if hasattr(self.base_de_datos, 'leer_hoja_por_lotes'):
+            return self.base_de_datos.leer_hoja_por_lotes(hoja_nombre, tamano_lote)
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'leer_hoja_por_lotes'.")
+
+    def exportar_hoja_csv(self, hoja_nombre: str, ruta: str, tamano_lote: int = 5000) -> int:
+        """
+        Delega la exportación de una "hoja" (tabla) a un archivo CSV, leída por lotes.
+        Devuelve el número de filas exportadas, o -1 si hubo un error.
+        """
+        if hasattr(self.base_de_datos, 'exportar_hoja_csv'):
+            return self.base_de_datos.exportar_hoja_csv(hoja_nombre, ruta, tamano_lote)
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'exportar_hoja_csv'.")
+
     def get_connection(self):
         """
         Devuelve el objeto de conexión si la estrategia subyacente lo soporta.
@@ -91,6 +131,59 @@ class DataManager:
         else:
             raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'get_connection'.")
 
+    def connection(self):
+        """
+        Devuelve un context manager con la conexión del hilo actual, si la estrategia lo soporta.
+        Uso: `with data_manager.connection() as conn: ...`
+        """
+        if hasattr(self.base_de_datos, 'connection'):
+            return self.base_de_datos.connection()
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'connection'.")
+
+    def transaction(self):
+        """
+        Devuelve un context manager de unidad de trabajo: todas las sentencias
+        ejecutadas dentro del bloque se confirman con un solo commit, o se revierten
+        juntas si ocurre una excepción.
+        Uso: `with data_manager.transaction(): ...`
+        """
+        if hasattr(self.base_de_datos, 'transaction'):
+            return self.base_de_datos.transaction()
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'transaction'.")
+
+    def liberar_conexion(self):
+        """Cierra la conexión del hilo actual, si la estrategia usa una por hilo."""
+        if hasattr(self.base_de_datos, 'liberar_conexion'):
+            self.base_de_datos.liberar_conexion()
+
+    def consulta_cancelable(self, cancelado):
+        """
+        Devuelve un context manager dentro del cual las consultas del hilo actual se
+        interrumpen (ConsultaCanceladaError) en cuanto se activa el threading.Event
+        'cancelado'. Si la estrategia no lo soporta, las consultas simplemente terminan.
+        Uso: `with data_manager.consulta_cancelable(evento): ...`
+        """
+        if hasattr(self.base_de_datos, 'consulta_cancelable'):
+            return self.base_de_datos.consulta_cancelable(cancelado)
+        return nullcontext()
+
+    def activar_perfilado(self, umbral_lento_ms: float = 100.0):
+        """
+        Activa el perfilado de consultas de la estrategia subyacente, si lo soporta.
+        Devuelve el perfilador, cuyo método imprimir_resumen() muestra las estadísticas.
+        """
+        if hasattr(self.base_de_datos, 'activar_perfilado'):
+            return self.base_de_datos.activar_perfilado(umbral_lento_ms)
+        else:
+            raise NotImplementedError(f"La estrategia {type(self.base_de_datos).__name__} no soporta 'activar_perfilado'.")
+
+    def imprimir_perfil(self, limite: int = 20):
+        """Imprime el resumen del perfilado de consultas, si está activo."""
+        if hasattr(self.base_de_datos, 'imprimir_perfil'):
+            self.base_de_datos.imprimir_perfil(limite)
+
     # --- Métodos alias para compatibilidad con código que espera nombres específicos ---
 
     def execute_query(self, query: str, params: Optional[tuple] = None):
@@ -100,6 +193,12 @@ class DataManager:
         """
         return self.ejecutar_consulta_directa(query, params)
 
+    def execute_many(self, query: str, params_list: List[tuple]):
+        """
+        Alias para ejecutar_consulta_por_lotes.
+        """
+        return self.ejecutar_consulta_por_lotes(query, params_list)
+
     def fetch_query(self, query: str, params: Optional[tuple] = None) -> List[dict]:
         """
         Alias para obtener_datos_con_consulta, permite compatibilidad con código
@@ -1,15 +1,255 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
 from .interfaces import HttpClientInterface # Importación relativa de la interfaz
 
+
+class CircuitoAbiertoError(requests.exceptions.RequestException):
+    """Se lanza cuando el circuito de un host está abierto y la petición no se intenta."""
+
+
+class _CircuitBreaker:
+    """
+    Interruptor de circuito de un host.
+
+    Tras 'umbral_fallos' peticiones fallidas seguidas, el circuito se abre y las
+    peticiones a ese host fallan de inmediato durante 'enfriamiento_segundos', en
+    lugar de esperar cada una su timeout. Pasado ese tiempo se deja pasar una
+    petición de prueba: si funciona el circuito se cierra, si no se vuelve a abrir.
+    """
+
+    def __init__(self, umbral_fallos: int, enfriamiento_segundos: float):
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento_segundos = enfriamiento_segundos
+        self.fallos_consecutivos = 0
+        self.abierto_hasta = 0.0
+        self._prueba_en_curso = False
+
+    def permitir(self) -> bool:
+        if self.fallos_consecutivos < self.umbral_fallos:
+            return True
+        if time.monotonic() < self.abierto_hasta or self._prueba_en_curso:
+            return False
+        self._prueba_en_curso = True  # semiabierto: solo una petición de prueba
+        return True
+
+    def registrar_exito(self) -> None:
+        self.fallos_consecutivos = 0
+        self._prueba_en_curso = False
+
+    def registrar_fallo(self) -> None:
+        self.fallos_consecutivos += 1
+        self._prueba_en_curso = False
+        if self.fallos_consecutivos >= self.umbral_fallos:
+            self.abierto_hasta = time.monotonic() + self.enfriamiento_segundos
+
+    @property
+    def abierto(self) -> bool:
+        return self.fallos_consecutivos >= self.umbral_fallos
+
+
+class _MetricasHost:
+    """Contadores y latencias de las peticiones a un host."""
+
+    def __init__(self, max_muestras: int = 500):
+        self.peticiones = 0
+        self.errores = 0
+        self.reintentos = 0
+        self.rechazadas = 0
+        self.latencias_ms: Deque[float] = deque(maxlen=max_muestras)
+
+    def percentil(self, p: float) -> float:
+        if not self.latencias_ms:
+            return 0.0
+        ordenadas = sorted(self.latencias_ms)
+        return ordenadas[max(0, int(round(p * len(ordenadas))) - 1)]
+
+
 class RequestsClient(HttpClientInterface):
-    def get(self, url: str):
+    """
+    Cliente HTTP basado en una requests.Session compartida.
+
+    - Reutiliza conexiones (keep-alive) en lugar de abrir TCP+TLS en cada petición.
+    - Aplica timeouts de conexión y de lectura, para que un servidor colgado no
+      bloquee al llamador indefinidamente.
+    - Reintenta con espera exponencial (y jitter) los errores de red y las
+      respuestas 429/5xx, respetando la cabecera Retry-After, sin pasarse de un
+      plazo total por petición (intentos y esperas incluidos).
+    - Mantiene un interruptor de circuito por host y métricas de latencia.
+    """
+
+    ESTADOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+    def __init__(self, timeout: Tuple[float, float] = (3.05, 10.0), max_reintentos: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, pool_maxsize: int = 10,
+                 umbral_fallos: int = 5, enfriamiento_segundos: float = 30.0,
+                 plazo_total: Optional[float] = 20.0):
+        """
+        Args:
+            timeout: (segundos de conexión, segundos de lectura) por intento.
+            max_reintentos: Reintentos tras el primer intento fallido.
+            backoff_base: Espera del primer reintento; se duplica en cada uno.
+            backoff_max: Espera máxima entre reintentos.
+            pool_maxsize: Conexiones abiertas que se conservan por host.
+            umbral_fallos: Peticiones fallidas seguidas que abren el circuito de un host.
+            enfriamiento_segundos: Tiempo que el circuito permanece abierto.
+            plazo_total: Segundos máximos de una petición, contando todos sus intentos
+                         y las esperas entre ellos (None: sin límite).
+        """
+        self.timeout = timeout
+        self.max_reintentos = max_reintentos
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.umbral_fallos = umbral_fallos
+        self.enfriamiento_segundos = enfriamiento_segundos
+        self.plazo_total = plazo_total
+
+        # El pool de conexiones de urllib3 es seguro entre hilos; la sesión no guarda
+        # cookies ni estado que dependa de la petición, así que se comparte.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._circuitos: Dict[str, _CircuitBreaker] = {}
+        self._metricas: Dict[str, _MetricasHost] = {}
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[Union[float, Tuple[float, float]]] = None,
+            plazo_total: Optional[float] = None):
         """
         Realiza una solicitud GET a la URL especificada.
+        Lanza requests.exceptions.RequestException si la petición falla tras los reintentos.
+
+        'plazo_total' (por defecto, el del cliente) limita la duración de la petición
+        completa: no se reintenta si la espera hasta el siguiente intento lo agota, y
+        el timeout de cada intento se recorta a lo que queda de plazo.
         """
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Lanza una excepción para códigos de error HTTP (4xx o 5xx)
-            return response
-        except requests.exceptions.RequestException as e:
-            print(f"Error al realizar la solicitud HTTP a {url}: {e}")
-            raise
\ No newline at end of file
+        host = urlsplit(url).netloc
+        with self._lock:
+            circuito = self._circuito(host)
+            metricas = self._metricas_de(host)
+            if not circuito.permitir():
+                metricas.rechazadas += 1
+                raise CircuitoAbiertoError(f"Circuito abierto para {host}: demasiados fallos recientes.")
+
+        plazo_total = plazo_total if plazo_total is not None else self.plazo_total
+        limite = time.monotonic() + plazo_total if plazo_total is not None else None
+        intento = 0
+        while True:
+            timeout_intento = timeout or self.timeout
+            if limite is not None:
+                timeout_intento = self._recortar_timeout(timeout_intento, limite - time.monotonic())
+            inicio = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout_intento)
+                error = None
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                response, error = None, e
+            except requests.exceptions.RequestException as e:
+                # URL inválida, demasiadas redirecciones...: reintentar no ayuda
+                with self._lock:
+                    metricas.peticiones += 1
+                    metricas.errores += 1
+                    circuito.registrar_fallo()
+                print(f"Error al realizar la solicitud HTTP a {url}: {e}")
+                raise
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+
+            reintentable = error is not None or response.status_code in self.ESTADOS_REINTENTABLES
+            with self._lock:
+                metricas.peticiones += 1
+                metricas.latencias_ms.append(duracion_ms)
+                if reintentable:
+                    metricas.errores += 1
+
+            if not reintentable:
+                with self._lock:
+                    # Un 4xx (salvo 429) es un error de la petición, no del host
+                    circuito.registrar_exito()
+                try:
+                    response.raise_for_status()  # Lanza una excepción para códigos de error HTTP (4xx)
+                except requests.exceptions.RequestException as e:
+                    print(f"Error al realizar la solicitud HTTP a {url}: {e}")
+                    raise
+                return response
+
+            espera = self._espera_reintento(intento, response)
+            # Sin tiempo para esperar y volver a intentar: se da por fallida ya
+            sin_plazo = limite is not None and time.monotonic() + espera >= limite
+            if intento >= self.max_reintentos or sin_plazo:
+                with self._lock:
+                    circuito.registrar_fallo()
+                if error is None:
+                    try:
+                        response.raise_for_status()
+                    except requests.exceptions.RequestException as e:
+                        error = e
+                motivo = f"plazo de {plazo_total} s agotado" if sin_plazo else f"{intento + 1} intentos"
+                print(f"Error al realizar la solicitud HTTP a {url} tras {motivo}: {error}")
+                raise error
+
+            intento += 1
+            with self._lock:
+                metricas.reintentos += 1
+            time.sleep(espera)
+
+    def _espera_reintento(self, intento: int, response: Optional[requests.Response]) -> float:
+        """Calcula la espera antes del siguiente intento (Retry-After o backoff exponencial)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.strip().isdigit():
+                return min(float(retry_after), self.backoff_max)
+        espera = min(self.backoff_max, self.backoff_base * (2 ** intento))
+        # Jitter para que varios clientes no reintenten todos a la vez
+        return espera * random.uniform(0.5, 1.0)
+
+    @staticmethod
+    def _recortar_timeout(timeout: Union[float, Tuple[float, float]],
+                          restante: float) -> Union[float, Tuple[float, float]]:
+        """Limita el timeout de un intento (o cada parte de la tupla) al plazo que queda."""
+        restante = max(restante, 0.001)
+        if isinstance(timeout, tuple):
+            return tuple(min(t, restante) for t in timeout)
+        return min(timeout, restante)
+
+    def _circuito(self, host: str) -> _CircuitBreaker:
+        circuito = self._circuitos.get(host)
+        if circuito is None:
+            circuito = self._circuitos[host] = _CircuitBreaker(self.umbral_fallos, self.enfriamiento_segundos)
+        return circuito
+
+    def _metricas_de(self, host: str) -> _MetricasHost:
+        metricas = self._metricas.get(host)
+        if metricas is None:
+            metricas = self._metricas[host] = _MetricasHost()
+        return metricas
+
+    def metricas(self) -> Dict[str, Dict[str, Any]]:
+        """Devuelve, por host, peticiones, errores, reintentos, latencias y estado del circuito."""
+        with self._lock:
+            return {
+                host: {
+                    "peticiones": m.peticiones,
+                    "errores": m.errores,
+                    "reintentos": m.reintentos,
+                    "rechazadas_por_circuito": m.rechazadas,
+                    "p50_ms": m.percentil(0.50),
+                    "p95_ms": m.percentil(0.95),
+                    "max_ms": max(m.latencias_ms, default=0.0),
+                    "circuito_abierto": self._circuitos[host].abierto,
+                }
+                for host, m in self._metricas.items()
+            }
+
+    def close(self) -> None:
+        """Cierra las conexiones abiertas de la sesión."""
+        self.session.close()
@@ -1,15 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Tuple # Importamos los tipos necesarios
+from typing import Dict, Any, List, Optional, Tuple # Importamos los tipos necesarios
 import pandas as pd # Necesario para el type hint en DataManagerInterface
+from .models import BookMetadata
 
 class HttpClientInterface(ABC):
     @abstractmethod
-    def get(self, url: str):
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None):
         pass
 
+class ApiSinRespuestaError(Exception):
+    """La API no pudo responder (sin conexión, error HTTP...) o no puede pronunciarse sobre el ISBN."""
+
+class ConsultaCanceladaError(Exception):
+    """La consulta se interrumpió porque se canceló (p. ej. una búsqueda que ya quedó obsoleta)."""
+
 class BookApiInterface(ABC):
     @abstractmethod
-    def json_data(self, query: str):
+    def obtener_metadatos(self, isbn: str) -> Optional[BookMetadata]:
+        """
+        Consulta un ISBN y normaliza la respuesta.
+        Retorna BookMetadata si la API conoce el libro, o None si respondió que no lo conoce.
+        Lanza ApiSinRespuestaError (u otra excepción) si no pudo responder.
+        """
         pass
 
 class DataManagerInterface(ABC):
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 @dataclass
 class Ingreso:
@@ -19,4 +19,27 @@ class Egreso:
     concepto: str
     metodo_pago: str
     fecha: str
-    id_reserva: Optional[int] = None 
\ No newline at end of file
+    id_reserva: Optional[int] = None 
+
+@dataclass
+class BookMetadata:
+    """Metadatos de un libro, normalizados por cada proveedor (API) a partir de su respuesta."""
+    isbn: str
+    titulo: str = ""
+    autor: str = ""
+    editorial: str = ""
+    imagen_url: str = ""
+    categorias: List[str] = field(default_factory=list)
+
+    def a_detalles(self) -> Dict[str, Any]:
+        """Convierte los metadatos al diccionario de detalles que usan los servicios y la GUI."""
+        return {
+            "ISBN": self.isbn,
+            "Título": self.titulo or "Desconocido",
+            "Autor": self.autor or "Desconocido",
+            "Editorial": self.editorial or "Desconocido",
+            "Imagen": self.imagen_url,
+            "Categorías": list(self.categorias),
+            "Posición": "",  # Se llenará después
+            "Cantidad": 1    # Cantidad inicial, se puede ajustar después
+        }
@@ -0,0 +1,106 @@
+import re
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class _EstadisticaConsulta:
+    """Acumulado de una plantilla SQL: llamadas, tiempos y filas."""
+
+    def __init__(self, max_muestras: int):
+        self.llamadas = 0
+        self.tiempo_total_ms = 0.0
+        self.tiempo_max_ms = 0.0
+        self.filas = 0
+        # Ventana de las últimas muestras para calcular el p95 sin crecer sin límite
+        self.muestras_ms: Deque[float] = deque(maxlen=max_muestras)
+
+    def p95_ms(self) -> float:
+        if not self.muestras_ms:
+            return 0.0
+        ordenadas = sorted(self.muestras_ms)
+        indice = max(0, int(round(0.95 * len(ordenadas))) - 1)
+        return ordenadas[indice]
+
+
+class QueryProfiler:
+    """
+    Perfilador opcional de consultas SQL.
+
+    Agrupa las consultas por plantilla (el SQL con los espacios normalizados; los
+    valores van siempre como parámetros) y guarda número de llamadas, tiempo total,
+    p95 y filas devueltas/afectadas. Las consultas que superan el umbral se imprimen
+    junto con su EXPLAIN QUERY PLAN, para detectar recorridos completos de tabla.
+    """
+
+    def __init__(self, umbral_lento_ms: float = 100.0, max_muestras: int = 1000,
+                 explicar: Optional[Callable[[str, tuple], List[str]]] = None):
+        """
+        Args:
+            umbral_lento_ms: Duración a partir de la cual una consulta se considera lenta.
+            max_muestras: Muestras de latencia que se conservan por plantilla para el p95.
+            explicar: Función que devuelve el plan de ejecución de una consulta
+                      (la proporciona SQLManager).
+        """
+        self.umbral_lento_ms = umbral_lento_ms
+        self.max_muestras = max_muestras
+        self.explicar = explicar
+        self._lock = threading.Lock()
+        self._estadisticas: Dict[str, _EstadisticaConsulta] = {}
+
+    @staticmethod
+    def plantilla(query: str) -> str:
+        """Normaliza el SQL para agrupar ejecuciones de la misma consulta."""
+        return re.sub(r"\s+", " ", query).strip()
+
+    def registrar(self, query: str, params: Optional[tuple], duracion_ms: float, filas: int) -> None:
+        """Registra una ejecución. Si es lenta, la imprime con su plan de ejecución."""
+        clave = self.plantilla(query)
+        with self._lock:
+            estadistica = self._estadisticas.get(clave)
+            if estadistica is None:
+                estadistica = self._estadisticas[clave] = _EstadisticaConsulta(self.max_muestras)
+            estadistica.llamadas += 1
+            estadistica.tiempo_total_ms += duracion_ms
+            estadistica.tiempo_max_ms = max(estadistica.tiempo_max_ms, duracion_ms)
+            estadistica.filas += max(filas, 0)
+            estadistica.muestras_ms.append(duracion_ms)
+
+        if duracion_ms >= self.umbral_lento_ms:
+            print(f"\033[1;33m🐢 Consulta lenta ({duracion_ms:.1f} ms, {filas} filas): {clave}\033[0m")
+            if self.explicar:
+                for linea in self.explicar(query, params):
+                    print(f"    {linea}")
+
+    def resumen(self) -> List[Dict[str, Any]]:
+        """Devuelve las estadísticas por plantilla, ordenadas por tiempo total descendente."""
+        with self._lock:
+            filas = [
+                {
+                    "consulta": clave,
+                    "llamadas": e.llamadas,
+                    "total_ms": e.tiempo_total_ms,
+                    "promedio_ms": e.tiempo_total_ms / e.llamadas if e.llamadas else 0.0,
+                    "p95_ms": e.p95_ms(),
+                    "max_ms": e.tiempo_max_ms,
+                    "filas": e.filas,
+                }
+                for clave, e in self._estadisticas.items()
+            ]
+        return sorted(filas, key=lambda f: f["total_ms"], reverse=True)
+
+    def imprimir_resumen(self, limite: int = 20) -> None:
+        """Imprime las consultas que más tiempo acumulan."""
+        filas = self.resumen()
+        if not filas:
+            print("Perfil SQL: no se registraron consultas.")
+            return
+        print(f"Perfil SQL ({len(filas)} consultas distintas, mostrando las {min(limite, len(filas))} más costosas):")
+        print(f"{'llamadas':>8} {'total ms':>10} {'p95 ms':>8} {'max ms':>8} {'filas':>8}  consulta")
+        for f in filas[:limite]:
+            consulta = f["consulta"] if len(f["consulta"]) <= 100 else f["consulta"][:97] + "..."
+            print(f"{f['llamadas']:>8} {f['total_ms']:>10.1f} {f['p95_ms']:>8.1f} {f['max_ms']:>8.1f} {f['filas']:>8}  {consulta}")
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._estadisticas.clear()
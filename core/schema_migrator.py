@@ -0,0 +1,165 @@
+import zlib
+from typing import Any, Dict, List
+
+from .sqlmanager import SQLManager
+
+
+class SchemaMigrator:
+    """
+    Aplica el esquema declarado en schemas.json sobre una base de datos existente.
+
+    El archivo de esquemas admite tres secciones:
+      - "tablas": tablas base, creadas con CREATE TABLE IF NOT EXISTS.
+      - "migraciones": pasos versionados ({"version", "descripcion", "sentencias", "opcional"}).
+        Solo se ejecutan los pasos con versión mayor que la registrada en la tabla
+        'schema_version'; cada paso se aplica en su propia transacción. Un paso
+        "opcional" que falla (p. ej. FTS5 no disponible en este SQLite) se omite
+        sin detener los siguientes.
+      - "indices": índices secundarios ({"nombre", "tabla", "columnas", "unico"}).
+        Solo se crean los que no existen todavía.
+
+    Así, una base de datos de una tienda ya en uso recibe los pasos que le faltan
+    sin necesidad de reconstruirla.
+    """
+
+    VERSION_TABLE = "schema_version"
+    VERSION_TABLE_DEFINITION = (
+        "(version INTEGER PRIMARY KEY, descripcion TEXT, "
+        "fecha_aplicacion DATETIME DEFAULT (datetime('now', 'localtime')))"
+    )
+
+    def __init__(self, sql_manager: SQLManager):
+        self.sql_manager = sql_manager
+
+    # --- Huella del esquema (arranque rápido) ---
+
+    @staticmethod
+    def huella(contenido: bytes) -> int:
+        """
+        Calcula una huella de 31 bits del contenido de schemas.json.
+
+        Se guarda en 'PRAGMA user_version' (un entero de 32 bits con signo), así que
+        se limita a valores positivos y distintos de 0, que es el valor de una base nueva.
+        """
+        return (zlib.crc32(contenido) & 0x7FFFFFFF) or 1
+
+    def huella_guardada(self) -> int:
+        resultado = self.sql_manager.fetch_query("PRAGMA user_version")
+        return int(resultado[0]['user_version']) if resultado else 0
+
+    def esta_al_dia(self, huella: int) -> bool:
+        """Indica si la base de datos ya tiene aplicado el esquema con esta huella."""
+        return self.huella_guardada() == huella
+
+    def guardar_huella(self, huella: int) -> None:
+        # PRAGMA no admite parámetros; la huella es siempre un entero generado aquí.
+        self.sql_manager.execute_query(f"PRAGMA user_version = {int(huella)}")
+
+    def aplicar(self, schemas: Dict[str, Any]) -> None:
+        """Aplica tablas, migraciones pendientes e índices faltantes, en ese orden."""
+        self.crear_tablas(schemas.get('tablas', []))
+        self.aplicar_migraciones(schemas.get('migraciones', []))
+        self.crear_indices(schemas.get('indices', []))
+
+    def verificar(self, schemas: Dict[str, Any]) -> bool:
+        """
+        Comprueba que todas las tablas e índices declarados existen y que no quedan
+        migraciones pendientes.
+        """
+        existentes = {
+            (fila['type'], fila['name'])
+            for fila in self.sql_manager.fetch_query("SELECT type, name FROM sqlite_master")
+        }
+        faltantes = [
+            f"tabla '{t['nombre']}'" for t in schemas.get('tablas', []) if ('table', t.get('nombre')) not in existentes
+        ] + [
+            f"índice '{i['nombre']}'" for i in schemas.get('indices', []) if ('index', i.get('nombre')) not in existentes
+        ]
+        version_objetivo = max(
+            (int(m.get('version', 0)) for m in schemas.get('migraciones', []) if not m.get('opcional')), default=0
+        )
+        if self.version_actual() < version_objetivo:
+            faltantes.append(f"migraciones hasta la versión {version_objetivo}")
+
+        if faltantes:
+            print(f"Advertencia: El esquema de la base de datos está incompleto, falta: {', '.join(faltantes)}")
+            return False
+        return True
+
+    def crear_tablas(self, tablas: List[Dict[str, Any]]) -> None:
+        print("Creando/Verificando tablas de la base de datos...")
+        for tabla_info in tablas:
+            nombre_tabla = tabla_info.get('nombre')
+            definicion_tabla = tabla_info.get('definicion')
+
+            if nombre_tabla and definicion_tabla:
+                print(f"Procesando tabla: {nombre_tabla}...")
+                self.sql_manager.crear_hoja_si_no_existe(nombre_tabla, definicion_tabla)
+            else:
+                print(f"Advertencia: Entrada de tabla incompleta en schemas.json (faltan 'nombre' o 'definicion'): {tabla_info}")
+
+    def version_actual(self) -> int:
+        """Devuelve la última versión de migración aplicada (0 si no hay ninguna)."""
+        self.sql_manager.crear_hoja_si_no_existe(self.VERSION_TABLE, self.VERSION_TABLE_DEFINITION)
+        resultado = self.sql_manager.fetch_query(f"SELECT MAX(version) AS version FROM {self.VERSION_TABLE}")
+        if resultado and resultado[0]['version'] is not None:
+            return int(resultado[0]['version'])
+        return 0
+
+    def aplicar_migraciones(self, migraciones: List[Dict[str, Any]]) -> int:
+        """
+        Ejecuta las migraciones cuya versión es mayor que la actual.
+
+        Returns:
+            La versión del esquema tras aplicar las migraciones.
+        """
+        version = self.version_actual()
+        pendientes = sorted(
+            (m for m in migraciones if int(m.get('version', 0)) > version),
+            key=lambda m: int(m['version'])
+        )
+        for migracion in pendientes:
+            numero = int(migracion['version'])
+            descripcion = migracion.get('descripcion', '')
+            print(f"Aplicando migración {numero}: {descripcion}...")
+            try:
+                with self.sql_manager.transaction():
+                    for sentencia in migracion.get('sentencias', []):
+                        self.sql_manager.execute_query(sentencia)
+                    self.sql_manager.execute_query(
+                        f"INSERT INTO {self.VERSION_TABLE} (version, descripcion) VALUES (?, ?)",
+                        (numero, descripcion)
+                    )
+            except Exception as e:
+                if migracion.get('opcional'):
+                    print(f"⚠️  Migración opcional {numero} omitida: {e}")
+                    continue
+                # Una migración fallida detiene las siguientes: dependen de ella.
+                print(f"\033[1;31m❌ Error al aplicar la migración {numero}: {e}\033[0m")
+                break
+            version = numero
+            print(f"✅ Migración {numero} aplicada.")
+        return version
+
+    def crear_indices(self, indices: List[Dict[str, Any]]) -> int:
+        """
+        Crea los índices declarados que aún no existen.
+
+        Returns:
+            Número de índices creados.
+        """
+        creados = 0
+        for indice in indices:
+            nombre = indice.get('nombre')
+            tabla = indice.get('tabla')
+            columnas = indice.get('columnas') or []
+            if not nombre or not tabla or not columnas:
+                print(f"Advertencia: Entrada de índice incompleta en schemas.json (faltan 'nombre', 'tabla' o 'columnas'): {indice}")
+                continue
+            if self.sql_manager.crear_indice_si_no_existe(nombre, tabla, columnas, bool(indice.get('unico', False))):
+                creados += 1
+
+        if creados:
+            # Actualiza las estadísticas del planificador para que use los índices nuevos
+            self.sql_manager.execute_query("PRAGMA optimize")
+        return creados
@@ -1,13 +1,19 @@
+import csv
 import sqlite3
+import threading
+import time
 import pandas as pd
-from typing import List, Optional, Any, Dict
-from .interfaces import DataManagerInterface
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Any, Dict, Union
+from .interfaces import ConsultaCanceladaError, DataManagerInterface
+from .connection_pool import SQLiteConnectionPool
+from .query_profiler import QueryProfiler
 import os # Para construir la ruta a la base de datos
 from features.utils import normalize_for_search
 
 
 class SQLManager(DataManagerInterface):
-    def __init__(self, db_name="library_app.db", db_path: Optional[str] = None):
+    def __init__(self, db_name="library_app.db", db_path: Optional[str] = None, busy_timeout_ms: int = 5000):
         """
         Inicializa el SQLManager.
 
@@ -15,6 +21,8 @@ class SQLManager(DataManagerInterface):
             db_name: Nombre del archivo de la base de datos SQLite.
             db_path: Ruta opcional al directorio donde se almacenará la base de datos.
                      Si es None, se usará el directorio del script actual o uno predefinido.
+            busy_timeout_ms: Tiempo que una conexión espera a que se libere un bloqueo
+                             antes de fallar con "database is locked".
         """
         if db_path is None:
             # Por defecto, podríamos querer la BD en la raíz del proyecto o en una carpeta 'data'
@@ -25,21 +33,158 @@ class SQLManager(DataManagerInterface):
         else:
             self.db_path = os.path.join(db_path, db_name)
         
-        self.conn = self._create_connection()
+        # Una conexión por hilo: la GUI escribe mientras los hilos de fondo leen (modo WAL).
+        self.pool = SQLiteConnectionPool(self.db_path, busy_timeout_ms=busy_timeout_ms,
+                                         on_connect=self._configure_connection)
+        # Profundidad de transacciones anidadas, independiente para cada hilo.
+        self._tx_state = threading.local()
+        # Evento de cancelación de las consultas del hilo (ver consulta_cancelable)
+        self._cancel_state = threading.local()
+        # Perfilador de consultas; desactivado (None) salvo que se llame a activar_perfilado()
+        self.profiler: Optional[QueryProfiler] = None
+        # Abrir ya la conexión del hilo principal para detectar errores al arrancar.
+        self._create_connection()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Conexión del hilo actual (compatibilidad con el código que usa self.conn)."""
+        return self.pool.get()
 
     def get_connection(self) -> sqlite3.Connection:
-        """Devuelve la conexión activa a la base de datos."""
-        return self.conn
+        """Devuelve la conexión a la base de datos del hilo actual."""
+        return self.pool.get()
 
-    def _create_connection(self) -> sqlite3.Connection:
-        """Crea y retorna una conexión a la base de datos SQLite."""
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Entrega la conexión del hilo actual para usarla dentro de un bloque 'with'.
+
+        Es seguro llamarlo desde cualquier hilo; cada hilo recibe su propia conexión.
+        """
+        with self.pool.connection() as conn:
+            yield conn
+
+    def _in_transaction(self) -> bool:
+        """Indica si el hilo actual está dentro de un bloque transaction()."""
+        return getattr(self._tx_state, "depth", 0) > 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Unidad de trabajo: agrupa todas las sentencias del bloque en un único commit.
+
+        Dentro del bloque, execute_query no hace commit y los errores de SQLite se
+        relanzan en lugar de devolver None, para que cualquier fallo revierta la
+        transacción completa. Los bloques anidados se unen a la transacción exterior.
+
+        Uso:
+            with sql_manager.transaction():
+                sql_manager.execute_query(...)
+                sql_manager.execute_query(...)
+        """
+        conn = self.conn
+        depth = getattr(self._tx_state, "depth", 0)
+        if depth == 0:
+            # IMMEDIATE toma el bloqueo de escritura al inicio y evita fallos al
+            # pasar de lectura a escritura a mitad de la transacción.
+            conn.execute("BEGIN IMMEDIATE")
+        self._tx_state.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._tx_state.depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        else:
+            self._tx_state.depth = depth
+            if depth == 0:
+                conn.commit()
+
+    # --- Consultas cancelables ---
+
+    # Instrucciones de la VM de SQLite entre dos comprobaciones de cancelación
+    PASOS_ENTRE_COMPROBACIONES = 1000
+
+    @contextmanager
+    def consulta_cancelable(self, cancelado: threading.Event) -> Iterator[None]:
+        """
+        Permite abortar desde otro hilo las consultas que este hilo hace dentro del bloque.
+
+        SQLite llama a un progress handler cada PASOS_ENTRE_COMPROBACIONES instrucciones;
+        si 'cancelado' está activo, la consulta en curso se interrumpe y fetch_query
+        lanza ConsultaCanceladaError en lugar de devolver un resultado incompleto.
+        Se usa el progress handler y no Connection.interrupt() porque la conexión es
+        del hilo que consulta: quien cancela solo tiene que activar el evento.
+        Uso: `with sql_manager.consulta_cancelable(evento): ...`
+        """
+        if cancelado.is_set():
+            raise ConsultaCanceladaError("La consulta se canceló antes de empezar.")
+        conn = self.conn
+        anterior = getattr(self._cancel_state, "evento", None)
+        self._cancel_state.evento = cancelado
+        conn.set_progress_handler(cancelado.is_set, self.PASOS_ENTRE_COMPROBACIONES)
         try:
-            conn = sqlite3.connect(self.db_path)
-            # Habilitar claves foráneas (buena práctica)
-            conn.execute("PRAGMA foreign_keys = ON;")
-            conn.create_function("normalize", 1, normalize_for_search)
+            yield
+        finally:
+            if anterior is not None:
+                conn.set_progress_handler(anterior.is_set, self.PASOS_ENTRE_COMPROBACIONES)
+            else:
+                conn.set_progress_handler(None, 0)
+            self._cancel_state.evento = anterior
+
+    def _consulta_cancelada(self) -> bool:
+        evento = getattr(self._cancel_state, "evento", None)
+        return evento is not None and evento.is_set()
 
-            return conn
+    # --- Perfilado de consultas (opcional) ---
+
+    def activar_perfilado(self, umbral_lento_ms: float = 100.0) -> QueryProfiler:
+        """
+        Empieza a medir todas las consultas que pasan por execute_query y fetch_query.
+        Las que tardan más de 'umbral_lento_ms' se imprimen con su EXPLAIN QUERY PLAN.
+        """
+        if self.profiler is None:
+            self.profiler = QueryProfiler(umbral_lento_ms=umbral_lento_ms, explicar=self._explicar_consulta)
+        else:
+            self.profiler.umbral_lento_ms = umbral_lento_ms
+        return self.profiler
+
+    def desactivar_perfilado(self) -> None:
+        self.profiler = None
+
+    def imprimir_perfil(self, limite: int = 20) -> None:
+        """Imprime el resumen del perfilado, si está activo."""
+        profiler = self.profiler
+        if profiler:
+            profiler.imprimir_resumen(limite)
+
+    def _explicar_consulta(self, query: str, params: Optional[tuple]) -> List[str]:
+        """Devuelve el EXPLAIN QUERY PLAN de una consulta como lista de líneas."""
+        if query.lstrip().split(None, 1)[0].upper() not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+            return []
+        try:
+            plan = self.conn.execute(f"EXPLAIN QUERY PLAN {query}", params or ()).fetchall()
+            return [row[3] for row in plan]
+        except sqlite3.Error as e:
+            return [f"(no se pudo obtener el plan: {e})"]
+
+    def close(self):
+        """Cierra todas las conexiones abiertas por el pool."""
+        self.pool.close_all()
+
+    def liberar_conexion(self):
+        """Cierra la conexión del hilo actual; llamarlo al terminar un hilo de trabajo propio."""
+        self.pool.release()
+
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """Registra las funciones SQL personalizadas en cada conexión nueva."""
+        conn.create_function("normalize", 1, normalize_for_search, deterministic=True)
+
+    def _create_connection(self) -> sqlite3.Connection:
+        """Crea (si no existe) y retorna la conexión del hilo actual."""
+        try:
+            return self.pool.get()
         except sqlite3.Error as e:
             print(f"Error al conectar con la base de datos SQLite '{self.db_path}': {e}")
             raise
@@ -54,15 +199,51 @@ class SQLManager(DataManagerInterface):
 
         Returns:
             El cursor de la ejecución si tiene éxito, None si falla.
+            Dentro de transaction() no hace commit y relanza el error en lugar de devolver None.
         """
         try:
-            cursor = self.conn.cursor()
+            conn = self.conn
+            cursor = conn.cursor()
+            profiler = self.profiler # Se lee una vez: otro hilo puede desactivarlo a mitad de la consulta
+            inicio = time.perf_counter() if profiler else 0.0
             cursor.execute(query, params or ())
-            self.conn.commit()
+            if not self._in_transaction():
+                conn.commit()
+            if profiler:
+                profiler.registrar(query, params, (time.perf_counter() - inicio) * 1000, cursor.rowcount)
             return cursor
         except sqlite3.Error as e:
             print(f"Error al ejecutar la consulta: {query}\nError: {e}")
-            # Considerar si relanzar la excepción o cómo manejarla
+            if self._in_transaction():
+                raise # Deja que transaction() revierta toda la unidad de trabajo
+            return None
+
+    def execute_many(self, query: str, params_list: List[tuple]) -> Optional[sqlite3.Cursor]:
+        """
+        Ejecuta la misma sentencia para cada tupla de parámetros (cursor.executemany),
+        con un único commit. Útil para actualizaciones por lotes.
+
+        Returns:
+            El cursor de la ejecución si tiene éxito, None si falla.
+            Dentro de transaction() no hace commit y relanza el error en lugar de devolver None.
+        """
+        conn = self.conn
+        try:
+            cursor = conn.cursor()
+            profiler = self.profiler
+            inicio = time.perf_counter() if profiler else 0.0
+            cursor.executemany(query, params_list)
+            if not self._in_transaction():
+                conn.commit()
+            if profiler:
+                profiler.registrar(query, None, (time.perf_counter() - inicio) * 1000, cursor.rowcount)
+            return cursor
+        except sqlite3.Error as e:
+            print(f"Error al ejecutar la consulta por lotes: {query}\nError: {e}")
+            if self._in_transaction():
+                raise # Deja que transaction() revierta toda la unidad de trabajo
+            # Las filas anteriores al error quedaron en la transacción implícita: se descartan
+            conn.rollback()
             return None
 
     def fetch_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
@@ -78,15 +259,79 @@ class SQLManager(DataManagerInterface):
             Retorna una lista vacía si no hay resultados o en caso de error.
         """
         try:
-            self.conn.row_factory = sqlite3.Row # Permite acceder a las columnas por nombre
-            cursor = self.conn.cursor()
+            cursor = self.conn.cursor() # Las conexiones del pool ya usan sqlite3.Row
+            profiler = self.profiler
+            inicio = time.perf_counter() if profiler else 0.0
             cursor.execute(query, params or ())
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows] # Convertir cada sqlite3.Row a un diccionario
+            # Convertir cada sqlite3.Row a un diccionario mientras se itera el cursor,
+            # sin materializar antes una lista intermedia de sqlite3.Row.
+            rows = [dict(row) for row in cursor]
+            if profiler:
+                profiler.registrar(query, params, (time.perf_counter() - inicio) * 1000, len(rows))
+            return rows
         except sqlite3.Error as e:
+            if self._consulta_cancelada():
+                raise ConsultaCanceladaError("La consulta se canceló.") from e
             print(f"Error al ejecutar la consulta de búsqueda: {query}\nError: {e}")
+            if self._in_transaction():
+                raise
             return []
 
+    def fetch_iter(self, query: str, params: Optional[tuple] = None, batch_size: int = 500,
+                   formato: str = "dict") -> Iterator[Union[Dict[str, Any], sqlite3.Row, tuple]]:
+        """
+        Ejecuta una consulta SELECT y entrega las filas de forma perezosa, por lotes.
+
+        A diferencia de fetch_query, nunca tiene todo el resultado en memoria: solo el
+        lote actual. Pensado para exportaciones y reportes grandes.
+
+        Args:
+            query: La consulta SQL SELECT a ejecutar.
+            params: Tupla opcional de parámetros para la consulta.
+            batch_size: Filas que se leen de SQLite en cada llamada a fetchmany().
+            formato: "dict" (por defecto), "row" (sqlite3.Row, acceso por nombre e índice
+                     sin copiar) o "tuple" (lo más liviano).
+
+        Yields:
+            Una fila por iteración, en el formato pedido. En caso de error no entrega
+            más filas (fuera de una transacción) o relanza la excepción (dentro de una).
+        """
+        if formato not in ("dict", "row", "tuple"):
+            raise ValueError(f"Formato de fila no soportado: '{formato}'. Use 'dict', 'row' o 'tuple'.")
+        # La validación ocurre al llamar; la lectura, al iterar.
+        return self._iterar_filas(query, params, batch_size, formato)
+
+    def _iterar_filas(self, query: str, params: Optional[tuple], batch_size: int, formato: str,
+                      relanzar_errores: bool = False):
+        cursor = self.conn.cursor()
+        if formato == "tuple":
+            cursor.row_factory = None # Ignora el sqlite3.Row de la conexión solo en este cursor
+        total = 0
+        profiler = self.profiler
+        inicio = time.perf_counter() if profiler else 0.0
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                lote = cursor.fetchmany(batch_size)
+                if not lote:
+                    break
+                total += len(lote)
+                if formato == "dict":
+                    for row in lote:
+                        yield dict(row)
+                else:
+                    yield from lote
+        except sqlite3.Error as e:
+            if self._consulta_cancelada():
+                raise ConsultaCanceladaError("La consulta se canceló.") from e
+            print(f"Error al ejecutar la consulta de búsqueda: {query}\nError: {e}")
+            if self._in_transaction() or relanzar_errores:
+                raise
+        finally:
+            cursor.close()
+            if profiler:
+                profiler.registrar(query, params, (time.perf_counter() - inicio) * 1000, total)
+
     # --- Implementación de DataManagerInterface ---
 
     def crear_hoja_si_no_existe(self, hoja_nombre: str, columnas_definicion: str):
@@ -133,9 +378,59 @@ class SQLManager(DataManagerInterface):
             # El error ya se imprimió dentro de execute_query
             print(f"ℹ️  Hubo un problema al intentar crear/verificar la tabla '{hoja_nombre}'. Revise los errores anteriores.")
 
+    def crear_indice_si_no_existe(self, indice_nombre: str, hoja_nombre: str, columnas: List[str], unico: bool = False) -> bool:
+        """
+        Crea un índice sobre una tabla si aún no existe.
+
+        Args:
+            indice_nombre: Nombre del índice.
+            hoja_nombre: Tabla sobre la que se crea el índice.
+            columnas: Columnas del índice, en orden.
+            unico: Si es True se crea un índice UNIQUE.
+
+        Returns:
+            True si el índice se creó en esta llamada, False si ya existía o hubo un error.
+        """
+        identificadores = [indice_nombre, hoja_nombre, *columnas]
+        if not columnas or any(not nombre or not nombre.replace('_', '').isalnum() for nombre in identificadores):
+            print(f"\033[1;31m❌ Error: Definición de índice '{indice_nombre}' no es válida. Use solo caracteres alfanuméricos y guion bajo.\033[0m")
+            return False
+
+        existente = self.fetch_query("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (indice_nombre,))
+        if existente:
+            return False
+
+        unique_sql = "UNIQUE " if unico else ""
+        query = f"CREATE {unique_sql}INDEX IF NOT EXISTS {indice_nombre} ON {hoja_nombre} ({', '.join(columnas)})"
+        if self.execute_query(query) is None:
+            print(f"ℹ️  Hubo un problema al intentar crear el índice '{indice_nombre}'. Revise los errores anteriores.")
+            return False
+        print(f"✅ Índice '{indice_nombre}' creado en '{hoja_nombre}'.")
+        return True
+
+    def rellenar_columnas_normalizadas(self) -> int:
+        """
+        Recalcula las columnas de búsqueda normalizadas (titulo_norm, autor_norm,
+        editorial_norm, categorias_norm) de todos los libros.
+
+        La aplicación ya las escribe al guardar cada libro; esto sirve para bases
+        antiguas o para filas insertadas o editadas con herramientas externas.
+
+        Returns:
+            Número de libros actualizados, o -1 si hubo un error.
+        """
+        query = """
+            UPDATE libros SET
+                titulo_norm = normalize(titulo), autor_norm = normalize(autor),
+                editorial_norm = normalize(editorial), categorias_norm = normalize(categorias)
+        """
+        cursor = self.execute_query(query)
+        return cursor.rowcount if cursor else -1
+
     def leer_hoja(self, hoja_nombre: str) -> pd.DataFrame:
         """
         Lee todos los datos de una tabla y los devuelve como un DataFrame de Pandas.
+        Carga la tabla entera: para tablas grandes, use leer_hoja_por_lotes o exportar_hoja_csv.
         """
         if not hoja_nombre.isalnum() and '_' not in hoja_nombre:
              print(f"Error: Nombre de tabla '{hoja_nombre}' no es válido para leer.")
@@ -149,6 +444,58 @@ class SQLManager(DataManagerInterface):
             print(f"Error al leer la tabla '{hoja_nombre}' a DataFrame: {e}")
             return pd.DataFrame() # Retorna DataFrame vacío en caso de error
 
+    def leer_hoja_por_lotes(self, hoja_nombre: str, tamano_lote: int = 5000) -> Iterator[pd.DataFrame]:
+        """
+        Lee una tabla como una secuencia de DataFrames de 'tamano_lote' filas,
+        para exportar tablas grandes sin cargarlas completas en memoria.
+        """
+        if not hoja_nombre.replace('_', '').isalnum():
+            print(f"Error: Nombre de tabla '{hoja_nombre}' no es válido para leer.")
+            return
+
+        query = f"SELECT * FROM {hoja_nombre}"
+        try:
+            yield from pd.read_sql_query(query, self.conn, chunksize=tamano_lote)
+        except Exception as e:
+            print(f"Error al leer la tabla '{hoja_nombre}' por lotes: {e}")
+
+    def exportar_hoja_csv(self, hoja_nombre: str, ruta: str, tamano_lote: int = 5000) -> int:
+        """
+        Escribe una tabla completa en un archivo CSV con cabecera.
+
+        Las filas se leen por lotes (como tuplas, sin copiarlas a diccionarios), así
+        que la memoria usada no depende del tamaño de la tabla. Se escribe primero un
+        archivo temporal: si la lectura falla a mitad, no queda un CSV incompleto.
+
+        Returns:
+            Número de filas exportadas, o -1 si hubo un error.
+        """
+        if not hoja_nombre.replace('_', '').isalnum():
+            print(f"Error: Nombre de tabla '{hoja_nombre}' no es válido para exportar.")
+            return -1
+        columnas = [fila['name'] for fila in self.fetch_query(f"PRAGMA table_info({hoja_nombre})")]
+        if not columnas:
+            print(f"Error: La tabla '{hoja_nombre}' no existe.")
+            return -1
+
+        query = f"SELECT {', '.join(f'[{c}]' for c in columnas)} FROM {hoja_nombre}"
+        ruta_temporal = ruta + ".tmp"
+        exportadas = 0
+        try:
+            with open(ruta_temporal, "w", encoding="utf-8", newline="") as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(columnas)
+                for fila in self._iterar_filas(query, None, tamano_lote, "tuple", relanzar_errores=True):
+                    escritor.writerow(fila)
+                    exportadas += 1
+            os.replace(ruta_temporal, ruta)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error al exportar la tabla '{hoja_nombre}' a '{ruta}': {e}")
+            if os.path.exists(ruta_temporal):
+                os.remove(ruta_temporal)
+            return -1
+        return exportadas
+
     def escribir_hoja(self, *args, **kwargs):
         raise NotImplementedError("El método escribir_hoja no está implementado porque no es necesario en SQLManager.")
 
@@ -162,16 +509,17 @@ class SQLManager(DataManagerInterface):
         Obtiene todos los ingresos para una fecha específica.
         La fecha debe estar en formato 'YYYY-MM-DD'.
         """
-        query = "SELECT * FROM ingresos WHERE date(fecha) = ?"
-        return self.fetch_query(query, (date,))
+        # Rango en lugar de date(fecha) = ? para que la consulta use el índice sobre 'fecha'
+        query = "SELECT * FROM ingresos WHERE fecha >= ? AND fecha < date(?, '+1 day')"
+        return self.fetch_query(query, (date, date))
 
     def get_egresos_by_date(self, date: str) -> List[Dict[str, Any]]:
         """
         Obtiene todos los egresos para una fecha específica.
         La fecha debe estar en formato 'YYYY-MM-DD'.
         """
-        query = "SELECT * FROM egresos WHERE date(fecha) = ?"
-        return self.fetch_query(query, (date,))
+        query = "SELECT * FROM egresos WHERE fecha >= ? AND fecha < date(?, '+1 day')"
+        return self.fetch_query(query, (date, date))
 
     def update_ingreso(self, id_ingreso: int, monto: float, concepto: str, metodo_pago: str) -> bool:
         """
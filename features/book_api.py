@@ -1,28 +1,61 @@
 # No es necesario 'import requests' aquí directamente si HttpClientInterface lo abstrae.
-from core.interfaces import BookApiInterface, HttpClientInterface
+from typing import Any, Dict, Optional
+
+from core.interfaces import ApiSinRespuestaError, BookApiInterface, HttpClientInterface
+from core.models import BookMetadata
 
 class GoogleBooksApi(BookApiInterface):
+    # Respuesta parcial: solo los campos que se usan, en lugar del volumen completo
+    # (descripción, enlaces de venta, identificadores, etc.).
+    CAMPOS = "totalItems,items(volumeInfo(title,authors,publisher,categories,imageLinks/thumbnail))"
+
     def __init__(self, http_client: HttpClientInterface):
         self.base_url = "https://www.googleapis.com/books/v1/volumes"
         self.http_client = http_client
 
-    def json_data(self, isbn: str): # Cambiado el nombre del parámetro a 'isbn' para claridad
+    def json_data(self, isbn: str) -> Dict[str, Any]: # Cambiado el nombre del parámetro a 'isbn' para claridad
         """
         Busca datos de un libro por ISBN usando la API de Google Books.
-        Retorna los datos en formato JSON (como un diccionario).
+        Retorna los datos en formato JSON (como un diccionario), limitados a CAMPOS.
         """
         # Validar que el isbn no esté vacío podría ser una buena adición aquí
         if not isbn:
             # Podrías retornar un error, un diccionario vacío, o None
             print("Advertencia: El ISBN proporcionado está vacío.")
-            return {} 
+            return {}
 
-        url = f"{self.base_url}?q=isbn:{isbn}"
+        params = {"q": f"isbn:{isbn}", "fields": self.CAMPOS, "maxResults": 1}
         try:
-            response = self.http_client.get(url) # http_client.get ya debería manejar errores de request
+            response = self.http_client.get(self.base_url, params=params) # http_client.get ya debería manejar errores de request
             return response.json()
         except Exception as e:
             # Si http_client.get relanza excepciones, o si response.json() falla
             print(f"Error al obtener o procesar datos de Google Books para ISBN {isbn}: {e}")
             # Devolver un diccionario vacío o None podría ser apropiado aquí
-            return {}
\ No newline at end of file
+            return {}
+
+    def obtener_metadatos(self, isbn: str) -> Optional[BookMetadata]:
+        data = self.json_data(isbn)
+        # json_data devuelve {} cuando la petición falla; una respuesta real sin
+        # resultados trae igualmente "totalItems": 0.
+        if not data:
+            raise ApiSinRespuestaError(f"Google Books no respondió para el ISBN {isbn}.")
+        items = data.get("items") or []
+        if not items:
+            return None
+
+        volume_info = items[0].get("volumeInfo", {}) # Usar .get() para seguridad
+        # Extraer categorías, asegurando que sea una lista
+        categories = volume_info.get("categories", [])
+        if not isinstance(categories, list):
+            categories = [str(categories)] if categories else []
+        authors = volume_info.get("authors") or []
+        return BookMetadata(
+            isbn=isbn,
+            titulo=volume_info.get("title", ""),
+            # Se toma el primer autor si hay varios
+            autor=authors[0] if authors else "",
+            editorial=volume_info.get("publisher", ""),
+            imagen_url=volume_info.get("imageLinks", {}).get("thumbnail", ""),
+            categorias=categories,
+        )
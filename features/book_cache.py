@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from core.interfaces import DataManagerInterface
+
+
+class BookInfoCache:
+    """
+    Caché persistente de la información de libros obtenida de las APIs, por ISBN.
+
+    Se guarda en la tabla 'api_cache' de la base de datos, así que sobrevive a
+    reinicios y permite repetir búsquedas sin conexión. Los libros encontrados
+    caducan tras 'ttl_segundos'; los ISBN que ninguna API conoce se recuerdan
+    como "no encontrado" durante un plazo más corto ('ttl_no_encontrado_segundos'),
+    por si la API los incorpora más adelante.
+    """
+
+    TABLA = "api_cache"
+
+    def __init__(self, data_manager: DataManagerInterface,
+                 ttl_segundos: int = 30 * 24 * 3600,
+                 ttl_no_encontrado_segundos: int = 24 * 3600):
+        self.data_manager = data_manager
+        self.ttl_segundos = ttl_segundos
+        self.ttl_no_encontrado_segundos = ttl_no_encontrado_segundos
+        # Las búsquedas pueden llegar desde hilos en segundo plano
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.aciertos_no_encontrado = 0
+        self.fallos = 0
+
+    def obtener(self, isbn: str, permitir_expirado: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Busca un ISBN en la caché.
+
+        Args:
+            isbn: ISBN a buscar.
+            permitir_expirado: Si es True también devuelve entradas caducadas
+                               (útil cuando no hay conexión). No cuenta en las estadísticas.
+
+        Returns:
+            {'encontrado': bool, 'datos': dict o None}, o None si no hay entrada válida.
+        """
+        try:
+            filas = self.data_manager.fetch_query(
+                f"SELECT datos, encontrado, expira_en FROM {self.TABLA} WHERE isbn = ?", (isbn,)
+            )
+        except Exception as e:
+            print(f"Error al leer la caché de la API para ISBN {isbn}: {e}")
+            filas = []
+
+        entrada = None
+        if filas and (permitir_expirado or filas[0]['expira_en'] > time.time()):
+            fila = filas[0]
+            try:
+                datos = json.loads(fila['datos']) if fila['datos'] else None
+                entrada = {'encontrado': bool(fila['encontrado']), 'datos': datos}
+            except (json.JSONDecodeError, TypeError) as e:
+                print(f"Advertencia: Entrada corrupta en la caché de la API para ISBN {isbn}: {e}")
+
+        if not permitir_expirado:
+            with self._lock:
+                if entrada is None:
+                    self.fallos += 1
+                elif entrada['encontrado']:
+                    self.aciertos += 1
+                else:
+                    self.aciertos_no_encontrado += 1
+        return entrada
+
+    def guardar(self, isbn: str, datos: Optional[Dict[str, Any]]) -> None:
+        """Guarda el resultado de una consulta. datos=None registra un "no encontrado"."""
+        encontrado = datos is not None
+        ahora = time.time()
+        ttl = self.ttl_segundos if encontrado else self.ttl_no_encontrado_segundos
+        try:
+            self.data_manager.execute_query(
+                f"INSERT OR REPLACE INTO {self.TABLA} (isbn, datos, encontrado, fecha_consulta, expira_en) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (isbn, json.dumps(datos, ensure_ascii=False) if encontrado else None,
+                 int(encontrado), ahora, ahora + ttl)
+            )
+        except Exception as e:
+            print(f"Error al guardar en la caché de la API el ISBN {isbn}: {e}")
+
+    def invalidar(self, isbn: str) -> None:
+        """Elimina la entrada de un ISBN, para forzar una nueva consulta a la API."""
+        self.data_manager.execute_query(f"DELETE FROM {self.TABLA} WHERE isbn = ?", (isbn,))
+
+    def limpiar_expirados(self, margen_segundos: float = 0) -> int:
+        """
+        Elimina las entradas caducadas hace más de 'margen_segundos' (con margen, las
+        recién caducadas se conservan como respaldo sin conexión). Retorna cuántas borró.
+        """
+        cursor = self.data_manager.execute_query(
+            f"DELETE FROM {self.TABLA} WHERE expira_en <= ?", (time.time() - margen_segundos,)
+        )
+        return cursor.rowcount if cursor is not None else 0
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Devuelve los contadores de aciertos y fallos de la caché."""
+        with self._lock:
+            consultas = self.aciertos + self.aciertos_no_encontrado + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "aciertos_no_encontrado": self.aciertos_no_encontrado,
+                "fallos": self.fallos,
+                "tasa_aciertos": (self.aciertos + self.aciertos_no_encontrado) / consultas if consultas else 0.0,
+            }
@@ -1,89 +1,262 @@
-from typing import List, Dict, Any, Optional
-from core.interfaces import BookApiInterface
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from dataclasses import fields, replace
+from typing import Callable, Iterable, List, Dict, Any, Optional, Tuple
+from core.interfaces import ApiSinRespuestaError, BookApiInterface
+from core.models import BookMetadata
+from features.book_cache import BookInfoCache
 
 class GetBookInfo:
-    def __init__(self, apis: List[BookApiInterface]):
+    """
+    Obtiene la información de un libro por ISBN a partir de una o varias APIs.
+
+    Las APIs se consultan en el orden de la lista, que es también su prioridad.
+    Cada API normaliza su propia respuesta a BookMetadata (obtener_metadatos),
+    así que aquí no se depende del formato de ninguna de ellas.
+    Modos de consulta:
+      - "secuencial": una tras otra, hasta la primera que conoce el libro.
+      - "primero": todas en paralelo; gana la primera respuesta con datos. Las
+        APIs locales (atributo es_local) se consultan antes, sin red.
+      - "fusion": todas en paralelo; se combinan los campos de todas las que
+        respondan antes del plazo, con prioridad según el orden de la lista.
+    En los modos paralelos, 'plazo_segundos' limita la espera total: las APIs
+    que no han respondido se abandonan (las que aún no empezaron se cancelan).
+    """
+
+    MODOS = ("secuencial", "primero", "fusion")
+
+    def __init__(self, apis: List[BookApiInterface], cache: Optional[BookInfoCache] = None,
+                 modo: str = "secuencial", plazo_segundos: float = 8.0):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de consulta no soportado: '{modo}'. Use uno de {self.MODOS}.")
         self.apis = apis
+        self.cache = cache
+        self.modo = modo
+        self.plazo_segundos = plazo_segundos
+        # Consultas paralelas sueltas. Dos hilos por API: deja sitio a peticiones
+        # rezagadas de búsquedas anteriores. Los hilos se arrancan al primer uso.
+        self._executor = ThreadPoolExecutor(max_workers=2 * max(1, len(apis)), thread_name_prefix="book-api")
+        # Hilos de extraer_info_batch: se reutilizan entre lotes (cada hilo tiene su
+        # conexión del pool para la caché y no conviene abrirla en cada caja).
+        # Las consultas de un lote van a su propio executor de APIs, dimensionado
+        # para el lote, para no esperar turno (contra el plazo) tras otros ISBN.
+        self._executor_lotes: Optional[ThreadPoolExecutor] = None
+        self._executor_apis_lotes: Optional[ThreadPoolExecutor] = None
+        self._hilos_lotes = 0
+        self._lock_lotes = threading.Lock()
 
-    def _try_apis(self, isbn: str) -> Dict[str, Any]:
+    def _try_apis(self, isbn: str, executor: Optional[ThreadPoolExecutor] = None
+                  ) -> Optional[List[BookMetadata]]:
         """
         Intenta obtener datos del libro desde las APIs configuradas.
-        Retorna el primer resultado exitoso.
+        Retorna los metadatos encontrados en orden de prioridad (una sola salvo en
+        modo "fusion"), una lista vacía si las APIs respondieron pero no conocen
+        el libro, o None si ninguna pudo responder (sin conexión, errores HTTP...).
+        En los modos paralelos, 'executor' indica dónde lanzar las consultas (por
+        defecto, el de las consultas sueltas).
         """
+        if self.modo == "secuencial" or len(self.apis) < 2:
+            return self._try_apis_secuencial(isbn)
+        return self._try_apis_en_paralelo(isbn, executor or self._executor)
+
+    def _try_apis_secuencial(self, isbn: str) -> Optional[List[BookMetadata]]:
+        alguna_respondio = False
         for api_client in self.apis:
             try:
-                data = api_client.json_data(isbn)
-                if self._has_data(data, isbn): # Pasamos isbn a _has_data para consistencia
-                    return data
+                metadatos = api_client.obtener_metadatos(isbn)
             except Exception as e:
-                # Podrías loggear este error si una API específica falla
+                # La API no pudo responder (ApiSinRespuestaError, error de red...)
                 # print(f"Advertencia: La API {type(api_client).__name__} falló para el ISBN {isbn}. Error: {e}")
                 continue # Intenta con la siguiente API
-        return {} # Retorna un diccionario vacío si ninguna API tiene éxito o encuentra datos
+            alguna_respondio = True
+            if metadatos is not None:
+                return [metadatos]
+        return [] if alguna_respondio else None
 
-    def _has_data(self, data: Dict[str, Any], query: str) -> bool:
-        """
-        Verifica si los datos de la API son válidos y contienen información.
-        'query' podría ser el ISBN u otro identificador usado.
-        """
-        if not data: # Si data es None o un diccionario vacío
-            return False
-        # Específico para Google Books API
-        if "items" in data and data["items"]: # Asegura que 'items' exista y no esté vacío
-            return True
-        # Podrías añadir condiciones para otras APIs aquí, por ejemplo:
-        # elif "otro_identificador_clave" in data:
-        #     return True
-        # El chequeo original de 'f"ISBN:{query}" in data' parece muy específico
-        # y podría no ser generalizable si 'data' es un JSON complejo.
-        # Considera si esa condición sigue siendo necesaria o cómo adaptarla.
-        return False
-
-    def extraer_info_json(self, isbn: str) -> Optional[Dict[str, Any]]:
+    def _try_apis_en_paralelo(self, isbn: str, executor: ThreadPoolExecutor) -> Optional[List[BookMetadata]]:
+        candidatas = list(enumerate(self.apis))
+        respuestas: Dict[int, BookMetadata] = {}
+        alguna_respondio = False
+
+        if self.modo == "primero":
+            # Las APIs locales (es_local = True) responden al instante y sin red: se
+            # consultan antes, y solo si no conocen el libro se sale a las remotas.
+            for prioridad, api in candidatas:
+                if not getattr(api, "es_local", False):
+                    continue
+                try:
+                    metadatos = api.obtener_metadatos(isbn)
+                except Exception:
+                    continue
+                alguna_respondio = True
+                if metadatos is not None:
+                    return [metadatos]
+            candidatas = [(p, api) for p, api in candidatas if not getattr(api, "es_local", False)]
+
+        futuros = {executor.submit(api.obtener_metadatos, isbn): prioridad for prioridad, api in candidatas}
+        limite = time.monotonic() + self.plazo_segundos
+        pendientes = set(futuros)
+
+        while pendientes:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            terminados, pendientes = wait(pendientes, timeout=restante, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                try:
+                    metadatos = futuro.result()
+                except Exception:
+                    continue
+                alguna_respondio = True
+                if metadatos is not None:
+                    respuestas[futuros[futuro]] = metadatos
+            if respuestas and self.modo == "primero":
+                break
+
+        # Las rezagadas se abandonan; las que aún no empezaron ni siquiera se ejecutan
+        for futuro in pendientes:
+            futuro.cancel()
+        if pendientes and not respuestas:
+            print(f"Advertencia: {len(pendientes)} API(s) no respondieron en {self.plazo_segundos} s para el ISBN {isbn}.")
+
+        if respuestas:
+            return [respuestas[p] for p in sorted(respuestas)]
+        return [] if alguna_respondio else None
+
+    def extraer_info_json(self, isbn: str, sin_respuesta_como_error: bool = False) -> Optional[Dict[str, Any]]:
         """
         Extrae y formatea la información del libro desde el JSON obtenido de la API.
         Retorna un diccionario con la información del libro o None si no se encuentra.
+
+        Por defecto también retorna None si ninguna API pudo responder (sin conexión,
+        plazos agotados...). Con sin_respuesta_como_error=True ese caso lanza
+        ApiSinRespuestaError, para distinguir "no existe" de "no se pudo saber".
         """
         if not isbn: # Validación básica
             # print("Error: Se requiere un ISBN para extraer información.")
             return None
 
-        data = self._try_apis(isbn)
+        isbn = isbn.strip()
+        if self.cache:
+            entrada = self.cache.obtener(isbn)
+            if entrada is not None:
+                return entrada['datos'] if entrada['encontrado'] else None
+
+        return self._consultar_apis(isbn, sin_respuesta_como_error)
+
+    def extraer_info_batch(self, isbns: Iterable[str], max_hilos: int = 8,
+                           progreso: Optional[Callable[[int, int, str], None]] = None
+                           ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Obtiene la información de una lista de ISBN (p. ej. una caja recién recibida).
+
+        Los ISBN repetidos se consultan una sola vez; los que están en la caché se
+        resuelven sin red, y el resto se consulta en paralelo con como máximo
+        'max_hilos' peticiones simultáneas.
+
+        Args:
+            isbns: ISBN a consultar.
+            max_hilos: Número máximo de consultas simultáneas a las APIs.
+            progreso: Función opcional progreso(completados, total, isbn), llamada
+                      desde el hilo que invoca este método tras resolver cada ISBN.
 
-        if not data: # Si _try_apis retornó un diccionario vacío
+        Returns:
+            Diccionario ISBN -> detalles del libro (None si no se encontró).
+        """
+        unicos = list(dict.fromkeys(i.strip() for i in isbns if i and i.strip()))
+        total = len(unicos)
+        resultados: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        def avanzar(isbn: str) -> None:
+            if progreso:
+                progreso(len(resultados), total, isbn)
+
+        pendientes = []
+        for isbn in unicos:
+            entrada = self.cache.obtener(isbn) if self.cache else None
+            if entrada is None:
+                pendientes.append(isbn)
+                continue
+            resultados[isbn] = entrada['datos'] if entrada['encontrado'] else None
+            avanzar(isbn)
+
+        if pendientes:
+            with self._lock_lotes:
+                executor, executor_apis = self._executor_para_lotes(max(1, max_hilos))
+                futuros = {executor.submit(self._consultar_apis, isbn, False, executor_apis): isbn
+                           for isbn in pendientes}
+            for futuro in as_completed(futuros):
+                isbn = futuros[futuro]
+                try:
+                    resultados[isbn] = futuro.result()
+                except Exception as e:
+                    print(f"Error al obtener la información del ISBN {isbn}: {e}")
+                    resultados[isbn] = None
+                avanzar(isbn)
+
+        # Mismo orden que la lista recibida
+        return {isbn: resultados[isbn] for isbn in unicos}
+
+    def _executor_para_lotes(self, max_hilos: int) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """
+        Executors compartidos por los lotes: el de los ISBN y el de sus consultas a
+        las APIs. Solo se recrean si cambia el número de hilos. Llamar con _lock_lotes.
+        """
+        if self._executor_lotes is None or self._hilos_lotes != max_hilos:
+            if self._executor_lotes is not None:
+                # Las consultas ya enviadas terminan; sus hilos se cierran después
+                self._executor_lotes.shutdown(wait=False)
+                self._executor_apis_lotes.shutdown(wait=False)
+            self._executor_lotes = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="book-batch")
+            # Cada ISBN en curso consulta todas las APIs a la vez (y deja rezagadas)
+            self._executor_apis_lotes = ThreadPoolExecutor(max_workers=2 * max(1, len(self.apis)) * max_hilos,
+                                                           thread_name_prefix="book-batch-api")
+            self._hilos_lotes = max_hilos
+        return self._executor_lotes, self._executor_apis_lotes
+
+    def _consultar_apis(self, isbn: str, sin_respuesta_como_error: bool = False,
+                        executor: Optional[ThreadPoolExecutor] = None) -> Optional[Dict[str, Any]]:
+        """Consulta las APIs (sin mirar la caché) y guarda el resultado en la caché."""
+        respuestas = self._try_apis(isbn, executor)
+
+        if respuestas is None:
+            # Ninguna API respondió (p. ej. sin conexión): mejor una entrada caducada que nada
+            if self.cache:
+                entrada = self.cache.obtener(isbn, permitir_expirado=True)
+                if entrada is not None and entrada['encontrado']:
+                    return entrada['datos']
+            if sin_respuesta_como_error:
+                raise ApiSinRespuestaError(f"Ninguna API pudo responder para el ISBN {isbn}.")
             return None
 
-        # Procesamiento específico para Google Books API
-        # Esto necesitaría ser más genérico si usas múltiples APIs con formatos diferentes
-        # o podrías tener métodos de parseo específicos por API.
-        if "items" in data and data["items"]: # Asegurarse de que 'items' existe y tiene contenido
-            try:
-                volume_info = data["items"][0].get("volumeInfo", {}) # Usar .get() para seguridad
-                
-                # Extraer categorías, asegurando que sea una lista
-                categories = volume_info.get("categories", [])
-                if not isinstance(categories, list):
-                    categories = [str(categories)] if categories else []
-
-
-                # Construir el diccionario de información del libro
-                book_details = {
-                    "ISBN": isbn,
-                    "Título": volume_info.get("title", "Desconocido"),
-                    # Asegurar que el autor sea una cadena, tomando el primero si hay lista
-                    "Autor": volume_info.get("authors", ["Desconocido"])[0] if volume_info.get("authors") else "Desconocido",
-                    "Editorial": volume_info.get("publisher", "Desconocido"),
-                    "Imagen": volume_info.get("imageLinks", {}).get("thumbnail", ""),
-                    "Categorías": categories, # Ya es una lista
-                    "Posición": "",  # Se llenará después, o se puede quitar si no es de la API
-                    "Cantidad": 1    # Cantidad inicial, se puede ajustar después
-                }
-                return book_details
-            except (IndexError, KeyError, TypeError) as e:
-                # Error al parsear la respuesta esperada de Google Books
-                print(f"Error al parsear la información del libro desde la API para ISBN {isbn}: {e}")
-                return None
-        
-        # Si se llega aquí, es porque 'data' no tenía el formato esperado de Google Books
-        # o _has_data falló por otra razón después de que _try_apis devolviera datos.
-        return None
+        if not respuestas: # Las APIs respondieron, pero no conocen el ISBN
+            if self.cache:
+                self.cache.guardar(isbn, None)
+            return None
+
+        book_details = self._fusionar(respuestas).a_detalles()
+        # El ISBN tal como se buscó, aunque una API lo devuelva en otro formato
+        book_details["ISBN"] = isbn
+        if self.cache:
+            self.cache.guardar(isbn, book_details)
+        return book_details
+
+    @staticmethod
+    def _fusionar(metadatos: List[BookMetadata]) -> BookMetadata:
+        """
+        Combina los metadatos de varias APIs. Gana la de mayor prioridad (la primera);
+        las siguientes solo completan los campos que esa dejó vacíos.
+        """
+        resultado = replace(metadatos[0], categorias=list(metadatos[0].categorias))
+        for otros in metadatos[1:]:
+            for campo in fields(BookMetadata):
+                valor = getattr(otros, campo.name)
+                if not getattr(resultado, campo.name) and valor:
+                    # Copia de las listas (categorías), para no compartirlas con la respuesta original
+                    setattr(resultado, campo.name, list(valor) if isinstance(valor, list) else valor)
+        return resultado
+
+    def estadisticas_cache(self) -> Dict[str, Any]:
+        """Devuelve los contadores de aciertos/fallos de la caché, si está configurada."""
+        return self.cache.estadisticas() if self.cache else {}
@@ -6,10 +6,14 @@ separada de la interfaz de usuario. Proporciona métodos para buscar, agregar,
 modificar y eliminar libros, así como para gestionar el inventario.
 """
 
+import threading
+from contextlib import nullcontext
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from core.interfaces import DataManagerInterface
 from .utils import normalize_for_search
+from .enrichment_service import TITULO_PENDIENTE
+from .paged_search import BusquedaPaginada
 
 
 class BookService:
@@ -23,9 +27,11 @@ class BookService:
     
     posiciones_validas = [f"{i:02d}{letra}" for i in range(1, 100) for letra in "ABCDEFGHIJ"]
     
-    def __init__(self, data_manager: DataManagerInterface, book_info_service):
+    def __init__(self, data_manager: DataManagerInterface, book_info_service, enrichment_service=None):
         self.data_manager = data_manager
         self.book_info_service = book_info_service
+        self.enrichment_service = enrichment_service
+        self._fts_disponible: Optional[bool] = None
     
     def buscar_libro_por_isbn(self, isbn: str) -> Dict[str, Any]:
         query_libros = "SELECT * FROM libros WHERE isbn = ?"
@@ -66,22 +72,43 @@ class BookService:
             precio = book_info.get("Precio", 0)
             if not isinstance(precio, (int, float)) or precio < 1000:
                 return False, "El precio debe ser un número igual o mayor a 1000."
+
+            # Sin título (p. ej. la API no respondió): se guarda con ISBN, precio y posición,
+            # y el resto de datos los completa EnrichmentService en segundo plano.
+            titulo = (book_info.get("Título") or "").strip()
+            pendiente_de_datos = not titulo
+            if pendiente_de_datos:
+                if self.enrichment_service is None:
+                    return False, "El título es obligatorio."
+                titulo = TITULO_PENDIENTE
             
-            columnas = ["isbn", "titulo", "autor", "editorial", "imagen_url", "categorias", "precio_venta"]
+            autor = book_info.get("Autor", "")
+            editorial = book_info.get("Editorial", "")
+            categorias = ",".join(book_info.get("Categorías", []))
+            # Las columnas *_norm (búsqueda sin tildes) se calculan aquí y no con triggers,
+            # para que la base se pueda escribir también desde fuera de la aplicación
+            columnas = ["isbn", "titulo", "autor", "editorial", "imagen_url", "categorias", "precio_venta",
+                        "titulo_norm", "autor_norm", "editorial_norm", "categorias_norm"]
             valores = (
-                isbn, book_info.get("Título", ""), book_info.get("Autor", ""), book_info.get("Editorial", ""),
-                book_info.get("Imagen", ""), ",".join(book_info.get("Categorías", [])), book_info.get("Precio", 0)
+                isbn, titulo, autor, editorial, book_info.get("Imagen", ""), categorias, book_info.get("Precio", 0),
+                normalize_for_search(titulo), normalize_for_search(autor),
+                normalize_for_search(editorial), normalize_for_search(categorias)
             )
             
             query = f"""
                 INSERT INTO libros ({', '.join(columnas)}) VALUES ({', '.join(['?'] * len(columnas))})
                 ON CONFLICT(isbn) DO UPDATE SET
                 titulo=excluded.titulo, autor=excluded.autor, editorial=excluded.editorial,
-                imagen_url=excluded.imagen_url, categorias=excluded.categorias, precio_venta=excluded.precio_venta;
+                imagen_url=excluded.imagen_url, categorias=excluded.categorias, precio_venta=excluded.precio_venta,
+                titulo_norm=excluded.titulo_norm, autor_norm=excluded.autor_norm,
+                editorial_norm=excluded.editorial_norm, categorias_norm=excluded.categorias_norm;
             """
             
             if self.data_manager.execute_query(query, valores) is None:
                 return False, "Error al guardar información del libro."
+            if pendiente_de_datos:
+                self.enrichment_service.encolar(isbn)
+                return True, "Libro guardado. Sus datos se completarán automáticamente en segundo plano."
             return True, "Libro guardado/actualizado correctamente."
                 
         except Exception as e:
@@ -135,56 +162,185 @@ class BookService:
         except Exception as e:
             return False, f"Error al modificar inventario: {str(e)}"
 
-    def buscar_libros(self, termino: str, filtros: Optional[Dict[str, bool]] = None) -> List[Dict[str, Any]]:
-        query = """
+    def _usar_fts(self) -> bool:
+        """Indica si existe el índice de texto completo 'libros_fts' (se consulta una sola vez)."""
+        if self._fts_disponible is None:
+            resultado = self.data_manager.fetch_query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'libros_fts'"
+            )
+            self._fts_disponible = bool(resultado)
+        return self._fts_disponible
+
+    @staticmethod
+    def _construir_consulta_fts(termino: str, columnas: List[str]) -> str:
+        """
+        Convierte el término de búsqueda en una expresión MATCH de FTS5.
+
+        Cada palabra se busca como prefijo ("garc marq" -> "garc"* "marq"*) y todas
+        deben aparecer. Las comillas se escapan para que el texto del usuario nunca
+        se interprete como sintaxis de FTS5.
+        """
+        palabras = [p.replace('"', '""') for p in termino.split()]
+        if not palabras:
+            return ""
+        expresion = " ".join(f'"{p}"*' for p in palabras)
+        return f"{{{' '.join(columnas)}}} : ({expresion})"
+
+    # Orden estable de los resultados: con OFFSET, dos páginas consecutivas nunca
+    # repiten ni saltan filas (un libro puede estar en varias posiciones).
+    _ORDEN_BUSQUEDA = "ORDER BY l.titulo, l.isbn, i.id_inventario"
+
+    def buscar_libros(self, termino: str, filtros: Optional[Dict[str, bool]] = None,
+                      offset: int = 0, limite: Optional[int] = None,
+                      cancelado: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """
+        Busca libros por título, autor, editorial, categorías o ISBN.
+
+        Args:
+            termino: Texto a buscar.
+            filtros: Columnas en las que buscar ("titulo", "autor", "categoria").
+            offset: Resultados que se saltan (para paginar).
+            limite: Máximo de resultados a devolver; None devuelve todos.
+            cancelado: Evento opcional; si se activa mientras la consulta se ejecuta,
+                       SQLite la interrumpe y se lanza ConsultaCanceladaError.
+        """
+        consulta = self._consulta_busqueda(termino, filtros)
+        if consulta is None:
+            return []
+        desde, condicion, params = consulta
+
+        query = f"""
             SELECT l.isbn, l.titulo, l.autor, l.editorial, l.imagen_url, l.categorias, l.precio_venta, i.posicion, i.cantidad
-            FROM libros l LEFT JOIN inventario i ON l.isbn = i.libro_isbn
+            FROM {desde}
+            LEFT JOIN inventario i ON l.isbn = i.libro_isbn
+            WHERE {condicion}
+            {self._ORDEN_BUSQUEDA}
         """
+        if limite is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = params + (limite, offset)
+        elif offset:
+            query += " LIMIT -1 OFFSET ?"
+            params = params + (offset,)
+        with self._cancelable(cancelado):
+            results = self.data_manager.fetch_query(query, params)
         
+        books = []
+        for row in results:
+            books.append({
+                "ISBN": row["isbn"], "Título": row["titulo"], "Autor": row["autor"], "Editorial": row["editorial"],
+                "Imagen": row.get("imagen_url", ""), "Categorías": row["categorias"].split(",") if row["categorias"] else [],
+                "Precio": row.get("precio_venta", 0), "Posición": row.get("posicion") or "-", "Cantidad": row.get("cantidad", 0)
+            })
+        return books
+
+    def contar_libros(self, termino: str, filtros: Optional[Dict[str, bool]] = None,
+                      cancelado: Optional[threading.Event] = None) -> int:
+        """Número de resultados que devolvería buscar_libros() sin límite."""
+        consulta = self._consulta_busqueda(termino, filtros)
+        if consulta is None:
+            return 0
+        desde, condicion, params = consulta
+        with self._cancelable(cancelado):
+            resultado = self.data_manager.fetch_query(
+                f"SELECT COUNT(*) AS total FROM {desde} LEFT JOIN inventario i ON l.isbn = i.libro_isbn WHERE {condicion}",
+                params
+            )
+        return resultado[0]['total'] if resultado else 0
+
+    def paginar_busqueda(self, termino: str, filtros: Optional[Dict[str, bool]] = None,
+                         tamano_pagina: int = 50, primera_pagina: Optional[List[Dict[str, Any]]] = None,
+                         cancelado: Optional[threading.Event] = None) -> BusquedaPaginada:
+        """
+        Prepara una búsqueda cuyos resultados se cargan por páginas (ver BusquedaPaginada).
+        'primera_pagina' reutiliza una página 0 ya leída (p. ej. por la búsqueda en vivo);
+        'cancelado' permite interrumpir el COUNT inicial.
+        """
+        return BusquedaPaginada(self, termino, filtros, tamano_pagina,
+                                primera_pagina=primera_pagina, cancelado=cancelado)
+
+    def _cancelable(self, cancelado: Optional[threading.Event]):
+        """Context manager que hace cancelables las consultas del bloque, si se dio un evento."""
+        if cancelado is None:
+            return nullcontext()
+        return self.data_manager.consulta_cancelable(cancelado)
+
+    def _consulta_busqueda(self, termino: str, filtros: Optional[Dict[str, bool]] = None
+                           ) -> Optional[Tuple[str, str, tuple]]:
+        """
+        Devuelve (FROM, WHERE, parámetros) de la búsqueda, o None si no hay nada que buscar.
+        La tabla libros siempre tiene el alias 'l'.
+
+        FTS5 busca por prefijo de palabra: "marq" encuentra "Márquez", pero "4061" no
+        encuentra el ISBN 9780306406157. Los términos con forma de ISBN (solo dígitos,
+        guiones y espacios) siguen buscándose por subcadena con LIKE.
+        """
+        if self._usar_fts() and not self._isbn_de_termino(termino):
+            return self._consulta_fts(termino, filtros)
+        return self._consulta_like(termino, filtros)
+
+    @staticmethod
+    def _isbn_de_termino(termino: str) -> str:
+        """Los dígitos del término si tiene forma de ISBN o de parte de uno ("978-84", "0306 40615 X"); si no, ""."""
+        compacto = termino.replace("-", "").replace(" ", "").upper()
+        if compacto and compacto.rstrip("X").isdigit() and compacto.count("X") <= 1:
+            return compacto
+        return ""
+
+    def _consulta_fts(self, termino: str, filtros: Optional[Dict[str, bool]] = None) -> Optional[Tuple[str, str, tuple]]:
+        """Búsqueda por prefijo sobre el índice FTS5 (sin tildes ni mayúsculas)."""
+        # Si no hay filtros o están todos en False, buscar en todo.
+        if not filtros or not any(filtros.values()):
+            columnas = ["titulo", "autor", "editorial", "categorias", "isbn"]
+        else:
+            columnas = [col for filtro, col in (("titulo", "titulo"), ("autor", "autor"), ("categoria", "categorias")) if filtros.get(filtro)]
+            # Siempre incluir búsqueda por ISBN
+            columnas.append("isbn")
+
+        match = self._construir_consulta_fts(termino, columnas)
+        if not match:
+            return None
+        return "libros_fts f JOIN libros l ON l.rowid = f.rowid", "libros_fts MATCH ?", (match,)
+
+    def _consulta_like(self, termino: str, filtros: Optional[Dict[str, bool]] = None) -> Optional[Tuple[str, str, tuple]]:
+        """
+        Búsqueda por subcadena con LIKE; se usa cuando el SQLite no tiene FTS5 y para
+        los términos con forma de ISBN. Compara contra las columnas *_norm, que
+        guardar_libro() ya escribe normalizadas.
+        """
         where_clauses = []
         params = []
         
         normalized_search_term = f"%{normalize_for_search(termino)}%"
-        isbn_search_term = f"%{termino}%"
+        # Sin guiones en el término ni en la columna: "978-84-376" encuentra "9788437604947"
+        isbn_search_term = f"%{self._isbn_de_termino(termino) or termino}%"
 
         # Si no hay filtros o están todos en False, buscar en todo.
         if not filtros or not any(filtros.values()):
             where_clauses.extend([
-                "normalize(l.titulo) LIKE ?",
-                "normalize(l.autor) LIKE ?",
-                "normalize(l.editorial) LIKE ?",
-                "normalize(l.categorias) LIKE ?",
-                "l.isbn LIKE ?"
+                "l.titulo_norm LIKE ?",
+                "l.autor_norm LIKE ?",
+                "l.editorial_norm LIKE ?",
+                "l.categorias_norm LIKE ?",
+                "REPLACE(l.isbn, '-', '') LIKE ?"
             ])
             params.extend([normalized_search_term, normalized_search_term, normalized_search_term, normalized_search_term, isbn_search_term])
         else:
             # Construir cláusula WHERE basada en filtros activos
             if filtros.get("titulo"):
-                where_clauses.append("normalize(l.titulo) LIKE ?")
+                where_clauses.append("l.titulo_norm LIKE ?")
                 params.append(normalized_search_term)
             if filtros.get("autor"):
-                where_clauses.append("normalize(l.autor) LIKE ?")
+                where_clauses.append("l.autor_norm LIKE ?")
                 params.append(normalized_search_term)
             if filtros.get("categoria"):
-                where_clauses.append("normalize(l.categorias) LIKE ?")
+                where_clauses.append("l.categorias_norm LIKE ?")
                 params.append(normalized_search_term)
             
             # Siempre incluir búsqueda por ISBN
-            where_clauses.append("l.isbn LIKE ?")
+            where_clauses.append("REPLACE(l.isbn, '-', '') LIKE ?")
             params.append(isbn_search_term)
 
         if not where_clauses:
-            return []
-
-        query += f" WHERE {' OR '.join(where_clauses)} ORDER BY l.titulo"
-        
-        results = self.data_manager.fetch_query(query, tuple(params))
-        
-        books = []
-        for row in results:
-            books.append({
-                "ISBN": row["isbn"], "Título": row["titulo"], "Autor": row["autor"], "Editorial": row["editorial"],
-                "Imagen": row.get("imagen_url", ""), "Categorías": row["categorias"].split(",") if row["categorias"] else [],
-                "Precio": row.get("precio_venta", 0), "Posición": row.get("posicion") or "-", "Cantidad": row.get("cantidad", 0)
-            })
-        return books
\ No newline at end of file
+            return None
+        return "libros l", f"({' OR '.join(where_clauses)})", tuple(params)
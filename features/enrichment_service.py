@@ -0,0 +1,222 @@
+"""
+Servicio de enriquecimiento diferido de libros.
+
+Permite guardar un libro solo con ISBN, precio y posición (por ejemplo, cuando la
+API de libros está lenta o caída) y completar título, autor, editorial, imagen y
+categorías más tarde, en segundo plano, sin que el usuario espere a la red.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from core.interfaces import ApiSinRespuestaError, DataManagerInterface
+from .utils import normalize_for_search
+
+# Título con el que se guarda un libro cuyos datos aún no se conocen
+TITULO_PENDIENTE = "(Pendiente de datos)"
+
+
+class EnrichmentService:
+    """
+    Cola persistente ('enrichment_queue') de libros pendientes de completar.
+
+    Un hilo en segundo plano (iniciar()/detener()) vacía la cola por lotes contra
+    GetBookInfo, respetando un límite de peticiones por minuto, y escribe los datos
+    encontrados con UPDATE por lotes. Solo rellena los campos que siguen vacíos, de
+    modo que no pisa lo que el usuario haya escrito a mano entretanto. Los ISBN que
+    las APIs no conocen se reintentan con espera creciente hasta 'max_intentos'; si
+    ninguna API pudo responder (sin conexión), el ISBN se reprograma sin gastar intentos.
+    """
+
+    TABLA = "enrichment_queue"
+
+    def __init__(self, data_manager: DataManagerInterface, book_info_service,
+                 tamano_lote: int = 20, peticiones_por_minuto: int = 30,
+                 max_intentos: int = 8, intervalo_espera_segundos: float = 60.0,
+                 espera_sin_respuesta_segundos: float = 300.0):
+        """
+        Args:
+            data_manager: Acceso a la base de datos.
+            book_info_service: Instancia de GetBookInfo.
+            tamano_lote: ISBN que se procesan y escriben juntos.
+            peticiones_por_minuto: Máximo de consultas a la API por minuto.
+            max_intentos: Intentos tras los que un ISBN se retira de la cola.
+            intervalo_espera_segundos: Espera del hilo cuando la cola está vacía.
+            espera_sin_respuesta_segundos: Espera antes de reintentar un ISBN para el
+                                           que ninguna API respondió (no cuenta como intento).
+        """
+        self.data_manager = data_manager
+        self.book_info_service = book_info_service
+        self.tamano_lote = tamano_lote
+        self.intervalo_peticiones = 60.0 / peticiones_por_minuto if peticiones_por_minuto > 0 else 0.0
+        self.max_intentos = max_intentos
+        self.intervalo_espera_segundos = intervalo_espera_segundos
+        self.espera_sin_respuesta_segundos = espera_sin_respuesta_segundos
+        self._ultima_peticion = 0.0
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+        self._despertar = threading.Event()
+
+    # --- Cola ---
+
+    def encolar(self, isbn: str) -> bool:
+        """Añade un ISBN a la cola (si ya estaba, no hace nada) y despierta al hilo."""
+        cursor = self.data_manager.execute_query(
+            f"INSERT OR IGNORE INTO {self.TABLA} (isbn) VALUES (?)", (isbn,)
+        )
+        if cursor is None:
+            return False
+        self._despertar.set()
+        return True
+
+    def pendientes(self) -> int:
+        """Número de libros que esperan ser completados."""
+        resultado = self.data_manager.fetch_query(f"SELECT COUNT(*) AS total FROM {self.TABLA}")
+        return resultado[0]['total'] if resultado else 0
+
+    # --- Procesamiento ---
+
+    def procesar_lote(self) -> int:
+        """
+        Consulta la API para el siguiente lote de ISBN cuyo reintento ya venció y
+        guarda los resultados.
+
+        Returns:
+            Número de ISBN procesados (encontrados, no encontrados o sin respuesta).
+        """
+        lote = self.data_manager.fetch_query(
+            f"SELECT isbn, intentos FROM {self.TABLA} WHERE proximo_intento <= ? "
+            "ORDER BY fecha_encolado LIMIT ?",
+            (time.time(), self.tamano_lote)
+        )
+        encontrados: List[Dict[str, Any]] = []
+        fallidos: List[Dict[str, Any]] = []
+        sin_respuesta: List[Dict[str, Any]] = []
+        for fila in lote:
+            if self._detener.is_set():
+                break
+            self._esperar_turno()
+            error = None
+            try:
+                datos = self.book_info_service.extraer_info_json(fila['isbn'], sin_respuesta_como_error=True)
+            except ApiSinRespuestaError as e:
+                # Caída de la red o de las APIs: no dice nada del libro, no gasta un intento
+                sin_respuesta.append({**fila, 'datos': None, 'error': str(e)})
+                continue
+            except Exception as e:
+                print(f"Error al completar los datos del ISBN {fila['isbn']}: {e}")
+                datos, error = None, str(e)
+            (encontrados if datos else fallidos).append({**fila, 'datos': datos, 'error': error})
+
+        if encontrados or fallidos or sin_respuesta:
+            self._guardar_resultados(encontrados, fallidos, sin_respuesta)
+        return len(encontrados) + len(fallidos) + len(sin_respuesta)
+
+    def _esperar_turno(self) -> None:
+        """Limita la frecuencia de consultas a la API."""
+        espera = self._ultima_peticion + self.intervalo_peticiones - time.monotonic()
+        if espera > 0:
+            self._detener.wait(espera)
+        self._ultima_peticion = time.monotonic()
+
+    def _guardar_resultados(self, encontrados: List[Dict[str, Any]], fallidos: List[Dict[str, Any]],
+                            sin_respuesta: Optional[List[Dict[str, Any]]] = None) -> None:
+        ahora = time.time()
+        descartados = [f['isbn'] for f in fallidos if f['intentos'] + 1 >= self.max_intentos]
+        reintentos = [
+            # Espera creciente: 1, 2, 4, 8... minutos, con un máximo de un día
+            (ahora + min(60 * 2 ** f['intentos'], 24 * 3600), f['error'] or 'no encontrado', f['isbn'])
+            for f in fallidos if f['intentos'] + 1 < self.max_intentos
+        ]
+        try:
+            with self.data_manager.transaction():
+                if encontrados:
+                    self.data_manager.execute_many(
+                        "UPDATE libros SET "
+                        "titulo = CASE WHEN COALESCE(titulo, '') IN ('', ?) THEN ? ELSE titulo END, "
+                        "autor = CASE WHEN COALESCE(autor, '') = '' THEN ? ELSE autor END, "
+                        "editorial = CASE WHEN COALESCE(editorial, '') = '' THEN ? ELSE editorial END, "
+                        "imagen_url = CASE WHEN COALESCE(imagen_url, '') = '' THEN ? ELSE imagen_url END, "
+                        "categorias = CASE WHEN COALESCE(categorias, '') = '' THEN ? ELSE categorias END, "
+                        # Las columnas de búsqueda siguen a las de arriba (las CASE ven los valores anteriores)
+                        "titulo_norm = CASE WHEN COALESCE(titulo, '') IN ('', ?) THEN ? ELSE titulo_norm END, "
+                        "autor_norm = CASE WHEN COALESCE(autor, '') = '' THEN ? ELSE autor_norm END, "
+                        "editorial_norm = CASE WHEN COALESCE(editorial, '') = '' THEN ? ELSE editorial_norm END, "
+                        "categorias_norm = CASE WHEN COALESCE(categorias, '') = '' THEN ? ELSE categorias_norm END "
+                        "WHERE isbn = ?",
+                        [self._valores_actualizacion(f) for f in encontrados]
+                    )
+                terminados = [f['isbn'] for f in encontrados] + descartados
+                if terminados:
+                    self.data_manager.execute_many(
+                        f"DELETE FROM {self.TABLA} WHERE isbn = ?", [(isbn,) for isbn in terminados]
+                    )
+                if reintentos:
+                    self.data_manager.execute_many(
+                        f"UPDATE {self.TABLA} SET intentos = intentos + 1, proximo_intento = ?, "
+                        "ultimo_error = ? WHERE isbn = ?",
+                        reintentos
+                    )
+                if sin_respuesta:
+                    self.data_manager.execute_many(
+                        f"UPDATE {self.TABLA} SET proximo_intento = ?, ultimo_error = ? WHERE isbn = ?",
+                        [(ahora + self.espera_sin_respuesta_segundos, f['error'], f['isbn']) for f in sin_respuesta]
+                    )
+        except Exception as e:
+            print(f"\033[1;31m❌ Error al guardar los datos completados de {len(encontrados)} libros: {e}\033[0m")
+            return
+
+        if encontrados:
+            print(f"✅ Datos completados para {len(encontrados)} libro(s) pendientes.")
+        for isbn in descartados:
+            print(f"⚠️  ISBN {isbn} retirado de la cola de datos pendientes tras {self.max_intentos} intentos.")
+
+    @staticmethod
+    def _valores_actualizacion(fila: Dict[str, Any]) -> tuple:
+        datos = fila['datos']
+        titulo = datos.get('Título', '')
+        autor = datos.get('Autor', '')
+        editorial = datos.get('Editorial', '')
+        categorias = ",".join(datos.get('Categorías', []))
+        return (
+            TITULO_PENDIENTE, titulo, autor, editorial, datos.get('Imagen', ''), categorias,
+            TITULO_PENDIENTE, normalize_for_search(titulo), normalize_for_search(autor),
+            normalize_for_search(editorial), normalize_for_search(categorias),
+            fila['isbn']
+        )
+
+    # --- Hilo en segundo plano ---
+
+    def iniciar(self) -> None:
+        """Arranca el hilo que vacía la cola (si no está ya en marcha)."""
+        if self._hilo and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="enrichment-worker", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 5.0) -> None:
+        """Pide al hilo que termine y espera como máximo 'timeout' segundos."""
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo:
+            self._hilo.join(timeout)
+            self._hilo = None
+
+    def _ejecutar(self) -> None:
+        try:
+            while not self._detener.is_set():
+                self._despertar.clear()
+                try:
+                    procesados = self.procesar_lote()
+                except Exception as e:
+                    print(f"Error en el hilo de datos pendientes: {e}")
+                    procesados = 0
+                if procesados == 0:
+                    # Cola vacía (o sin reintentos vencidos): esperar a un libro nuevo o al siguiente ciclo
+                    self._despertar.wait(self.intervalo_espera_segundos)
+        finally:
+            # El hilo termina aquí: su conexión del pool no se volverá a usar
+            if hasattr(self.data_manager, 'liberar_conexion'):
+                self.data_manager.liberar_conexion()
@@ -0,0 +1,321 @@
+"""
+Índice local de metadatos de libros por ISBN, para consultas sin conexión.
+
+El índice es un archivo SQLite aparte (por defecto data/isbn_index.db) con una
+tabla ordenada por ISBN-13, que se construye a partir de un volcado masivo:
+  - JSON por líneas, incluido el formato de los volcados de Open Library
+    ("tipo<TAB>clave<TAB>revisión<TAB>fecha<TAB>{json}"), opcionalmente .gz.
+    Las ediciones de Open Library citan a sus autores solo por clave
+    ({"key": "/authors/OL…A"}); sus nombres salen del volcado de autores, que se
+    indica aparte (o, si no, de "by_statement" cuando la edición lo trae).
+  - CSV con cabecera (isbn, title/titulo, author/autor, publisher/editorial, ...).
+
+Ver app/import_isbn_index.py para el comando de importación.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.connection_pool import SQLiteConnectionPool
+from core.interfaces import ApiSinRespuestaError, BookApiInterface
+from core.models import BookMetadata
+from .utils import isbn_a_13
+
+OPEN_LIBRARY_COVER_URL = "https://covers.openlibrary.org/b/id/{}-M.jpg"
+
+
+class LocalIsbnIndex:
+    """Almacén de solo lectura de metadatos por ISBN-13, más su importador."""
+
+    TABLA = "isbn_metadata"
+    TABLA_AUTORES_PENDIENTES = "_autores_pendientes"
+    DEFINICION = (
+        "(isbn TEXT PRIMARY KEY, titulo TEXT NOT NULL, autor TEXT, editorial TEXT, "
+        "categorias TEXT, imagen_url TEXT) WITHOUT ROWID"
+    )
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # Las búsquedas llegan desde varios hilos: el pool se crea aquí y no al primer uso
+        self._pool = SQLiteConnectionPool(self.db_path, solo_lectura=True)
+
+    def disponible(self) -> bool:
+        """Indica si el archivo del índice existe."""
+        return os.path.exists(self.db_path)
+
+    def _conexion(self) -> sqlite3.Connection:
+        return self._pool.get()
+
+    def buscar(self, isbn: str) -> Optional[Dict[str, Any]]:
+        """Devuelve la fila del índice para un ISBN (10 o 13 dígitos), o None."""
+        isbn13 = isbn_a_13(isbn)
+        if not isbn13 or not self.disponible():
+            return None
+        fila = self._conexion().execute(
+            f"SELECT isbn, titulo, autor, editorial, categorias, imagen_url FROM {self.TABLA} WHERE isbn = ?",
+            (isbn13,)
+        ).fetchone()
+        return dict(fila) if fila else None
+
+    def total(self) -> int:
+        if not self.disponible():
+            return 0
+        return self._conexion().execute(f"SELECT COUNT(*) FROM {self.TABLA}").fetchone()[0]
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones abiertas; las búsquedas posteriores abren otras."""
+        self._pool.close_all()
+
+    # --- Importación ---
+
+    def importar(self, ruta_volcado: str, formato: Optional[str] = None, tamano_lote: int = 5000,
+                 progreso: Optional[Callable[[int, int], None]] = None,
+                 ruta_autores: Optional[str] = None) -> int:
+        """
+        Construye el índice a partir de un volcado, leyéndolo por bloques.
+
+        El índice se escribe primero en un archivo temporal y después reemplaza al
+        anterior, de modo que una importación interrumpida no deja un índice a medias.
+
+        Args:
+            ruta_volcado: Archivo .jsonl/.txt/.csv (opcionalmente comprimido en .gz).
+            formato: "jsonl" o "csv". Si no se indica, se deduce de la extensión.
+            tamano_lote: Filas que se insertan por transacción.
+            progreso: Función opcional progreso(lineas_leidas, filas_escritas), llamada tras cada lote.
+            ruta_autores: Volcado de autores de Open Library (JSON por líneas, opcionalmente
+                          .gz), para dar nombre a los autores que las ediciones citan solo por clave.
+
+        Returns:
+            Número de ISBN en el índice.
+        """
+        formato = formato or ("csv" if ruta_volcado.lower().removesuffix(".gz").endswith(".csv") else "jsonl")
+        if formato not in ("jsonl", "csv"):
+            raise ValueError(f"Formato de volcado no soportado: '{formato}'. Use 'jsonl' o 'csv'.")
+
+        ruta_temporal = self.db_path + ".tmp"
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        conn = sqlite3.connect(ruta_temporal)
+        # Construcción desechable: sin diario ni fsync (si falla, se borra el temporal)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(f"CREATE TABLE {self.TABLA} {self.DEFINICION}")
+        # ISBN cuyo autor solo se conoce por su clave de Open Library, hasta leer sus nombres
+        conn.execute(f"CREATE TABLE {self.TABLA_AUTORES_PENDIENTES} (isbn TEXT PRIMARY KEY, clave TEXT NOT NULL) WITHOUT ROWID")
+
+        lineas = 0
+        escritas = 0
+        lote: List[Tuple] = []
+        pendientes: List[Tuple[str, str]] = []
+        try:
+            with self._abrir(ruta_volcado) as archivo:
+                registros = self._leer_csv(archivo) if formato == "csv" else self._leer_jsonl(archivo)
+                for registro in registros:
+                    lineas += 1
+                    filas = self._filas_desde_registro(registro)
+                    lote.extend(filas)
+                    clave_autor = _primera_clave(registro.get("authors")) if filas and not filas[0][2] else ""
+                    if clave_autor:
+                        pendientes.extend((fila[0], clave_autor) for fila in filas)
+                    if len(lote) >= tamano_lote:
+                        self._insertar_lote(conn, lote, pendientes)
+                        escritas += len(lote)
+                        lote, pendientes = [], []
+                        if progreso:
+                            progreso(lineas, escritas)
+                if lote:
+                    self._insertar_lote(conn, lote, pendientes)
+            self._completar_autores(conn, ruta_autores, tamano_lote)
+            total = conn.execute(f"SELECT COUNT(*) FROM {self.TABLA}").fetchone()[0]
+            conn.execute("ANALYZE")
+            conn.close()
+        except BaseException:
+            conn.close()
+            os.remove(ruta_temporal)
+            raise
+
+        if progreso:
+            progreso(lineas, total)
+        self.cerrar()
+        os.replace(ruta_temporal, self.db_path)
+        return total
+
+    @staticmethod
+    def _abrir(ruta: str) -> io.TextIOBase:
+        if ruta.lower().endswith(".gz"):
+            return gzip.open(ruta, "rt", encoding="utf-8", errors="replace", newline="")
+        return open(ruta, "r", encoding="utf-8", errors="replace", newline="")
+
+    @staticmethod
+    def _insertar_lote(conn: sqlite3.Connection, lote: List[Tuple], pendientes: List[Tuple[str, str]]) -> None:
+        with conn:
+            # Si un ISBN aparece en varias ediciones, se conserva la última leída
+            conn.executemany(f"INSERT OR REPLACE INTO {LocalIsbnIndex.TABLA} VALUES (?, ?, ?, ?, ?, ?)", lote)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {LocalIsbnIndex.TABLA_AUTORES_PENDIENTES} VALUES (?, ?)", pendientes
+            )
+
+    def _completar_autores(self, conn: sqlite3.Connection, ruta_autores: Optional[str], tamano_lote: int) -> None:
+        """
+        Pone nombre a los autores citados solo por clave, a partir del volcado de autores.
+        Los nombres se cargan en una tabla temporal del propio índice, no en memoria.
+        """
+        condicion = f"autor = '' AND isbn IN (SELECT isbn FROM {self.TABLA_AUTORES_PENDIENTES})"
+        sin_nombre = conn.execute(f"SELECT COUNT(*) FROM {self.TABLA} WHERE {condicion}").fetchone()[0]
+        if sin_nombre and ruta_autores:
+            conn.execute("CREATE TABLE _autores (clave TEXT PRIMARY KEY, nombre TEXT NOT NULL) WITHOUT ROWID")
+            lote: List[Tuple[str, str]] = []
+            with self._abrir(ruta_autores) as archivo:
+                for registro in self._leer_jsonl(archivo):
+                    clave = registro.get("key")
+                    nombre = _primero(registro, "name", "personal_name")
+                    if isinstance(clave, str) and nombre:
+                        lote.append((clave, nombre))
+                    if len(lote) >= tamano_lote:
+                        with conn:
+                            conn.executemany("INSERT OR REPLACE INTO _autores VALUES (?, ?)", lote)
+                        lote = []
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO _autores VALUES (?, ?)", lote)
+                conn.execute(
+                    f"UPDATE {self.TABLA} SET autor = COALESCE(("
+                    f"SELECT a.nombre FROM {self.TABLA_AUTORES_PENDIENTES} p JOIN _autores a ON a.clave = p.clave "
+                    f"WHERE p.isbn = {self.TABLA}.isbn), '') WHERE {condicion}"
+                )
+            conn.execute("DROP TABLE _autores")
+            # Devuelve al sistema el espacio de la tabla de nombres
+            conn.execute("VACUUM")
+            sin_nombre = conn.execute(f"SELECT COUNT(*) FROM {self.TABLA} WHERE {condicion}").fetchone()[0]
+        if sin_nombre:
+            print(f"⚠️  {sin_nombre:,} ISBN citan a su autor solo por su clave de Open Library y quedan sin autor"
+                  + ("." if ruta_autores else "; indique el volcado de autores para completarlos."))
+        conn.execute(f"DROP TABLE {self.TABLA_AUTORES_PENDIENTES}")
+
+    @staticmethod
+    def _leer_jsonl(archivo: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea:
+                continue
+            # Volcados de Open Library: el JSON es la última columna separada por tabuladores
+            if not linea.startswith("{") and "\t" in linea:
+                linea = linea.rsplit("\t", 1)[1]
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(registro, dict):
+                yield registro
+
+    @staticmethod
+    def _leer_csv(archivo: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        for fila in csv.DictReader(archivo):
+            yield {(clave or "").strip().lower(): valor for clave, valor in fila.items()}
+
+    @staticmethod
+    def _filas_desde_registro(registro: Dict[str, Any]) -> List[Tuple]:
+        """Convierte un registro del volcado en filas (una por cada ISBN que contiene)."""
+        titulo = _primero(registro, "title", "titulo")
+        if not titulo:
+            return []
+        subtitulo = _primero(registro, "subtitle")
+        if subtitulo:
+            titulo = f"{titulo}: {subtitulo}"
+
+        autor = _primer_nombre(registro.get("authors") or registro.get("author") or registro.get("autor")) \
+            or _primero(registro, "by_statement")
+        editorial = _primer_nombre(registro.get("publishers") or registro.get("publisher") or registro.get("editorial"))
+        categorias = _lista_de_nombres(registro.get("subjects") or registro.get("categories") or registro.get("categorias"))
+
+        imagen = _primero(registro, "cover", "image", "imagen", "imagen_url")
+        portadas = registro.get("covers")
+        if not imagen and isinstance(portadas, list):
+            ids_validos = [c for c in portadas if isinstance(c, int) and c > 0]
+            if ids_validos:
+                imagen = OPEN_LIBRARY_COVER_URL.format(ids_validos[0])
+
+        isbns = set()
+        for clave in ("isbn_13", "isbn_10", "isbn"):
+            valores = registro.get(clave) or []
+            for valor in (valores if isinstance(valores, list) else str(valores).replace(";", ",").split(",")):
+                isbn13 = isbn_a_13(str(valor))
+                if isbn13:
+                    isbns.add(isbn13)
+
+        return [(isbn, titulo, autor, editorial, ",".join(categorias), imagen) for isbn in isbns]
+
+
+def _primero(registro: Dict[str, Any], *claves: str) -> str:
+    for clave in claves:
+        valor = registro.get(clave)
+        if isinstance(valor, str) and valor.strip():
+            return valor.strip()
+    return ""
+
+
+def _lista_de_nombres(valor: Any) -> List[str]:
+    """Normaliza listas de autores/editoriales/temas: cadenas, dicts con 'name' o texto separado por ';'."""
+    if not valor:
+        return []
+    if isinstance(valor, str):
+        # La coma no separa: aparece dentro de los nombres ("García Márquez, Gabriel")
+        return [v.strip() for v in valor.split(";") if v.strip()]
+    nombres = []
+    if isinstance(valor, list):
+        for elemento in valor:
+            if isinstance(elemento, dict):
+                elemento = elemento.get("name") or ""
+            if isinstance(elemento, str) and elemento.strip():
+                nombres.append(elemento.strip())
+    return nombres
+
+
+def _primer_nombre(valor: Any) -> str:
+    nombres = _lista_de_nombres(valor)
+    return nombres[0] if nombres else ""
+
+
+def _primera_clave(valor: Any) -> str:
+    """Clave del primer autor citado por referencia: {"key": "/authors/OL…A"} o {"author": {"key": ...}}."""
+    if not isinstance(valor, list):
+        return ""
+    for elemento in valor:
+        if isinstance(elemento, dict) and isinstance(elemento.get("author"), dict):
+            elemento = elemento["author"]
+        clave = elemento.get("key") if isinstance(elemento, dict) else None
+        if isinstance(clave, str) and clave.strip():
+            return clave.strip()
+    return ""
+
+
+class LocalIsbnIndexApi(BookApiInterface):
+    """Proveedor de metadatos que consulta el índice local (sin red)."""
+
+    # GetBookInfo consulta primero las APIs locales, sin lanzar peticiones en paralelo
+    es_local = True
+
+    def __init__(self, indice: LocalIsbnIndex):
+        self.indice = indice
+
+    def obtener_metadatos(self, isbn: str) -> Optional[BookMetadata]:
+        try:
+            fila = self.indice.buscar(isbn)
+        except sqlite3.Error as e:
+            raise ApiSinRespuestaError(f"Error al consultar el índice local de ISBN para {isbn}: {e}") from e
+        if not fila:
+            # Que el índice local no tenga un ISBN no significa que no exista: no se
+            # responde "no encontrado", para que GetBookInfo no lo guarde como tal.
+            raise ApiSinRespuestaError(f"El índice local no contiene el ISBN {isbn}.")
+        return BookMetadata(
+            isbn=isbn,
+            titulo=fila["titulo"],
+            autor=fila["autor"] or "",
+            editorial=fila["editorial"] or "",
+            imagen_url=fila["imagen_url"] or "",
+            categorias=fila["categorias"].split(",") if fila["categorias"] else [],
+        )
@@ -0,0 +1,114 @@
+"""
+Resultados de búsqueda paginados en SQL.
+
+Una búsqueda amplia (p. ej. "a") puede coincidir con casi todo el catálogo. En
+lugar de traer todas las filas a Python y recortarlas en la GUI, BusquedaPaginada
+cuenta los resultados con un COUNT y trae de SQLite solo las páginas que se leen
+(LIMIT/OFFSET sobre BookService.buscar_libros).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class BusquedaPaginada:
+    """
+    Vista perezosa de los resultados de una búsqueda.
+
+    Se comporta como una secuencia de solo lectura (len(), índices y cortes), así
+    que las vistas pueden usarla igual que la lista que devuelve buscar_libros().
+    Se conservan como mucho 'paginas_en_cache' páginas leídas. Se puede leer desde
+    varios hilos, p. ej. para precargar la página siguiente en segundo plano.
+    """
+
+    def __init__(self, book_service, termino: str, filtros: Optional[Dict[str, bool]] = None,
+                 tamano_pagina: int = 50, paginas_en_cache: int = 8,
+                 primera_pagina: Optional[List[Dict[str, Any]]] = None,
+                 cancelado: Optional[threading.Event] = None):
+        if tamano_pagina <= 0:
+            raise ValueError("El tamaño de página debe ser mayor que 0.")
+        self.book_service = book_service
+        self.termino = termino
+        self.filtros = filtros
+        self.tamano_pagina = tamano_pagina
+        self.paginas_en_cache = max(2, paginas_en_cache)
+        self._paginas: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if primera_pagina is not None and len(primera_pagina) < tamano_pagina:
+            # Una primera página incompleta ya contiene todos los resultados: no hace falta el COUNT
+            self.total = len(primera_pagina)
+        else:
+            self.total = book_service.contar_libros(termino, filtros, cancelado=cancelado)
+        if primera_pagina is not None and self.total:
+            self._paginas[0] = list(primera_pagina)
+
+    @property
+    def numero_paginas(self) -> int:
+        return (self.total + self.tamano_pagina - 1) // self.tamano_pagina
+
+    def pagina_de(self, indice: int) -> int:
+        """Número de página que contiene el resultado 'indice'."""
+        return indice // self.tamano_pagina
+
+    def pagina_cargada(self, numero: int) -> bool:
+        with self._lock:
+            return numero in self._paginas
+
+    def paginas_sin_cargar(self, inicio: int, fin: int) -> List[int]:
+        """Páginas que faltan para leer los resultados [inicio, fin) sin ir a la base de datos."""
+        fin = min(fin, self.total)
+        if inicio >= fin:
+            return []
+        return [n for n in range(self.pagina_de(inicio), self.pagina_de(fin - 1) + 1) if not self.pagina_cargada(n)]
+
+    def pagina(self, numero: int) -> List[Dict[str, Any]]:
+        """Devuelve los resultados de la página 'numero' (desde la caché o desde SQLite)."""
+        if not 0 <= numero < self.numero_paginas:
+            return []
+        with self._lock:
+            libros = self._paginas.get(numero)
+            if libros is not None:
+                self._paginas.move_to_end(numero)
+                return libros
+
+        # La consulta se hace fuera del lock: una precarga en curso no bloquea otras lecturas
+        libros = self.book_service.buscar_libros(
+            self.termino, self.filtros, offset=numero * self.tamano_pagina, limite=self.tamano_pagina
+        )
+        with self._lock:
+            self._paginas[numero] = libros
+            self._paginas.move_to_end(numero)
+            while len(self._paginas) > self.paginas_en_cache:
+                self._paginas.popitem(last=False)
+        return libros
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(self.total)
+            if paso != 1:
+                return [self[i] for i in range(inicio, fin, paso)]
+            libros: List[Dict[str, Any]] = []
+            for numero in range(self.pagina_de(inicio), self.pagina_de(fin - 1) + 1 if fin > inicio else 0):
+                base = numero * self.tamano_pagina
+                libros.extend(self.pagina(numero)[max(inicio - base, 0):fin - base])
+            return libros
+
+        if indice < 0:
+            indice += self.total
+        if not 0 <= indice < self.total:
+            raise IndexError("Índice de resultado fuera de rango.")
+        libros = self.pagina(self.pagina_de(indice))
+        posicion = indice % self.tamano_pagina
+        if posicion >= len(libros):
+            # El catálogo cambió desde el COUNT (p. ej. se eliminó un libro)
+            raise IndexError("Índice de resultado fuera de rango.")
+        return libros[posicion]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for numero in range(self.numero_paginas):
+            yield from self.pagina(numero)
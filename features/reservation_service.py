@@ -101,60 +101,62 @@ class ReservationService:
             return False, "Para una reserva, se requiere un abono inicial mayor a cero."
 
         try:
-            # 1. Crear la entrada en la tabla 'reservas'
-            reserva_query = """
-                INSERT INTO reservas (id_cliente, monto_total, estado, notas, metodo_pago_inicial, fecha_creacion, fecha_actualizacion)
-                VALUES (?, ?, 'PENDIENTE', ?, ?, datetime('now'), datetime('now'))
-            """
-            reserva_params = (client_id, total_amount, notes, payment_method)
-            cursor = self.data_manager.execute_query(reserva_query, reserva_params)
-
-            if not cursor or not cursor.lastrowid:
-                return False, "Error al crear el registro de la reserva."
-            
-            id_reserva = cursor.lastrowid
-            
-            # Obtener el nombre del cliente para el concepto del ingreso
-            client_name_query = "SELECT nombre FROM clientes WHERE id_cliente = ?"
-            client_result = self.data_manager.fetch_query(client_name_query, (client_id,))
-            client_name = client_result[0]['nombre'] if client_result else "Cliente Desconocido"
-
-            # 2. Registrar el abono inicial como un ingreso
-            ingreso_query = "INSERT INTO ingresos (monto, concepto, metodo_pago, id_reserva) VALUES (?, ?, ?, ?)"
-            concepto_ingreso = f"Abono inicial de {client_name} para reserva #{id_reserva}"
-            self.data_manager.execute_query(ingreso_query, (paid_amount, concepto_ingreso, payment_method, id_reserva))
-
-            # 3. Procesar inventario y detalles de la reserva
-            from collections import defaultdict
-            
-            books_by_isbn = defaultdict(lambda: {'count': 0, 'total_price': 0.0})
-            generic_items = []
-
-            for item in book_items:
-                if 'libro_isbn' in item:
-                    isbn = item['libro_isbn']
-                    books_by_isbn[isbn]['count'] += 1
-                    books_by_isbn[isbn]['total_price'] += item.get('precio_venta', 0)
-                else:
-                    generic_items.append(item)
-
-            # Guardar libros en detalles_reserva y actualizar inventario
-            for isbn, data in books_by_isbn.items():
-                count = data['count']
-                unit_price = data['total_price'] / count if count > 0 else 0
+            # Todas las sentencias forman una única unidad de trabajo (un solo commit).
+            with self.data_manager.transaction():
+                # 1. Crear la entrada en la tabla 'reservas'
+                reserva_query = """
+                    INSERT INTO reservas (id_cliente, monto_total, estado, notas, metodo_pago_inicial, fecha_creacion, fecha_actualizacion)
+                    VALUES (?, ?, 'PENDIENTE', ?, ?, datetime('now'), datetime('now'))
+                """
+                reserva_params = (client_id, total_amount, notes, payment_method)
+                cursor = self.data_manager.execute_query(reserva_query, reserva_params)
+
+                if not cursor or not cursor.lastrowid:
+                    raise RuntimeError("Error al crear el registro de la reserva.")
                 
-                decrement_query = "UPDATE inventario SET cantidad = cantidad - ? WHERE libro_isbn = ? AND cantidad >= ?"
-                self.data_manager.execute_query(decrement_query, (count, isbn, count))
-
-                detalle_query = "INSERT INTO detalles_reserva (id_reserva, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
-                self.data_manager.execute_query(detalle_query, (id_reserva, isbn, count, unit_price))
-
-            # Guardar items genéricos en detalles_reserva
-            for item in generic_items:
-                item_id = item.get('id')
-                price = item.get('precio_venta', 0)
-                detalle_query = "INSERT INTO detalles_reserva (id_reserva, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
-                self.data_manager.execute_query(detalle_query, (id_reserva, item_id, 1, price))
+                id_reserva = cursor.lastrowid
+                
+                # Obtener el nombre del cliente para el concepto del ingreso
+                client_name_query = "SELECT nombre FROM clientes WHERE id_cliente = ?"
+                client_result = self.data_manager.fetch_query(client_name_query, (client_id,))
+                client_name = client_result[0]['nombre'] if client_result else "Cliente Desconocido"
+
+                # 2. Registrar el abono inicial como un ingreso
+                ingreso_query = "INSERT INTO ingresos (monto, concepto, metodo_pago, id_reserva) VALUES (?, ?, ?, ?)"
+                concepto_ingreso = f"Abono inicial de {client_name} para reserva #{id_reserva}"
+                self.data_manager.execute_query(ingreso_query, (paid_amount, concepto_ingreso, payment_method, id_reserva))
+
+                # 3. Procesar inventario y detalles de la reserva
+                from collections import defaultdict
+                
+                books_by_isbn = defaultdict(lambda: {'count': 0, 'total_price': 0.0})
+                generic_items = []
+
+                for item in book_items:
+                    if 'libro_isbn' in item:
+                        isbn = item['libro_isbn']
+                        books_by_isbn[isbn]['count'] += 1
+                        books_by_isbn[isbn]['total_price'] += item.get('precio_venta', 0)
+                    else:
+                        generic_items.append(item)
+
+                # Guardar libros en detalles_reserva y actualizar inventario
+                for isbn, data in books_by_isbn.items():
+                    count = data['count']
+                    unit_price = data['total_price'] / count if count > 0 else 0
+                    
+                    decrement_query = "UPDATE inventario SET cantidad = cantidad - ? WHERE libro_isbn = ? AND cantidad >= ?"
+                    self.data_manager.execute_query(decrement_query, (count, isbn, count))
+
+                    detalle_query = "INSERT INTO detalles_reserva (id_reserva, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
+                    self.data_manager.execute_query(detalle_query, (id_reserva, isbn, count, unit_price))
+
+                # Guardar items genéricos en detalles_reserva
+                for item in generic_items:
+                    item_id = item.get('id')
+                    price = item.get('precio_venta', 0)
+                    detalle_query = "INSERT INTO detalles_reserva (id_reserva, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
+                    self.data_manager.execute_query(detalle_query, (id_reserva, item_id, 1, price))
 
             return True, f"Reserva #{id_reserva} creada con éxito."
 
@@ -169,44 +171,45 @@ class ReservationService:
             return False, "No se puede crear una venta sin libros."
 
         try:
-            # 1. Crear la entrada en la tabla 'ventas'
-            venta_query = """
-                INSERT INTO ventas (id_cliente, monto_total, notas, fecha_venta)
-                VALUES (?, ?, ?, datetime('now'))
-            """
-            venta_params = (client_id, total_amount, notes)
-            cursor = self.data_manager.execute_query(venta_query, venta_params)
-
-            if not cursor or not cursor.lastrowid:
-                return False, "Error al crear el registro de la venta."
-
-            id_venta = cursor.lastrowid
-
-            # 2. Registrar el pago total como un ingreso
-            ingreso_query = "INSERT INTO ingresos (monto, concepto, id_venta) VALUES (?, ?, ?)"
-            concepto_ingreso = f"Pago completo de venta directa #{id_venta}"
-            self.data_manager.execute_query(ingreso_query, (total_amount, concepto_ingreso, id_venta))
-
-            # 3. Agrupar items por ISBN y procesar el inventario y los detalles
-            from collections import defaultdict
-            items_by_isbn = defaultdict(lambda: {'count': 0, 'price': 0})
-            for item in book_items:
-                isbn = item.get('libro_isbn')
-                if isbn:
-                    items_by_isbn[isbn]['count'] += 1
-                    items_by_isbn[isbn]['price'] = item.get('precio_venta', 0)
-
-            for isbn, data in items_by_isbn.items():
-                count = data['count']
-                price = data['price']
-
-                # Decrementar la cantidad del inventario
-                decrement_query = "UPDATE inventario SET cantidad = cantidad - ? WHERE libro_isbn = ? AND cantidad >= ?"
-                self.data_manager.execute_query(decrement_query, (count, isbn, count))
-                
-                # Registrar la venta en detalles_venta
-                detalle_query = "INSERT INTO detalles_venta (id_venta, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
-                self.data_manager.execute_query(detalle_query, (id_venta, isbn, count, price))
+            with self.data_manager.transaction():
+                # 1. Crear la entrada en la tabla 'ventas'
+                venta_query = """
+                    INSERT INTO ventas (id_cliente, monto_total, notas, fecha_venta)
+                    VALUES (?, ?, ?, datetime('now'))
+                """
+                venta_params = (client_id, total_amount, notes)
+                cursor = self.data_manager.execute_query(venta_query, venta_params)
+
+                if not cursor or not cursor.lastrowid:
+                    raise RuntimeError("Error al crear el registro de la venta.")
+
+                id_venta = cursor.lastrowid
+
+                # 2. Registrar el pago total como un ingreso
+                ingreso_query = "INSERT INTO ingresos (monto, concepto, id_venta) VALUES (?, ?, ?)"
+                concepto_ingreso = f"Pago completo de venta directa #{id_venta}"
+                self.data_manager.execute_query(ingreso_query, (total_amount, concepto_ingreso, id_venta))
+
+                # 3. Agrupar items por ISBN y procesar el inventario y los detalles
+                from collections import defaultdict
+                items_by_isbn = defaultdict(lambda: {'count': 0, 'price': 0})
+                for item in book_items:
+                    isbn = item.get('libro_isbn')
+                    if isbn:
+                        items_by_isbn[isbn]['count'] += 1
+                        items_by_isbn[isbn]['price'] = item.get('precio_venta', 0)
+
+                for isbn, data in items_by_isbn.items():
+                    count = data['count']
+                    price = data['price']
+
+                    # Decrementar la cantidad del inventario
+                    decrement_query = "UPDATE inventario SET cantidad = cantidad - ? WHERE libro_isbn = ? AND cantidad >= ?"
+                    self.data_manager.execute_query(decrement_query, (count, isbn, count))
+                    
+                    # Registrar la venta en detalles_venta
+                    detalle_query = "INSERT INTO detalles_venta (id_venta, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)"
+                    self.data_manager.execute_query(detalle_query, (id_venta, isbn, count, price))
             
             return True, f"Venta #{id_venta} registrada con éxito."
 
@@ -310,24 +313,25 @@ class ReservationService:
             return False, "La reserva no existe."
         
         try:
-            # Revertir el inventario para cada libro
-            for book in details.get('libros', []):
-                # Solo los libros reales (con ISBN no genérico) afectan el inventario
-                if not book['libro_isbn'].startswith(('promo_', 'disc_')):
-                    revert_query = "UPDATE inventario SET cantidad = cantidad + ? WHERE libro_isbn = ?"
-                    self.data_manager.execute_query(revert_query, (book['cantidad'], book['libro_isbn']))
-
-            # Registrar egreso si se hace devolución de dinero
-            if with_refund:
-                paid_amount = details.get('monto_abonado', 0)
-                if paid_amount > 0:
-                    egreso_query = "INSERT INTO egresos (monto, concepto, id_reserva, metodo_pago) VALUES (?, ?, ?, ?)"
-                    # Asumimos que la devolución se hace en efectivo, se podría hacer más complejo
-                    self.data_manager.execute_query(egreso_query, (paid_amount, f"Devolución por cancelación de reserva #{reservation_id}", reservation_id, "Efectivo"))
-
-            # Finalmente, marcar la reserva como CANCELADA
-            cancel_query = "UPDATE reservas SET estado = 'CANCELADA', fecha_actualizacion = datetime('now', 'localtime') WHERE id_reserva = ?"
-            self.data_manager.execute_query(cancel_query, (reservation_id,))
+            with self.data_manager.transaction():
+                # Revertir el inventario para cada libro
+                for book in details.get('libros', []):
+                    # Solo los libros reales (con ISBN no genérico) afectan el inventario
+                    if not book['libro_isbn'].startswith(('promo_', 'disc_')):
+                        revert_query = "UPDATE inventario SET cantidad = cantidad + ? WHERE libro_isbn = ?"
+                        self.data_manager.execute_query(revert_query, (book['cantidad'], book['libro_isbn']))
+
+                # Registrar egreso si se hace devolución de dinero
+                if with_refund:
+                    paid_amount = details.get('monto_abonado', 0)
+                    if paid_amount > 0:
+                        egreso_query = "INSERT INTO egresos (monto, concepto, id_reserva, metodo_pago) VALUES (?, ?, ?, ?)"
+                        # Asumimos que la devolución se hace en efectivo, se podría hacer más complejo
+                        self.data_manager.execute_query(egreso_query, (paid_amount, f"Devolución por cancelación de reserva #{reservation_id}", reservation_id, "Efectivo"))
+
+                # Finalmente, marcar la reserva como CANCELADA
+                cancel_query = "UPDATE reservas SET estado = 'CANCELADA', fecha_actualizacion = datetime('now', 'localtime') WHERE id_reserva = ?"
+                self.data_manager.execute_query(cancel_query, (reservation_id,))
             
             return True, f"Reserva #{reservation_id} cancelada."
         except Exception as e:
@@ -349,38 +353,39 @@ class ReservationService:
         if final_payment < due_amount - 0.01:
             return False, f"El pago final (${final_payment}) es menor que el saldo pendiente (${due_amount})."
 
-        client_id = details['cliente_id']
+        client_id = details['id_cliente']
         notes = details.get('notas', '')
 
         try:
-            # 1. Crear la venta
-            venta_query = """
-                INSERT INTO ventas (id_cliente, id_reserva_origen, monto_total, notas, fecha_venta, metodo_pago)
-                VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
-            """
-            venta_params = (client_id, reservation_id, total_amount, notes, payment_method)
-            cursor = self.data_manager.execute_query(venta_query, venta_params)
-            
-            if not cursor or not cursor.lastrowid:
-                return False, "No se pudo crear el registro de la venta."
-            id_venta = cursor.lastrowid
-
-            # 2. Registrar el pago final como un ingreso si es mayor que cero
-            if final_payment > 0:
-                ingreso_query = "INSERT INTO ingresos (monto, concepto, metodo_pago, id_venta, id_reserva) VALUES (?, ?, ?, ?, ?)"
-                concepto = f"Pago final para completar reserva #{reservation_id} (Venta #{id_venta})"
-                self.data_manager.execute_query(ingreso_query, (final_payment, concepto, payment_method, id_venta, reservation_id))
-
-            # 3. Actualizar el estado de la reserva
-            reserva_update_query = "UPDATE reservas SET estado = 'COMPLETADA', fecha_actualizacion = datetime('now', 'localtime') WHERE id_reserva = ?"
-            self.data_manager.execute_query(reserva_update_query, (reservation_id,))
-
-            # 4. Copiar los detalles de la reserva a los detalles de la venta
-            book_items = details.get('libros', [])
-            for item in book_items:
-                detail_data = (id_venta, item['libro_isbn'], item['cantidad'], item['precio_unitario'])
-                self.data_manager.execute_query("INSERT INTO detalles_venta (id_venta, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)", detail_data)
+            with self.data_manager.transaction():
+                # 1. Crear la venta
+                venta_query = """
+                    INSERT INTO ventas (id_cliente, id_reserva_origen, monto_total, notas, fecha_venta, metodo_pago)
+                    VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
+                """
+                venta_params = (client_id, reservation_id, total_amount, notes, payment_method)
+                cursor = self.data_manager.execute_query(venta_query, venta_params)
+                
+                if not cursor or not cursor.lastrowid:
+                    raise RuntimeError("No se pudo crear el registro de la venta.")
+                id_venta = cursor.lastrowid
+
+                # 2. Registrar el pago final como un ingreso si es mayor que cero
+                if final_payment > 0:
+                    ingreso_query = "INSERT INTO ingresos (monto, concepto, metodo_pago, id_venta, id_reserva) VALUES (?, ?, ?, ?, ?)"
+                    concepto = f"Pago final para completar reserva #{reservation_id} (Venta #{id_venta})"
+                    self.data_manager.execute_query(ingreso_query, (final_payment, concepto, payment_method, id_venta, reservation_id))
+
+                # 3. Actualizar el estado de la reserva
+                reserva_update_query = "UPDATE reservas SET estado = 'COMPLETADA', fecha_actualizacion = datetime('now', 'localtime') WHERE id_reserva = ?"
+                self.data_manager.execute_query(reserva_update_query, (reservation_id,))
+
+                # 4. Copiar los detalles de la reserva a los detalles de la venta
+                book_items = details.get('libros', [])
+                for item in book_items:
+                    detail_data = (id_venta, item['libro_isbn'], item['cantidad'], item['precio_unitario'])
+                    self.data_manager.execute_query("INSERT INTO detalles_venta (id_venta, libro_isbn, cantidad, precio_unitario) VALUES (?, ?, ?, ?)", detail_data)
 
             return True, f"Reserva convertida a venta #{id_venta} con éxito."
         except Exception as e:
-            return False, f"Error al convertir la reserva en venta: {e}" 
\ No newline at end of file
+            return False, f"Error al convertir la reserva en venta: {e}" 
@@ -44,3 +44,22 @@ def normalize_for_search(text: str) -> str:
     nfkd_form = unicodedata.normalize('NFD', text.lower())
     # Se eliminan los caracteres que son acentos (combinados)
     return "".join([c for c in nfkd_form if not unicodedata.combining(c)])
+
+
+def isbn_a_13(isbn: str) -> str:
+    """
+    Normaliza un ISBN a su forma ISBN-13 (solo dígitos).
+    Acepta guiones y espacios, e ISBN-10 (con 'X' como dígito de control).
+    Devuelve "" si el texto no tiene forma de ISBN.
+    Ej: "0-306-40615-2" -> "9780306406157"
+    """
+    if not isinstance(isbn, str):
+        return ""
+    limpio = isbn.replace("-", "").replace(" ", "").strip().upper()
+    if len(limpio) == 13 and limpio.isdigit():
+        return limpio
+    if len(limpio) == 10 and limpio[:9].isdigit() and (limpio[9].isdigit() or limpio[9] == "X"):
+        base = "978" + limpio[:9]
+        suma = sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(base))
+        return base + str((10 - suma % 10) % 10)
+    return ""
@@ -0,0 +1,172 @@
+"""
+Ejecución de llamadas a servicios en segundo plano para la GUI.
+
+Las consultas a la base de datos y a las APIs de libros pueden tardar (disco lento,
+red caída). Si se ejecutan en el hilo principal de Qt, la ventana se congela hasta
+que terminan. AsyncServiceRunner las envía a un QThreadPool y entrega el resultado
+de vuelta en el hilo de la GUI mediante señales, donde es seguro tocar widgets.
+
+Uso típico desde un diálogo:
+
+    self.tareas = AsyncServiceRunner(self)
+    self.tareas.submit(self.book_service.buscar_libro_por_isbn, isbn,
+                       on_result=self._on_isbn_encontrado, on_error=self._on_error,
+                       key="buscar_isbn")
+
+Con 'key', una petición nueva cancela la anterior con la misma clave: si la
+anterior aún no empezó se retira de la cola, y si ya está en curso su resultado
+se descarta al llegar. Así una respuesta antigua nunca pisa a una más reciente.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+_pool_compartido: Optional[QThreadPool] = None
+
+
+def shared_thread_pool() -> QThreadPool:
+    """Devuelve el pool de hilos compartido para consultas a servicios."""
+    global _pool_compartido
+    if _pool_compartido is None:
+        _pool_compartido = QThreadPool()
+        _pool_compartido.setMaxThreadCount(4)
+        # Los hilos no caducan: cada uno conserva su conexión SQLite del pool de
+        # conexiones, en lugar de abrir una nueva cada vez que Qt recrea un hilo.
+        _pool_compartido.setExpiryTimeout(-1)
+    return _pool_compartido
+
+
+class TaskHandle:
+    """Referencia a una tarea enviada al pool. Permite cancelarla."""
+
+    def __init__(self, key: Optional[Hashable],
+                 on_result: Optional[Callable[[Any], None]],
+                 on_error: Optional[Callable[[Exception], None]]):
+        self.key = key
+        self.on_result = on_result
+        self.on_error = on_error
+        self._cancelada = threading.Event()
+
+    def cancel(self) -> None:
+        """Marca la tarea como cancelada; su resultado ya no se entregará."""
+        self._cancelada.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelada.is_set()
+
+
+class _TaskSignals(QObject):
+    # handle, éxito, resultado o excepción
+    done = Signal(object, bool, object)
+
+
+class _ServiceTask(QRunnable):
+    """Ejecuta una función de servicio en un hilo del pool."""
+
+    def __init__(self, handle: TaskHandle, fn: Callable, args: tuple, kwargs: dict):
+        super().__init__()
+        self.handle = handle
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+        # La tarea la mantiene viva el runner hasta recibir 'done': si el pool la
+        # borrara al terminar run(), cancelarla antes de esa señal (tryTake) fallaría.
+        self.setAutoDelete(False)
+
+    def run(self):
+        if self.handle.cancelled:
+            self.signals.done.emit(self.handle, False, None)
+            return
+        try:
+            resultado = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.done.emit(self.handle, False, e)
+            return
+        self.signals.done.emit(self.handle, True, resultado)
+
+
+class AsyncServiceRunner(QObject):
+    """
+    Fachada asíncrona sobre los servicios para un diálogo o ventana.
+
+    Los callbacks 'on_result' y 'on_error' se ejecutan siempre en el hilo de la GUI.
+    Se recomienda crear un runner por diálogo (con el diálogo como padre) y llamar
+    a cancel_all() al cerrarlo, para que ningún resultado llegue a widgets destruidos.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None, pool: Optional[QThreadPool] = None):
+        super().__init__(parent)
+        self._pool = pool or shared_thread_pool()
+        self._tareas: Dict[TaskHandle, _ServiceTask] = {}
+        self._ultimas: Dict[Hashable, TaskHandle] = {}
+
+    def submit(self, fn: Callable, *args,
+               on_result: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               key: Optional[Hashable] = None, **kwargs) -> TaskHandle:
+        """
+        Ejecuta fn(*args, **kwargs) en segundo plano.
+
+        Args:
+            fn: Función a ejecutar (normalmente un método de un servicio).
+            on_result: Se llama con el valor devuelto por fn.
+            on_error: Se llama con la excepción si fn falla. Si no se indica,
+                      el error solo se imprime en consola.
+            key: Clave de la petición. Una petición nueva con la misma clave
+                 cancela la anterior.
+        """
+        if key is not None:
+            self.cancel(key)
+
+        handle = TaskHandle(key, on_result, on_error)
+        tarea = _ServiceTask(handle, fn, args, kwargs)
+        tarea.signals.done.connect(self._on_task_done)
+        self._tareas[handle] = tarea
+        if key is not None:
+            self._ultimas[key] = handle
+        self._pool.start(tarea)
+        return handle
+
+    def is_running(self, key: Hashable) -> bool:
+        """Indica si hay una petición pendiente con esa clave."""
+        return key in self._ultimas
+
+    def cancel(self, key: Hashable) -> None:
+        """Cancela la petición pendiente con esa clave, si la hay."""
+        handle = self._ultimas.pop(key, None)
+        if handle is not None:
+            self._cancelar(handle)
+
+    def cancel_all(self) -> None:
+        """Cancela todas las peticiones pendientes de este runner."""
+        self._ultimas.clear()
+        for handle in list(self._tareas):
+            self._cancelar(handle)
+
+    def _cancelar(self, handle: TaskHandle) -> None:
+        handle.cancel()
+        tarea = self._tareas.get(handle)
+        # Si aún está en la cola se retira; si ya se está ejecutando, su resultado
+        # se descartará en _on_task_done.
+        if tarea is not None and self._pool.tryTake(tarea):
+            del self._tareas[handle]
+
+    @Slot(object, bool, object)
+    def _on_task_done(self, handle: TaskHandle, exito: bool, valor: Any):
+        self._tareas.pop(handle, None)
+        if self._ultimas.get(handle.key) is handle:
+            del self._ultimas[handle.key]
+        if handle.cancelled:
+            return
+
+        if exito:
+            if handle.on_result:
+                handle.on_result(valor)
+        elif handle.on_error:
+            handle.on_error(valor)
+        else:
+            print(f"\033[1;31m❌ Error en tarea en segundo plano: {valor}\033[0m")
@@ -0,0 +1,80 @@
+"""
+Modelos de datos para las vistas de lista pintadas con delegados.
+
+En lugar de crear un widget por fila (setItemWidget), las listas largas guardan
+sus filas en un DictListModel y un QStyledItemDelegate las pinta: solo se dibujan
+las filas visibles y no existe ningún widget por fila.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class DictListModel(QAbstractListModel):
+    """
+    Lista de diccionarios (libros, reservas...) para una QListView.
+
+    Qt.UserRole devuelve el diccionario completo y DisplayRole el valor de
+    'clave_texto'. Si la lista está vacía y hay 'texto_vacio', el modelo muestra
+    una única fila no seleccionable con ese texto (p. ej. "Sin resultados").
+    """
+
+    def __init__(self, clave_texto: str = "", texto_vacio: str = "", parent=None):
+        super().__init__(parent)
+        self.clave_texto = clave_texto
+        self.texto_vacio = texto_vacio
+        self._filas: List[Dict[str, Any]] = []
+
+    def set_items(self, filas: List[Dict[str, Any]]) -> None:
+        self.beginResetModel()
+        self._filas = list(filas)
+        self.endResetModel()
+
+    def append_items(self, filas: List[Dict[str, Any]]) -> None:
+        if not filas:
+            return
+        if not self._filas:
+            self.set_items(filas)
+            return
+        inicio = len(self._filas)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(filas) - 1)
+        self._filas.extend(filas)
+        self.endInsertRows()
+
+    def items(self) -> List[Dict[str, Any]]:
+        return self._filas
+
+    def item(self, fila: int) -> Optional[Dict[str, Any]]:
+        return self._filas[fila] if 0 <= fila < len(self._filas) else None
+
+    def es_fila_vacia(self, index: QModelIndex) -> bool:
+        """Indica si 'index' es la fila de aviso que se muestra con la lista vacía."""
+        return index.isValid() and not self._filas
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if not self._filas:
+            return 1 if self.texto_vacio else 0
+        return len(self._filas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self._filas:
+            return self.texto_vacio if role == Qt.ItemDataRole.DisplayRole else None
+        fila = self._filas[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return fila
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole) and self.clave_texto:
+            return str(fila.get(self.clave_texto, ""))
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if not self._filas:
+            # La fila de aviso se ve, pero no se puede seleccionar
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
@@ -1,4 +1,6 @@
 from PySide6.QtGui import QFontDatabase, QIcon
+from PySide6.QtWidgets import QAbstractItemView
+from typing import Tuple
 import os
 
 def format_price(price: float) -> str:
@@ -31,4 +33,37 @@ def load_fonts():
                 if font_id == -1:
                     print(f"Advertencia: No se pudo cargar la fuente: {font_path}")
     except FileNotFoundError:
-        print(f"Advertencia: El directorio de fuentes no se encontró en: {fonts_dir}") 
\ No newline at end of file
+        print(f"Advertencia: El directorio de fuentes no se encontró en: {fonts_dir}") 
+
+def visible_rows(view: QAbstractItemView) -> Tuple[int, int]:
+    """
+    Devuelve (primera, última) fila visible de una vista de lista o tabla,
+    o (0, -1) si no hay filas. Busca por bisección, sin recorrer todas las filas.
+    """
+    model = view.model()
+    count = model.rowCount() if model is not None else 0
+    if count == 0:
+        return 0, -1
+    height = view.viewport().height()
+
+    def rect(row):
+        return view.visualRect(model.index(row, 0))
+
+    # Primera fila cuyo borde inferior entra en el área visible
+    lo, hi = 0, count - 1
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if rect(mid).bottom() < 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    first = lo
+    # Última fila cuyo borde superior entra en el área visible
+    hi = count - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if rect(mid).top() < height:
+            lo = mid
+        else:
+            hi = mid - 1
+    return first, max(first, lo)
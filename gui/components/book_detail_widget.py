@@ -15,6 +15,7 @@ class BookDetailWidget(QFrame):
         
         self.image_manager = image_manager
         self.image_manager.image_loaded.connect(self._on_image_loaded)
+        self.image_manager.image_failed.connect(self._on_image_failed)
         self._current_book_isbn = None
 
         # Main layout
@@ -124,16 +125,17 @@ class BookDetailWidget(QFrame):
         image_url = book_data.get("Imagen")
         if image_url and self._current_book_isbn:
             self.image_label.setText("CARGANDO...")
-            self.image_manager.get_image(self._current_book_isbn, image_url)
+            self.image_manager.get_image(self._current_book_isbn, image_url, "detail")
         else:
             self.image_label.setText("NO IMAGEN DISPONIBLE")
             self.image_label.setPixmap(QPixmap())
 
-    def _on_image_loaded(self, image_id, pixmap):
+    def _on_image_loaded(self, image_id, size_name, pixmap):
+        # La miniatura ya viene escalada al tamaño del panel desde el gestor de imágenes
+        if self._current_book_isbn == image_id and size_name == "detail":
+            self.image_label.setPixmap(pixmap)
+            self.image_label.setText("")
+
+    def _on_image_failed(self, image_id):
         if self._current_book_isbn == image_id:
-            self.image_label.setPixmap(pixmap.scaled(
-                self.image_label.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            ))
-            self.image_label.setText("")
\ No newline at end of file
+            self.image_label.setText("NO IMAGEN DISPONIBLE")
\ No newline at end of file
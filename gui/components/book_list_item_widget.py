@@ -80,21 +80,21 @@ class BookListItemWidget(QWidget):
         main_layout.addLayout(details_layout, 2)
 
 
-        # Load Image
+        # Load Image: cached covers are shown at once; the rest arrive through the
+        # list's viewport prefetch (BookListViewWidget), not one request per row.
         self.image_manager.image_loaded.connect(self.on_image_loaded)
         image_url = self.book_data.get("Imagen", "")
         if image_url and self.isbn:
-            self.image_manager.get_image(self.isbn, image_url)
+            pixmap = self.image_manager.cached_pixmap(self.isbn, image_url, "list_row")
+            if pixmap is not None:
+                self.on_image_loaded(self.isbn, "list_row", pixmap)
         else:
             self.image_label.setText("NO IMG")
 
-    def on_image_loaded(self, image_id, pixmap):
-        if self.isbn == image_id:
-            self.image_label.setPixmap(pixmap.scaled(
-                self.image_label.size(), 
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding, 
-                Qt.TransformationMode.SmoothTransformation
-            ))
+    def on_image_loaded(self, image_id, size_name, pixmap):
+        # Already scaled and cropped to the row size by the image manager
+        if self.isbn == image_id and size_name == "list_row":
+            self.image_label.setPixmap(pixmap)
             self.image_label.setText("")
 
     # By removing minimumSizeHint, we let the layout determine the optimal size.
@@ -1,13 +1,16 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QListWidgetItem
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from typing import List, Dict, Any
 
 from .book_list_item_widget import BookListItemWidget
 from .image_manager import ImageManager
+from gui.common.utils import visible_rows
 
 class BookListViewWidget(QWidget):
     # Signal to be emitted when an image view is requested from one of the items
     image_view_requested = Signal(str)
+    # Emitted when the user scrolls close to the last loaded row (paged searches load more)
+    more_results_requested = Signal()
 
     def __init__(self, image_manager: ImageManager, parent: QWidget = None):
         super().__init__(parent)
@@ -37,22 +40,75 @@ class BookListViewWidget(QWidget):
         """)
         self.main_layout.addWidget(self.list_widget)
 
+        # Row covers are loaded by viewport-aware prefetch rather than by every row
+        # at once: visible rows first, then the next page.
+        self.books_data: List[Dict[str, Any]] = []
+        self._prefetch_group = f"book-list-view-{id(self)}"
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(80)
+        self._prefetch_timer.timeout.connect(self._schedule_cover_prefetch)
+        self.list_widget.verticalScrollBar().valueChanged.connect(self._prefetch_timer.start)
+
     def update_results(self, books_data: List[Dict[str, Any]]):
         self.list_widget.clear()
+        self.books_data = list(books_data)
+        self.cancel_cover_prefetch()
         if not books_data:
             return
 
         for book in books_data:
-            list_item_widget = BookListItemWidget(book, self.image_manager)
-            list_item_widget.image_view_requested.connect(self.image_view_requested)
-            
-            q_list_item = QListWidgetItem(self.list_widget)
-            q_list_item.setSizeHint(list_item_widget.minimumSizeHint())
-            
-            self.list_widget.addItem(q_list_item)
-            self.list_widget.setItemWidget(q_list_item, list_item_widget)
-            
-            q_list_item.setData(Qt.ItemDataRole.UserRole, book)
+            self._add_book_item(book)
+        self._prefetch_timer.start()
+
+    def append_results(self, books_data: List[Dict[str, Any]]):
+        """Adds the next page of a paged search below the rows already shown."""
+        if not books_data or not self.books_data:
+            return
+        self.books_data.extend(books_data)
+        for book in books_data:
+            self._add_book_item(book)
+        self._prefetch_timer.start()
+
+    def _add_book_item(self, book: Dict[str, Any]):
+        list_item_widget = BookListItemWidget(book, self.image_manager)
+        list_item_widget.image_view_requested.connect(self.image_view_requested)
+        
+        q_list_item = QListWidgetItem(self.list_widget)
+        q_list_item.setSizeHint(list_item_widget.minimumSizeHint())
+        
+        self.list_widget.addItem(q_list_item)
+        self.list_widget.setItemWidget(q_list_item, list_item_widget)
+        
+        q_list_item.setData(Qt.ItemDataRole.UserRole, book)
+
+    def _schedule_cover_prefetch(self):
+        if not self.books_data or not self.isVisible():
+            return
+        first, last = visible_rows(self.list_widget)
+        page = last - first + 1
+        if last + page >= len(self.books_data):
+            self.more_results_requested.emit()
+        refs = [(book.get("ISBN"), book.get("Imagen")) for book in self.books_data]
+        self.image_manager.schedule_prefetch(
+            self._prefetch_group,
+            visible=refs[first:last + 1],
+            upcoming=refs[last + 1:last + 1 + page],
+            size_name="list_row",
+        )
+
+    def cancel_cover_prefetch(self):
+        """Cancels the cover prefetches still queued for this list."""
+        self._prefetch_timer.stop()
+        self.image_manager.cancel_prefetch(self._prefetch_group)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._prefetch_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.cancel_cover_prefetch()
 
     def get_current_selected_book_data(self) -> Dict[str, Any] | None:
         current_item = self.list_widget.currentItem()
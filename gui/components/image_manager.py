@@ -1,86 +1,478 @@
+"""
+Application-wide cover image service.
+
+Covers go through two cache tiers before touching the network:
+  1. An in-memory LRU of decoded QPixmaps, bounded by a byte budget.
+  2. A disk cache (data/cache/images) with a size cap; the least recently used
+     files are evicted first.
+Disk reads, downloads, decoding and scaling run in a bounded thread pool; only
+the cheap QImage -> QPixmap conversion happens on the GUI thread.
+
+Widgets request covers by display size (see THUMBNAIL_SIZES). Each size is
+scaled once in a worker and cached in both tiers, so the GUI thread only ever
+draws pixmaps that already have the right size.
+
+Lists prefetch covers with schedule_prefetch(): the visible rows first, then the
+next page at a lower priority. Prefetches still queued are cancelled when the
+list scrolls elsewhere, is hidden or shows a new search.
+
+All widgets share one instance through shared_image_manager().
+"""
+
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
 import requests
-from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
-from PySide6.QtGui import QPixmap
+from requests.adapters import HTTPAdapter
+from PySide6.QtCore import QObject, Signal, Slot, QRunnable, QThreadPool, Qt, QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
 
-class ImageDownloader(QRunnable):
+DEFAULT_CACHE_DIR = "data/cache/images"
+
+
+class ThumbnailSize(NamedTuple):
+    """Display box for a cover. crop=True fills the box and crops the overflow."""
+    width: int
+    height: int
+    crop: bool = False
+
+
+# Sizes at which the widgets show covers. "" (no size) means the original image.
+THUMBNAIL_SIZES = {
+    "list_row": ThumbnailSize(45, 60, crop=True),   # BookListItemWidget
+    "detail": ThumbnailSize(180, 220),              # BookDetailWidget
+    "form": ThumbnailSize(220, 310, crop=True),     # BookFormDialog
+    "delete": ThumbnailSize(220, 330),              # DeleteBookDialog
+}
+
+
+def scale_image(image: QImage, size: ThumbnailSize, device_pixel_ratio: float = 1.0) -> QImage:
+    """Scales (and, for crop sizes, center-crops) an image to a display size. Safe in any thread."""
+    width = max(1, round(size.width * device_pixel_ratio))
+    height = max(1, round(size.height * device_pixel_ratio))
+    mode = Qt.AspectRatioMode.KeepAspectRatioByExpanding if size.crop else Qt.AspectRatioMode.KeepAspectRatio
+    scaled = image.scaled(width, height, mode, Qt.TransformationMode.SmoothTransformation)
+    if size.crop and (scaled.width() > width or scaled.height() > height):
+        scaled = scaled.copy((scaled.width() - width) // 2, (scaled.height() - height) // 2,
+                             min(width, scaled.width()), min(height, scaled.height()))
+    return scaled
+
+
+class PixmapCache:
     """
-    Worker thread for downloading an image.
-    Emits the image_id and the downloaded QPixmap upon completion.
+    In-memory LRU of decoded pixmaps, bounded by an approximate byte budget.
+    Only used from the GUI thread.
     """
-    def __init__(self, image_id: str, url: str, cache_path: str):
-        super().__init__()
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items: "OrderedDict[str, QPixmap]" = OrderedDict()
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: str) -> Optional[QPixmap]:
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+        return pixmap
+
+    def put(self, key: str, pixmap: QPixmap) -> None:
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.total_bytes -= self._cost(old)
+        self._items[key] = pixmap
+        self.total_bytes += self._cost(pixmap)
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self.total_bytes -= self._cost(evicted)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class DiskCache:
+    """
+    Directory of downloaded image files with a total size cap.
+
+    Recency is tracked in memory (seeded from file mtimes on first use) and the
+    least recently used files are deleted when the cap is exceeded. Thread-safe:
+    it is used from the download workers.
+    """
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sizes: Optional["OrderedDict[str, int]"] = None
+        self.total_bytes = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _index(self) -> "OrderedDict[str, int]":
+        # Called with the lock held. Scans the directory once, oldest first.
+        if self._sizes is None:
+            entries = []
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name, stat.st_size))
+            entries.sort()
+            self._sizes = OrderedDict((name, size) for _, name, size in entries)
+            self.total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def read(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            sizes = self._index()
+            if name not in sizes:
+                return None
+            sizes.move_to_end(name)
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # persists recency across restarts
+            return data
+        except OSError:
+            with self._lock:
+                size = sizes.pop(name, None)
+                if size is not None:
+                    self.total_bytes -= size
+            return None
+
+    def write(self, name: str, data: bytes) -> None:
+        path = self._path(name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to save image {name} to the disk cache: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        evicted = []
+        with self._lock:
+            sizes = self._index()
+            self.total_bytes += len(data) - sizes.pop(name, 0)
+            sizes[name] = len(data)
+            while self.total_bytes > self.max_bytes and len(sizes) > 1:
+                old_name, old_size = sizes.popitem(last=False)
+                self.total_bytes -= old_size
+                evicted.append(old_name)
+        for old_name in evicted:
+            try:
+                os.remove(self._path(old_name))
+            except OSError:
+                pass
+
+
+class _LoadJob:
+    """
+    One in-flight load of a cover, shared by every request for the same image
+    and URL (request coalescing). While the job is open, new requests only add
+    their size to it; the worker downloads the original once and serves every
+    size queued before it finishes.
+    """
+    def __init__(self, image_id: str, url: str, size_name: str,
+                 priority: int, group: Optional[str] = None):
         self.image_id = image_id
         self.url = url
-        self.cache_path = cache_path
+        self.priority = priority
+        # Prefetch group that may cancel the job while queued; None once a widget
+        # is waiting for it (see ImageManager._request)
+        self.group = group
+        self.runnable: Optional["ImageDownloader"] = None
+        self._lock = threading.Lock()
+        self._sizes = [size_name]
+        self._closed = False
+
+    def add_size(self, size_name: str) -> bool:
+        """Queues another size. Returns False if the worker has already finished."""
+        with self._lock:
+            if self._closed:
+                return False
+            if size_name not in self._sizes:
+                self._sizes.append(size_name)
+            return True
+
+    def next_size(self) -> Optional[str]:
+        """Takes the next queued size, or closes the job if none is left."""
+        with self._lock:
+            if self._sizes:
+                return self._sizes.pop(0)
+            self._closed = True
+            return None
+
+
+class ImageDownloader(QRunnable):
+    """
+    Worker that loads one cover at every size queued in its _LoadJob.
+
+    Cached thumbnails are used when present. Otherwise the original comes from
+    the disk cache or the network (at most once per job, and saved to the disk
+    cache), and is scaled here and saved as a thumbnail. Everything is done with
+    QImage, which, unlike QPixmap, is safe to use outside the GUI thread.
+    Emits the image_id, the URL, the size name and the QImage for each size.
+    """
+    def __init__(self, job: _LoadJob, disk_cache: DiskCache, session: requests.Session,
+                 device_pixel_ratio: float = 1.0, timeout: float = 10):
+        super().__init__()
+        self.job = job
+        self.image_id = job.image_id
+        self.url = job.url
+        self.disk_cache = disk_cache
+        self.session = session
+        self.device_pixel_ratio = device_pixel_ratio
+        self.timeout = timeout
+        # Files are named after the URL too, so a changed cover URL is never served stale
+        self.file_key = f"{self.image_id}_{hashlib.sha1(self.url.encode('utf-8')).hexdigest()[:10]}"
         self.signals = self._Signals()
 
     class _Signals(QObject):
-        finished = Signal(str, QPixmap)
-        failed = Signal(str)
+        finished = Signal(str, str, str, QImage) # image_id, url, size name, image
+        failed = Signal(str, str)
+        done = Signal(object)
+
+    def _thumbnail_file_name(self, size_name: str) -> str:
+        size = THUMBNAIL_SIZES[size_name]
+        width = round(size.width * self.device_pixel_ratio)
+        height = round(size.height * self.device_pixel_ratio)
+        return f"{self.file_key}_{width}x{height}{'c' if size.crop else ''}.jpg"
 
     def run(self):
+        original: Optional[QImage] = None
+        original_failed = False
         try:
-            response = requests.get(self.url, stream=True, timeout=10)
-            response.raise_for_status()
-            
-            pixmap = QPixmap()
-            pixmap.loadFromData(response.content)
-            
-            with open(self.cache_path, 'wb') as f:
-                f.write(response.content)
-            
-            self.signals.finished.emit(self.image_id, pixmap)
-        except (requests.RequestException, IOError) as e:
-            print(f"Failed to download or save image for {self.image_id}: {e}")
-            self.signals.failed.emit(self.image_id)
+            while True:
+                size_name = self.job.next_size()
+                if size_name is None:
+                    break
+
+                if size_name:
+                    thumbnail_name = self._thumbnail_file_name(size_name)
+                    data = self.disk_cache.read(thumbnail_name)
+                    image = QImage()
+                    if data is not None and image.loadFromData(data):
+                        self.signals.finished.emit(self.image_id, self.url, size_name, image)
+                        continue
+
+                if original is None and not original_failed:
+                    original = self._load_original()
+                    original_failed = original is None
+                if original_failed:
+                    self.signals.failed.emit(self.image_id, size_name)
+                    continue
+
+                image = original
+                if size_name:
+                    image = scale_image(original, THUMBNAIL_SIZES[size_name], self.device_pixel_ratio)
+                    self.disk_cache.write(thumbnail_name, self._encode(image))
+                self.signals.finished.emit(self.image_id, self.url, size_name, image)
+        finally:
+            self.signals.done.emit(self.job)
+
+    def _load_original(self) -> Optional[QImage]:
+        file_name = f"{self.file_key}.jpg"
+        data = self.disk_cache.read(file_name)
+        downloaded = data is None
+        if downloaded:
+            try:
+                response = self.session.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.content
+            except requests.RequestException as e:
+                print(f"Failed to download image for {self.image_id}: {e}")
+                return None
+
+        image = QImage()
+        if not image.loadFromData(data):
+            print(f"Failed to decode image for {self.image_id}")
+            return None
+
+        # Only images that decode are worth keeping on disk
+        if downloaded:
+            self.disk_cache.write(file_name, data)
+        return image
+
+    @staticmethod
+    def _encode(image: QImage) -> bytes:
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buffer, "JPG", 90)
+        buffer.close()
+        return bytes(data)
 
 
 class ImageManager(QObject):
     """
-    Manages asynchronous downloading and local caching of images.
+    Manages asynchronous loading, prefetching and two-tier caching of images.
     """
-    image_loaded = Signal(str, QPixmap) # image_id, pixmap
+    # Download pool priorities: what the user is waiting for goes first
+    PRIORITY_ON_DEMAND = 2
+    PRIORITY_VISIBLE = 1
+    PRIORITY_PREFETCH = 0
+
+    image_loaded = Signal(str, str, QPixmap) # image_id, size name ("" = original), pixmap
+    image_failed = Signal(str) # image_id
 
-    def __init__(self, cache_dir: str = "data/cache/images", parent=None):
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 memory_budget_bytes: int = 64 * 1024 * 1024,
+                 disk_budget_bytes: int = 256 * 1024 * 1024,
+                 max_downloads: int = 4, parent=None):
         super().__init__(parent)
         self.cache_dir = cache_dir
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
-        
-        self.thread_pool = QThreadPool()
-        self.active_downloads = set()
+        self.memory_cache = PixmapCache(memory_budget_bytes)
+        self.disk_cache = DiskCache(cache_dir, disk_budget_bytes)
+
+        # Own bounded pool: slow downloads must not starve the database queries
+        # running on the shared service pool.
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_downloads)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_downloads)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # In-flight loads by (image_id, url); see _LoadJob
+        self._jobs: Dict[Tuple[str, str], _LoadJob] = {}
+
+    @staticmethod
+    def _memory_key(image_id: str, url: str, size_name: str) -> str:
+        return f"{image_id}|{size_name}|{url}"
+
+    @staticmethod
+    def _device_pixel_ratio() -> float:
+        screen = QGuiApplication.primaryScreen()
+        return screen.devicePixelRatio() if screen else 1.0
 
-    def get_image(self, image_id: str, url: str):
+    def cached_pixmap(self, image_id: str, url: str, size_name: str = "") -> Optional[QPixmap]:
+        """Returns the pixmap if it is already in memory, without loading anything."""
+        if not image_id or not url:
+            return None
+        return self.memory_cache.get(self._memory_key(image_id, url, size_name))
+
+    def get_image(self, image_id: str, url: str, size_name: str = ""):
         """
-        Retrieves an image. Checks cache first, otherwise downloads.
+        Retrieves an image at one of the THUMBNAIL_SIZES ("" for the original).
+        Memory hits are emitted immediately; otherwise the image is loaded from
+        disk or downloaded, and scaled, in the background. Concurrent requests
+        for the same image share a single download.
         """
         if not image_id or not url:
             return
+        if size_name and size_name not in THUMBNAIL_SIZES:
+            raise ValueError(f"Unknown thumbnail size: '{size_name}'")
 
-        cache_path = os.path.join(self.cache_dir, f"{image_id}.jpg")
-
-        if os.path.exists(cache_path):
-            pixmap = QPixmap(cache_path)
-            self.image_loaded.emit(image_id, pixmap)
+        pixmap = self.memory_cache.get(self._memory_key(image_id, url, size_name))
+        if pixmap is not None:
+            self.image_loaded.emit(image_id, size_name, pixmap)
             return
+        self._request(image_id, url, size_name, self.PRIORITY_ON_DEMAND)
+
+    def schedule_prefetch(self, group: str, visible: Iterable[Tuple[str, str]],
+                          upcoming: Iterable[Tuple[str, str]], size_name: str):
+        """
+        Queues covers for a list: the visible rows first, then the upcoming ones
+        (e.g. the next page) at a lower priority. The group's queued prefetches
+        that are in neither list are cancelled.
 
-        if image_id in self.active_downloads:
-            return # Already downloading
+        Args:
+            group: Identifies the list (one group per widget).
+            visible, upcoming: (image_id, url) pairs, in display order.
+            size_name: Size at which the list (or its detail panel) shows covers.
+        """
+        wanted = set()
+        for items, priority in ((visible, self.PRIORITY_VISIBLE), (upcoming, self.PRIORITY_PREFETCH)):
+            for image_id, url in items:
+                if not image_id or not url or (image_id, url) in wanted:
+                    continue
+                wanted.add((image_id, url))
+                if self.memory_cache.get(self._memory_key(image_id, url, size_name)) is None:
+                    self._request(image_id, url, size_name, priority, group)
+        self.cancel_prefetch(group, keep=wanted)
+
+    def cancel_prefetch(self, group: str, keep: Optional[Set[Tuple[str, str]]] = None):
+        """Cancels the group's prefetches that have not started yet."""
+        for key, job in list(self._jobs.items()):
+            if job.group == group and (keep is None or key not in keep) \
+                    and self.thread_pool.tryTake(job.runnable):
+                del self._jobs[key]
 
-        self.active_downloads.add(image_id)
-        downloader = ImageDownloader(image_id, url, cache_path)
+    def _request(self, image_id: str, url: str, size_name: str,
+                 priority: int, group: Optional[str] = None):
+        job = self._jobs.get((image_id, url))
+        if job is not None and job.add_size(size_name):
+            # Joins the load already in progress
+            if job.group != group:
+                job.group = None # Someone else needs it now: no longer cancellable
+            if priority > job.priority and self.thread_pool.tryTake(job.runnable):
+                job.priority = priority # Still queued: move it ahead
+                self.thread_pool.start(job.runnable, priority)
+            return
+
+        job = self._jobs[(image_id, url)] = _LoadJob(image_id, url, size_name, priority, group)
+        downloader = ImageDownloader(job, self.disk_cache, self.session, self._device_pixel_ratio())
+        # The job keeps the runnable alive, so it can be taken back from the queue safely
+        downloader.setAutoDelete(False)
+        job.runnable = downloader
         downloader.signals.finished.connect(self._on_download_finished)
         downloader.signals.failed.connect(self._on_download_failed)
-        self.thread_pool.start(downloader)
-
-    def _on_download_finished(self, image_id: str, pixmap: QPixmap):
-        if image_id in self.active_downloads:
-            self.active_downloads.remove(image_id)
-        self.image_loaded.emit(image_id, pixmap)
-
-    def _on_download_failed(self, image_id: str):
-        if image_id in self.active_downloads:
-            self.active_downloads.remove(image_id)
-        # Optionally, emit a signal to show a "failed" placeholder
-        # self.image_failed.emit(image_id) 
\ No newline at end of file
+        downloader.signals.done.connect(self._on_job_done)
+        self.thread_pool.start(downloader, priority)
+
+    @Slot(str, str, str, QImage)
+    def _on_download_finished(self, image_id: str, url: str, size_name: str, image: QImage):
+        pixmap = QPixmap.fromImage(image)
+        if size_name:
+            pixmap.setDevicePixelRatio(self._device_pixel_ratio())
+        self.memory_cache.put(self._memory_key(image_id, url, size_name), pixmap)
+        self.image_loaded.emit(image_id, size_name, pixmap)
+
+    @Slot(str, str)
+    def _on_download_failed(self, image_id: str, size_name: str):
+        self.image_failed.emit(image_id)
+
+    @Slot(object)
+    def _on_job_done(self, job: _LoadJob):
+        key = (job.image_id, job.url)
+        # A newer job for the same image may have replaced this one
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+
+    def shutdown(self, timeout_ms: int = 3000):
+        """Drops queued loads, waits briefly for running ones and closes the HTTP session."""
+        self.thread_pool.clear()
+        self.thread_pool.waitForDone(timeout_ms)
+        self.session.close()
+
+
+_shared_manager: Optional[ImageManager] = None
+
+
+def shared_image_manager() -> ImageManager:
+    """Returns the application-wide ImageManager."""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = ImageManager()
+    return _shared_manager
+
+
+def shutdown_shared_image_manager():
+    """Shuts the shared ImageManager down, if it was ever created."""
+    if _shared_manager is not None:
+        _shared_manager.shutdown()
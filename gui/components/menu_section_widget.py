@@ -11,6 +11,9 @@ from gui.common.styles import FONTS
 class MenuSectionWidget(QWidget):
     action_triggered = Signal(str)
     search_requested = Signal(str, dict)
+    live_search_requested = Signal(str, dict)
+    live_search_cancelled = Signal()
+    live_result_selected = Signal(str, dict, int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -76,6 +79,9 @@ class MenuSectionWidget(QWidget):
         self.search_bar = SearchBarWidget()
         self.search_bar.setFixedWidth(card_width)
         self.search_bar.search_requested.connect(self.search_requested.emit)
+        self.search_bar.live_search_requested.connect(self.live_search_requested.emit)
+        self.search_bar.live_search_cancelled.connect(self.live_search_cancelled.emit)
+        self.search_bar.live_result_selected.connect(self.live_result_selected.emit)
         layout_finanzas_columna.addWidget(self.search_bar)
 
         opciones_finanzas_main = [
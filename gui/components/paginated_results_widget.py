@@ -1,13 +1,16 @@
 import os
+from collections import OrderedDict
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QStackedWidget, QSizePolicy
 )
 from PySide6.QtGui import QFont, QDesktopServices
 from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QRect, QUrl
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Sequence
 
 from gui.common.styles import FONTS
 from gui.common.widgets import CustomButton # Para los botones de navegación y volver
+from gui.common.async_service import AsyncServiceRunner
+from features.paged_search import BusquedaPaginada
 from .results_table_widget import ResultsTableWidget # Importar el componente de tabla
 
 class PaginatedResultsWidget(QWidget):
@@ -17,6 +20,8 @@ class PaginatedResultsWidget(QWidget):
     RESULT_TABLE_WIDTH = 750      
     MAX_BOOK_ROWS_PER_TABLE = 8
     TABLES_PER_PAGE = 1          
+    # Páginas construidas que se conservan para volver atrás sin reconstruirlas
+    MAX_PAGINAS_CONSTRUIDAS = 3
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -25,6 +30,11 @@ class PaginatedResultsWidget(QWidget):
         self.current_results_page_index = 0
         self.total_results_pages = 0
         self.current_page_animation_group = [] # Para animaciones de páginas de resultados
+        # Lista de libros o BusquedaPaginada (las filas se traen de la base de datos al construir cada página)
+        self._libros: Sequence[Dict[str, Any]] = []
+        self._tareas = AsyncServiceRunner(self)
+        # Índice de página -> widget, de la menos a la más recientemente usada
+        self._paginas_construidas: "OrderedDict[int, QWidget]" = OrderedDict()
 
         self._setup_ui()
 
@@ -93,19 +103,24 @@ class PaginatedResultsWidget(QWidget):
 
         self.setStyleSheet("background: transparent;")
 
-    def update_results(self, libros: List[Dict[str, Any]], search_term: str):
+    def update_results(self, libros: Sequence[Dict[str, Any]], search_term: str):
         self.search_term_label.setText(f"Resultados para: \"{search_term}\"")
-        
-        while self.results_pages_stack.count():
-            widget = self.results_pages_stack.widget(0)
-            self.results_pages_stack.removeWidget(widget)
-            if widget:
-                widget.deleteLater()
+        self._tareas.cancel_all()
+
+        for anim in self.current_page_animation_group:
+            anim.stop()
+        self.current_page_animation_group = []
+        for page_widget in self._paginas_construidas.values():
+            self.results_pages_stack.removeWidget(page_widget)
+            page_widget.deleteLater()
+        self._paginas_construidas.clear()
 
+        self._libros = libros or []
         self.current_results_page_index = 0
-        self.total_results_pages = 0
+        libros_por_pagina_fisica = self.MAX_BOOK_ROWS_PER_TABLE * self.TABLES_PER_PAGE
+        self.total_results_pages = (len(self._libros) + libros_por_pagina_fisica - 1) // libros_por_pagina_fisica
 
-        if not libros:
+        if not self._libros:
             self.results_pages_stack.hide()
             self.no_results_label.show()
             self.boton_anterior_resultados.hide()
@@ -113,67 +128,83 @@ class PaginatedResultsWidget(QWidget):
         else:
             self.no_results_label.hide()
             self.results_pages_stack.show()
-            self.boton_anterior_resultados.show()
-            self.boton_siguiente_resultados.show()
-
-            headers = ["#", "Título", "Autor", "Categoría", "Posición", "Imagen"]
-            column_weights = [1, 6, 6, 6, 2, 2]
-
-            num_libros = len(libros)
-            libros_por_pagina_fisica = self.MAX_BOOK_ROWS_PER_TABLE * self.TABLES_PER_PAGE
-            self.total_results_pages = (num_libros + libros_por_pagina_fisica - 1) // libros_por_pagina_fisica
-
-            libro_idx_global = 0
-            for page_num in range(self.total_results_pages):
-                page_widget = QWidget() # Contenedor para las tablas de esta página
-                page_layout = QHBoxLayout(page_widget)
-                page_layout.setContentsMargins(0,0,0,0)
-                page_layout.setSpacing(15) # Espacio entre ResultsTableWidget si hay varios
-                page_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
-
-                for table_in_page_num in range(self.TABLES_PER_PAGE):
-                    if libro_idx_global >= num_libros: break
-                    
-                    table_component = ResultsTableWidget(headers=headers, column_weights=column_weights)
-                    table_component.setFixedWidth(self.RESULT_TABLE_WIDTH)
-                    table_component.image_view_requested.connect(self._handle_image_view_request)
-                    
-                    libros_para_esta_tabla = []
-                    for _ in range(self.MAX_BOOK_ROWS_PER_TABLE):
-                        if libro_idx_global < num_libros:
-                            libro_data = libros[libro_idx_global]
-                            # Adaptar libro_data al formato List[str] esperado por ResultsTableWidget.set_data
-                            libros_para_esta_tabla.append([
-                                str(libro_idx_global + 1),
-                                libro_data.get("Título", "N/A"),
-                                libro_data.get("Autor", "N/A"),
-                                ", ".join(libro_data.get("Categorías", [])) if libro_data.get("Categorías") else "-",
-                                libro_data.get("Posición", "-"),
-                                libro_data.get("Imagen", "")
-                            ])
-                            libro_idx_global += 1
-                        else:
-                            break # No hay más libros
-                    
-                    if libros_para_esta_tabla:
-                        table_component.set_data(libros_para_esta_tabla)
-                        page_layout.addWidget(table_component)
-                    else:
-                        # No debería necesitarse si la lógica de break es correcta
-                        table_component.deleteLater() # Limpiar si no se usa
-                
-                if page_layout.count() > 0:
-                    self.results_pages_stack.addWidget(page_widget)
-                else:
-                    page_widget.deleteLater() # Limpiar página vacía
-
-            self.total_results_pages = self.results_pages_stack.count()
-            if self.total_results_pages > 0:
-                self.results_pages_stack.setCurrentIndex(0)
+            # Solo se construye la primera página; el resto, al navegar hasta ella
+            self.results_pages_stack.setCurrentWidget(self._obtener_pagina(0))
+            self._precargar_pagina(1)
             self._actualizar_estado_botones_navegacion()
 
+    def _obtener_pagina(self, indice: int) -> QWidget:
+        """
+        Devuelve el widget de la página 'indice', construyéndolo si no está entre las
+        páginas recientes. Se conservan como mucho MAX_PAGINAS_CONSTRUIDAS; las menos
+        usadas se liberan (salvo la que está en pantalla).
+        """
+        page_widget = self._paginas_construidas.get(indice)
+        if page_widget is not None:
+            self._paginas_construidas.move_to_end(indice)
+            return page_widget
+
+        page_widget = self._construir_pagina(indice)
+        self._paginas_construidas[indice] = page_widget
+        self.results_pages_stack.addWidget(page_widget)
+
+        for indice_antiguo in list(self._paginas_construidas):
+            if len(self._paginas_construidas) <= self.MAX_PAGINAS_CONSTRUIDAS:
+                break
+            if indice_antiguo in (indice, self.current_results_page_index):
+                continue
+            pagina_antigua = self._paginas_construidas.pop(indice_antiguo)
+            self.results_pages_stack.removeWidget(pagina_antigua)
+            pagina_antigua.deleteLater()
+        return page_widget
+
+    def _precargar_pagina(self, indice: int):
+        """Con una BusquedaPaginada, trae en segundo plano las filas de la página 'indice'."""
+        if not isinstance(self._libros, BusquedaPaginada) or not 0 <= indice < self.total_results_pages:
+            return
+        libros_por_pagina_fisica = self.MAX_BOOK_ROWS_PER_TABLE * self.TABLES_PER_PAGE
+        inicio = indice * libros_por_pagina_fisica
+        for numero in self._libros.paginas_sin_cargar(inicio, inicio + libros_por_pagina_fisica):
+            self._tareas.submit(self._libros.pagina, numero, key=("pagina", numero))
+
+    def _construir_pagina(self, indice: int) -> QWidget:
+        headers = ["#", "Título", "Autor", "Categoría", "Posición", "Imagen"]
+        column_weights = [1, 6, 6, 6, 2, 2]
+
+        page_widget = QWidget() # Contenedor para las tablas de esta página
+        page_layout = QHBoxLayout(page_widget)
+        page_layout.setContentsMargins(0,0,0,0)
+        page_layout.setSpacing(15) # Espacio entre ResultsTableWidget si hay varios
+        page_layout.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop)
+
+        primer_libro = indice * self.MAX_BOOK_ROWS_PER_TABLE * self.TABLES_PER_PAGE
+        for table_in_page_num in range(self.TABLES_PER_PAGE):
+            inicio = primer_libro + table_in_page_num * self.MAX_BOOK_ROWS_PER_TABLE
+            libros_para_esta_tabla = [
+                # Adaptar libro_data al formato List[str] esperado por ResultsTableWidget.set_data
+                [
+                    str(libro_idx_global + 1),
+                    libro_data.get("Título", "N/A"),
+                    libro_data.get("Autor", "N/A"),
+                    ", ".join(libro_data.get("Categorías", [])) if libro_data.get("Categorías") else "-",
+                    libro_data.get("Posición", "-"),
+                    libro_data.get("Imagen", "")
+                ]
+                for libro_idx_global, libro_data in enumerate(
+                    self._libros[inicio:inicio + self.MAX_BOOK_ROWS_PER_TABLE], start=inicio)
+            ]
+            if not libros_para_esta_tabla:
+                break # No hay más libros
+
+            table_component = ResultsTableWidget(headers=headers, column_weights=column_weights)
+            table_component.setFixedWidth(self.RESULT_TABLE_WIDTH)
+            table_component.image_view_requested.connect(self._handle_image_view_request)
+            table_component.set_data(libros_para_esta_tabla)
+            page_layout.addWidget(table_component)
+        return page_widget
+
     def _actualizar_estado_botones_navegacion(self):
-        if not self.results_pages_stack or self.total_results_pages == 0:
+        if self.total_results_pages == 0:
             self.boton_anterior_resultados.setEnabled(False)
             self.boton_anterior_resultados.hide()
             self.boton_siguiente_resultados.setEnabled(False)
@@ -196,8 +227,9 @@ class PaginatedResultsWidget(QWidget):
             self._mostrar_pagina_resultados_animado(nuevo_indice, direccion_forward=False)
 
     def _mostrar_pagina_resultados_animado(self, nuevo_indice: int, direccion_forward: bool):
-        current_page_widget = self.results_pages_stack.widget(self.current_results_page_index)
-        next_page_widget = self.results_pages_stack.widget(nuevo_indice)
+        current_page_widget = self._paginas_construidas.get(self.current_results_page_index)
+        next_page_widget = self._obtener_pagina(nuevo_indice)
+        self._precargar_pagina(nuevo_indice + 1 if direccion_forward else nuevo_indice - 1)
 
         if not current_page_widget or not next_page_widget or current_page_widget == next_page_widget:
             if next_page_widget: 
@@ -1,11 +1,16 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QPushButton
-from PySide6.QtCore import Signal, Qt, QSize
-from PySide6.QtGui import QIcon # For icons on buttons
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QStyledItemDelegate, QStyle,
+    QStyleOptionViewItem, QAbstractItemView
+)
+from PySide6.QtCore import Signal, Qt, QSize, QTimer, QRect, QRectF, QModelIndex
+from PySide6.QtGui import QIcon, QFont, QFontMetrics, QColor, QPainter, QPainterPath # For icons on buttons
 import os
 from typing import List, Dict, Any
 
-from .search_result_item_widget import SearchResultItemWidget
 from gui.components.image_manager import ImageManager
+from gui.common.item_models import DictListModel
+from gui.common.styles import FONTS, COLORS
+from gui.common.utils import visible_rows
 
 MAX_CHARS_SIDEBAR_TITLE = 25 # Increased max characters
 
@@ -74,42 +79,114 @@ def truncate_title_sidebar(title: str, max_chars: int = MAX_CHARS_SIDEBAR_TITLE)
             
     return current_truncated_title
 
+class SearchResultDelegate(QStyledItemDelegate):
+    """
+    Paints one search result (bold title, author below) without a widget per row.
+    Same look as the former SearchResultItemWidget: 8px padding around each text,
+    5px between cards and a soft rounded highlight behind the selected one.
+    """
+    PADDING = 8
+    LINE_SPACING = 2
+    CARD_SPACING = 5
+    MIN_HEIGHT = 60
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.title_font = QFont(FONTS["family"], FONTS["size_normal"], QFont.Weight.Bold)
+        self.author_font = QFont(FONTS["family"], FONTS["size_small"])
+        self.title_color = QColor(COLORS["text_primary"])
+        self.author_color = QColor(COLORS["text_secondary"])
+        self.selected_color = QColor(0, 0, 0, 13) # rgba(0, 0, 0, 0.05)
+
+    def _text_rects(self, rect: QRect, book: Dict[str, Any]):
+        """Returns (title rect, author rect) for a card occupying 'rect'."""
+        text_width = max(rect.width() - 2 * self.PADDING, 1)
+        title_height = QFontMetrics(self.title_font).boundingRect(
+            QRect(0, 0, text_width, 10000), Qt.TextFlag.TextWordWrap, book.get("Título", "N/A") or "N/A"
+        ).height()
+        author_height = QFontMetrics(self.author_font).height()
+        title_rect = QRect(rect.left() + self.PADDING, rect.top() + self.PADDING, text_width, title_height)
+        author_rect = QRect(title_rect.left(), title_rect.bottom() + 1 + 2 * self.PADDING + self.LINE_SPACING,
+                            text_width, author_height)
+        return title_rect, author_rect
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # The view does not set option.rect when asking for size hints: wrap to its viewport
+        width = option.widget.viewport().width() if option.widget is not None else option.rect.width()
+        book = index.data(Qt.ItemDataRole.UserRole)
+        if not book:
+            return QSize(width, self.MIN_HEIGHT)
+        title_rect, author_rect = self._text_rects(QRect(0, 0, width, 0), book)
+        height = max(author_rect.bottom() + 1 + self.PADDING, self.MIN_HEIGHT)
+        return QSize(width, height + self.CARD_SPACING)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        book = index.data(Qt.ItemDataRole.UserRole)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if not book:
+            # "No results found" row
+            painter.setPen(Qt.GlobalColor.gray)
+            painter.drawText(option.rect, Qt.AlignmentFlag.AlignCenter, index.data() or "")
+            painter.restore()
+            return
+
+        card = option.rect.adjusted(0, 0, 0, -self.CARD_SPACING)
+        if option.state & QStyle.StateFlag.State_Selected:
+            path = QPainterPath()
+            path.addRoundedRect(QRectF(card), 6, 6)
+            painter.fillPath(path, self.selected_color)
+
+        title_rect, author_rect = self._text_rects(card, book)
+        # Cards shorter than MIN_HEIGHT keep their text vertically centred
+        offset = max((card.height() - (author_rect.bottom() + 1 + self.PADDING - card.top())) // 2, 0)
+        painter.setFont(self.title_font)
+        painter.setPen(self.title_color)
+        painter.drawText(title_rect.translated(0, offset), Qt.TextFlag.TextWordWrap, book.get("Título", "N/A") or "N/A")
+        painter.setFont(self.author_font)
+        painter.setPen(self.author_color)
+        author = QFontMetrics(self.author_font).elidedText(
+            book.get("Autor", "N/A") or "N/A", Qt.TextElideMode.ElideRight, author_rect.width()
+        )
+        painter.drawText(author_rect.translated(0, offset), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, author)
+        painter.restore()
+
+
 class ResultListWidget(QWidget):
     item_selected = Signal(dict) # Emits the full book data of the selected item
+    # Emitted when the user scrolls close to the last loaded row (paged searches load more)
+    more_results_requested = Signal()
     # item_hovered = Signal(dict) # Optional: for hover effects if needed
 
     def __init__(self, image_manager: ImageManager, books: List[Dict[str, Any]] = None, parent: QWidget = None):
         super().__init__(parent)
-        self.books_data = [] 
         self.image_manager = image_manager
 
         self.main_v_layout = QVBoxLayout(self) # Main layout for list + buttons
         self.main_v_layout.setContentsMargins(0,0,0,0)
         self.main_v_layout.setSpacing(5)
 
-        self.list_widget = QListWidget()
-        self.list_widget.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.list_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.list_widget.setStyleSheet("""
-            QListWidget {
+        # Rows live in a model and are painted by SearchResultDelegate: no widget per book
+        self.model = DictListModel(clave_texto="Título", texto_vacio="No results found", parent=self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(SearchResultDelegate(self.list_view))
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.list_view.setResizeMode(QListView.ResizeMode.Adjust) # re-wrap titles when the width changes
+        self.list_view.setLayoutMode(QListView.LayoutMode.Batched) # long lists are measured in chunks, not all at once
+        self.list_view.setBatchSize(100)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.list_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.list_view.setStyleSheet("""
+            QListView {
                 background-color: transparent; /* Main list bg is transparent, items are cards */
-                border: none; /* No border for the list widget itself */
+                border: none; /* No border for the list itself */
                 padding: 4px; /* Slightly increased padding */
-                font-size: 13.5px; /* Slightly increased font size */
                 outline: 0; /* Remove focus outline */
             }
-            QListWidget::item {
-                background-color: transparent;
-                border: none;
-                padding: 0px;
-                margin-bottom: 5px;
-            }
-            QListWidget::item:selected {
-                background-color: rgba(0, 0, 0, 0.05); /* Highlight behind the widget */
-                border-radius: 6px;
-            }
         """)
-        self.main_v_layout.addWidget(self.list_widget, 1) # List takes most space
+        self.main_v_layout.addWidget(self.list_view, 1) # List takes most space
 
         # Navigation Buttons Layout
         nav_buttons_layout = QHBoxLayout()
@@ -162,101 +239,109 @@ class ResultListWidget(QWidget):
         
         nav_buttons_layout.addStretch()
         self.main_v_layout.addLayout(nav_buttons_layout)
-        self.main_v_layout.setStretchFactor(self.list_widget, 1)
+        self.main_v_layout.setStretchFactor(self.list_view, 1)
+
+        self.list_view.selectionModel().currentChanged.connect(self._on_item_selection_changed)
 
-        self.list_widget.currentItemChanged.connect(self._on_item_selection_changed)
-        # self.list_widget.itemEntered.connect(self._on_item_hovered) # If hover signal is needed
+        # Cover prefetch for the detail panel: visible rows first, then the next page.
+        # Debounced so that scrolling does not queue a request per intermediate position.
+        self._prefetch_group = f"result-list-{id(self)}"
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(80)
+        self._prefetch_timer.timeout.connect(self._schedule_cover_prefetch)
+        self.list_view.verticalScrollBar().valueChanged.connect(self._prefetch_timer.start)
 
         if books:
             self.update_results(books)
         self._update_nav_buttons_state() # Initial state
 
+    @property
+    def books_data(self) -> List[Dict[str, Any]]:
+        return self.model.items()
+
     def _scroll_up(self):
-        current_row = self.list_widget.currentRow()
+        current_row = self.list_view.currentIndex().row()
         if current_row > 0:
-            self.list_widget.setCurrentRow(current_row - 1)
+            self.set_selected_index(current_row - 1)
 
     def _scroll_down(self):
-        current_row = self.list_widget.currentRow()
-        if current_row < self.list_widget.count() - 1:
-            self.list_widget.setCurrentRow(current_row + 1)
+        current_row = self.list_view.currentIndex().row()
+        if current_row < len(self.books_data) - 1:
+            self.set_selected_index(current_row + 1)
 
     def _update_nav_buttons_state(self):
-        count = self.list_widget.count()
-        current_row = self.list_widget.currentRow()
+        count = len(self.books_data)
+        current_row = self.list_view.currentIndex().row()
         self.up_button.setEnabled(count > 0 and current_row > 0)
         self.down_button.setEnabled(count > 0 and current_row < count - 1)
 
     def update_results(self, books: List[Dict[str, Any]]):
-        self.list_widget.clear()
-        self.books_data = list(books) 
+        self.model.set_items(books)
+        # Covers queued for the previous search are no longer needed
+        self.cancel_cover_prefetch()
 
         if not self.books_data:
-            no_results_item = QListWidgetItem("No results found")
-            no_results_item.setFlags(no_results_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-            no_results_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_results_item.setForeground(Qt.GlobalColor.gray) # Make it look disabled
-            self.list_widget.addItem(no_results_item)
             self.item_selected.emit({}) # Emit empty dict if no results
             self._update_nav_buttons_state() # Ensure buttons are updated for empty list
             return
 
-        for book in self.books_data:
-            list_item = QListWidgetItem(self.list_widget)
-            item_widget = SearchResultItemWidget(book, self.image_manager)
-            
-            list_item.setSizeHint(item_widget.sizeHint())
-            self.list_widget.addItem(list_item)
-            self.list_widget.setItemWidget(list_item, item_widget)
-            
-            # Store the original data in the item
-            list_item.setData(Qt.ItemDataRole.UserRole, book)
-        
-        if self.list_widget.count() > 0:
-            # Check if the first item is selectable before trying to select it
-            first_item = self.list_widget.item(0)
-            if first_item and (first_item.flags() & Qt.ItemFlag.ItemIsSelectable):
-                self.list_widget.setCurrentRow(0)
-                if self.books_data: 
-                    self.item_selected.emit(self.books_data[0])
-            elif self.books_data: # If first is not selectable (e.g. "No results"), but there is data
-                 self.item_selected.emit({}) # Clear details or emit first valid book if logic changes
+        self.set_selected_index(0) # emits item_selected for the first book
+        self._prefetch_timer.start() # once the new rows are laid out
+
+    def append_results(self, books: List[Dict[str, Any]]):
+        """Adds the next page of a paged search below the rows already shown."""
+        if not books or not self.books_data:
+            return
+        self.model.append_items(books)
         self._update_nav_buttons_state()
+        self._prefetch_timer.start()
+
+    def _schedule_cover_prefetch(self):
+        if not self.books_data or not self.isVisible():
+            return
+        first, last = visible_rows(self.list_view)
+        page = last - first + 1
+        if last + page >= len(self.books_data):
+            self.more_results_requested.emit()
+        self.image_manager.schedule_prefetch(
+            self._prefetch_group,
+            visible=self._cover_refs(first, last + 1),
+            upcoming=self._cover_refs(last + 1, last + 1 + page),
+            size_name="detail",
+        )
 
-    def _on_item_selection_changed(self, current: QListWidgetItem, previous: QListWidgetItem):
+    def _cover_refs(self, start: int, end: int) -> List[tuple]:
+        return [(book.get("ISBN"), book.get("Imagen")) for book in self.books_data[start:end]]
+
+    def cancel_cover_prefetch(self):
+        """Cancels the cover prefetches still queued for this list."""
+        self._prefetch_timer.stop()
+        self.image_manager.cancel_prefetch(self._prefetch_group)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._prefetch_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.cancel_cover_prefetch()
+
+    def _on_item_selection_changed(self, current: QModelIndex, previous: QModelIndex):
         self._update_nav_buttons_state()
-        if current and (current.flags() & Qt.ItemFlag.ItemIsSelectable): # Check if selectable
-            row = self.list_widget.row(current)
-            if 0 <= row < len(self.books_data):
-                selected_book = self.books_data[row]
-                self.item_selected.emit(selected_book)
-                self.list_widget.scrollToItem(current, QListWidget.ScrollHint.EnsureVisible) # Ensure selected is visible
-        # else: # If item is not selectable (e.g. "No results found") or list cleared
-            # If you want to clear details when "No results found" is effectively selected:
-            # if current and not (current.flags() & Qt.ItemFlag.ItemIsSelectable):
-            #     self.item_selected.emit({}) 
-
-    # def _on_item_hovered(self, item: QListWidgetItem): # Example for hover
-    #     row = self.list_widget.row(item)
-    #     if 0 <= row < len(self.books_data):
-    #         hovered_book = self.books_data[row]
-    #         self.item_hovered.emit(hovered_book)
+        selected_book = self.model.item(current.row()) if current.isValid() else None
+        if selected_book is not None:
+            self.item_selected.emit(selected_book)
+            self.list_view.scrollTo(current, QAbstractItemView.ScrollHint.EnsureVisible) # Ensure selected is visible
 
     def set_selected_index(self, index: int):
-        if 0 <= index < self.list_widget.count() and self.list_widget.item(index).flags() & Qt.ItemFlag.ItemIsSelectable:
-            self.list_widget.setCurrentRow(index)
-        elif self.list_widget.count() > 0:
-            first_selectable = -1
-            for i in range(self.list_widget.count()):
-                if self.list_widget.item(i).flags() & Qt.ItemFlag.ItemIsSelectable:
-                    first_selectable = i
-                    break
-            if first_selectable != -1:
-                self.list_widget.setCurrentRow(first_selectable)
+        if not self.books_data:
+            self._update_nav_buttons_state()
+            return
+        index = index if 0 <= index < len(self.books_data) else 0
+        self.list_view.setCurrentIndex(self.model.index(index))
         self._update_nav_buttons_state()
 
     def get_current_selected_book_data(self) -> Dict[str, Any] | None:
-        current_item = self.list_widget.currentItem()
-        if current_item:
-            return current_item.data(Qt.ItemDataRole.UserRole)
-        return None 
\ No newline at end of file
+        current = self.list_view.currentIndex()
+        return self.model.item(current.row()) if current.isValid() else None
@@ -1,13 +1,13 @@
 import os
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSizePolicy
+    QWidget, QVBoxLayout, QLabel, QFrame, QTableView, QHeaderView, QAbstractItemView,
+    QStyledItemDelegate, QStyleOptionViewItem
 )
-from PySide6.QtGui import QFont, QPixmap, QDesktopServices
-from PySide6.QtCore import Qt, QSize, Signal, QUrl
-from typing import List, Dict, Any
+from PySide6.QtGui import QFont, QPixmap, QPainter, QColor, QPen
+from PySide6.QtCore import Qt, QSize, Signal, QAbstractTableModel, QModelIndex, QRectF, QEvent
+from typing import Any, List, Optional
 
 from gui.common.styles import FONTS # Asumiendo que FONTS está en styles
-from gui.common.widgets import CustomButton # Importar CustomButton
 
 # Rutas a los iconos para la columna de imagen
 try:
@@ -19,7 +19,105 @@ except NameError:
 VER_ICON_PATH = os.path.join(ICON_BASE_PATH_RTW, "ver.png")
 NO_VER_ICON_PATH = os.path.join(ICON_BASE_PATH_RTW, "no_ver.png")
 
+class ResultsTableModel(QAbstractTableModel):
+    """Modelo de las filas de resultados: una lista de listas de textos, una por fila."""
+
+    def __init__(self, headers: List[str], parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows: List[List[str]] = []
+        self.image_column = headers.index("Imagen") if "Imagen" in headers else -1
+
+    def set_rows(self, rows: List[List[str]]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        valor = str(self.rows[index.row()][index.column()])
+        if index.column() == self.image_column:
+            # La celda de imagen no muestra texto: la URL va en UserRole
+            return valor if role == Qt.ItemDataRole.UserRole else None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return valor
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+
+class ResultCellDelegate(QStyledItemDelegate):
+    """
+    Pinta cada celda como una tarjeta translúcida con el texto centrado, y la
+    columna de imagen con el icono de ver/no ver. Sustituye al QFrame + QLabel
+    (o CustomButton) con hoja de estilo que antes se creaba por celda.
+    """
+    CELL_BACKGROUND = QColor(255, 255, 255, int(0.45 * 255))
+    CELL_BORDER = QColor(255, 255, 255, int(0.6 * 255))
+    TEXT_COLOR = QColor("#333")
+    RADIUS = 6
+
+    def __init__(self, image_column: int, cell_spacing: int, icon_size: int, font: QFont, parent=None):
+        super().__init__(parent)
+        self.image_column = image_column
+        self.cell_spacing = cell_spacing
+        self.icon_size = icon_size
+        self.font = font
+        # Los iconos se escalan una sola vez, no en cada celda ni en cada repintado
+        self.icon_ver = self._cargar_icono(VER_ICON_PATH)
+        self.icon_no_ver = self._cargar_icono(NO_VER_ICON_PATH)
+
+    def _cargar_icono(self, ruta: str) -> QPixmap:
+        pixmap = QPixmap(ruta) if os.path.exists(ruta) else QPixmap()
+        if pixmap.isNull():
+            return pixmap
+        return pixmap.scaled(self.icon_size, self.icon_size, Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+
+    def cell_rect(self, option_rect) -> QRectF:
+        # El espacio entre celdas y filas que antes daban los layouts
+        mitad = self.cell_spacing / 2
+        return QRectF(option_rect).adjusted(mitad, mitad, -mitad, -mitad)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.cell_rect(option.rect)
+        painter.setPen(QPen(self.CELL_BORDER, 1))
+        painter.setBrush(self.CELL_BACKGROUND)
+        painter.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), self.RADIUS, self.RADIUS)
+
+        if index.column() == self.image_column:
+            url = index.data(Qt.ItemDataRole.UserRole)
+            icono = self.icon_ver if url and not self.icon_ver.isNull() else self.icon_no_ver
+            if not icono.isNull():
+                x = rect.center().x() - icono.width() / 2
+                y = rect.center().y() - icono.height() / 2
+                painter.drawPixmap(int(x), int(y), icono)
+        else:
+            painter.setFont(self.font)
+            painter.setPen(self.TEXT_COLOR)
+            texto_rect = rect.adjusted(5, 5, -5, -5)
+            painter.drawText(texto_rect, int(Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap),
+                             index.data(Qt.ItemDataRole.DisplayRole) or "")
+        painter.restore()
+
+
 class ResultsTableWidget(QFrame):
+    """
+    Tabla de resultados basada en modelo/vista: solo se pintan las filas visibles,
+    en lugar de crear un QFrame con su QLabel y su hoja de estilo por celda.
+    """
     image_view_requested = Signal(str) # Definir la señal aquí
 
     def __init__(self, headers: List[str], column_weights: List[int], parent=None):
@@ -35,28 +133,15 @@ class ResultsTableWidget(QFrame):
         self.ROW_SPACING = 5
         self.TABLE_CELL_PADDING = 5
 
-        self.cell_style_sheet = f"""
-            QFrame {{
-                background-color: rgba(255, 255, 255, 0.45);
-                border-radius: 6px;
-                border: 1px solid rgba(255, 255, 255, 0.6);
-            }}
-            QLabel {{
-                background-color: transparent;
-                border: none;
-                padding: {self.TABLE_CELL_PADDING}px;
-            }}
-        """
-        self.header_cell_style_sheet = f"""
-            QFrame {{
+        self.header_style_sheet = f"""
+            QHeaderView {{ background-color: transparent; border: none; }}
+            QHeaderView::section {{
                 background-color: rgba(235, 235, 245, 0.6);
                 border-radius: 6px;
                 border: 1px solid rgba(255, 255, 255, 0.5);
-            }}
-            QLabel {{
-                background-color: transparent;
-                border: none;
                 padding: {self.TABLE_CELL_PADDING}px;
+                margin: {self.CELL_SPACING // 2}px;
+                color: #222;
                 font-weight: bold;
             }}
         """
@@ -66,95 +151,91 @@ class ResultsTableWidget(QFrame):
     def _setup_ui(self):
         self.main_layout = QVBoxLayout(self) # Layout principal para esta tabla
         self.main_layout.setContentsMargins(self.ROW_SPACING, self.ROW_SPACING, self.ROW_SPACING, self.ROW_SPACING)
-        self.main_layout.setSpacing(self.ROW_SPACING)
-        self.main_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.main_layout.setSpacing(0)
         # El ancho se manejará externamente por PaginatedResultsWidget o el layout que lo contenga
 
+        self.model = ResultsTableModel(self.headers, self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.delegate = ResultCellDelegate(
+            self.model.image_column, self.CELL_SPACING, self.BOOK_ROW_HEIGHT - 10,
+            QFont(self.font_family, FONTS.get("size_small", 10) - 1), self.table_view
+        )
+        self.table_view.setItemDelegate(self.delegate)
+
+        self.table_view.setShowGrid(False)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.table_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table_view.setStyleSheet("QTableView { background-color: transparent; border: none; }")
+        self.table_view.setMouseTracking(True)
+        self.table_view.viewport().installEventFilter(self)
+        self.table_view.clicked.connect(self._on_cell_clicked)
+
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.BOOK_ROW_HEIGHT + self.ROW_SPACING)
+
+        header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header.setFixedHeight(self.HEADER_ROW_HEIGHT + self.CELL_SPACING)
+        header.setDefaultAlignment(Qt.AlignmentFlag.AlignCenter)
+        header.setFont(QFont(self.font_family, FONTS.get("size_small", 10), QFont.Weight.Bold))
+        header.setHighlightSections(False)
+        header.setStyleSheet(self.header_style_sheet)
+
+        self.main_layout.addWidget(self.table_view)
+
     def set_data(self, data_rows: List[List[str]]): # data_rows es lista de listas de strings para las celdas
-        # Limpiar contenido anterior
-        while self.main_layout.count():
-            item = self.main_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        # --- Fila de Cabecera ---
-        header_row_widget = QWidget()
-        header_row_widget.setFixedHeight(self.HEADER_ROW_HEIGHT)
-        header_row_layout = QHBoxLayout(header_row_widget)
-        header_row_layout.setContentsMargins(0,0,0,0)
-        header_row_layout.setSpacing(self.CELL_SPACING)
-        for h_text, weight in zip(self.headers, self.column_weights):
-            cell_frame = QFrame()
-            cell_frame.setStyleSheet(self.header_cell_style_sheet)
-            cell_layout = QVBoxLayout(cell_frame) # Usar QVBoxLayout para centrar verticalmente el QLabel
-            cell_layout.setContentsMargins(0,0,0,0)
-            cell_layout.setAlignment(Qt.AlignmentFlag.AlignCenter) # Centrar QLabel en la celda
-            lbl = QLabel(h_text)
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter) # Alinear texto del label
-            lbl.setFont(QFont(self.font_family, FONTS.get("size_small", 10), QFont.Weight.Bold))
-            lbl.setStyleSheet("color: #222; background-color:transparent;")
-            cell_layout.addWidget(lbl)
-            header_row_layout.addWidget(cell_frame, weight)
-        self.main_layout.addWidget(header_row_widget)
-
-        # --- Filas de Datos ---
-        for row_values in data_rows:
-            book_row_widget = QWidget() 
-            book_row_widget.setFixedHeight(self.BOOK_ROW_HEIGHT)
-            book_row_layout = QHBoxLayout(book_row_widget)
-            book_row_layout.setContentsMargins(0,0,0,0)
-            book_row_layout.setSpacing(self.CELL_SPACING)
-
-            for col_idx, (field_text, weight) in enumerate(zip(row_values, self.column_weights)):
-                cell_frame = QFrame()
-                cell_layout = QVBoxLayout(cell_frame) 
-                cell_layout.setContentsMargins(0,0,0,0)
-                cell_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                header_name = self.headers[col_idx] # Obtener el nombre de la cabecera para esta columna
-
-                if header_name == "Imagen":
-                    cell_frame.setStyleSheet(self.cell_style_sheet) 
-                    image_url = str(field_text) 
-                    icon_to_use = VER_ICON_PATH if image_url and os.path.exists(VER_ICON_PATH) else NO_VER_ICON_PATH
-                    
-                    btn_ver_imagen = CustomButton(icon_path=icon_to_use, text="")
-                    # Hacer el botón más grande para ver si el ícono se muestra completo
-                    button_size = self.BOOK_ROW_HEIGHT - 10 # Antes 16 (para diagnóstico), originalmente self.BOOK_ROW_HEIGHT - 18 o -22
-                    btn_ver_imagen.setFixedSize(button_size, button_size)
-                    btn_ver_imagen.setCursor(Qt.CursorShape.PointingHandCursor if image_url else Qt.CursorShape.ArrowCursor)
-                    # Try a more direct stylesheet to make the button itself transparent and borderless
-                    btn_ver_imagen.setStyleSheet("""
-                        background: transparent;
-                        border: none;
-                        padding: 0px;
-                        margin: 0px;
-                    """)
-
-                    if image_url:
-                        btn_ver_imagen.clicked.connect(lambda checked=False, url=image_url: self.image_view_requested.emit(url))
-                    else:
-                        btn_ver_imagen.setEnabled(False)
-                    
-                    cell_layout.addWidget(btn_ver_imagen, 0, Qt.AlignmentFlag.AlignCenter)
-
-                else: # Para otras columnas, usar QLabel como antes
-                    cell_frame.setStyleSheet(self.cell_style_sheet)
-                    lbl = QLabel(str(field_text))
-                    lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    lbl.setFont(QFont(self.font_family, FONTS.get("size_small", 10) -1))
-                    lbl.setWordWrap(True)
-                    lbl.setMinimumHeight(0) # Permitir que se encoja si es necesario
-                    lbl.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding) # Permitir expansión
-                    lbl.setStyleSheet("color: #333; background-color:transparent;")
-                    cell_layout.addWidget(lbl)
-                
-                book_row_layout.addWidget(cell_frame, weight)
-            
-            self.main_layout.addWidget(book_row_widget)
-        
-        # self.main_layout.addStretch(1) # Comentado para probar si mejora la alineación
+        self.model.set_rows(data_rows)
+        self.updateGeometry()
+
+    def sizeHint(self) -> QSize:
+        # Alto natural: cabecera más todas las filas (como la tabla de widgets anterior)
+        margins = self.main_layout.contentsMargins()
+        alto = (self.table_view.horizontalHeader().height()
+                + self.model.rowCount() * self.table_view.verticalHeader().defaultSectionSize()
+                + margins.top() + margins.bottom() + 2 * self.table_view.frameWidth())
+        return QSize(super().sizeHint().width(), alto)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._ajustar_columnas()
+
+    def _ajustar_columnas(self):
+        # Anchos proporcionales a column_weights, como los stretch del layout anterior
+        ancho = self.table_view.viewport().width()
+        total = sum(self.column_weights) or 1
+        acumulado = 0
+        for columna, peso in enumerate(self.column_weights):
+            if columna == len(self.column_weights) - 1:
+                self.table_view.setColumnWidth(columna, ancho - acumulado)
+            else:
+                col_ancho = ancho * peso // total
+                self.table_view.setColumnWidth(columna, col_ancho)
+                acumulado += col_ancho
+
+    def _url_en(self, index: QModelIndex) -> Optional[str]:
+        if index.isValid() and index.column() == self.model.image_column:
+            return index.data(Qt.ItemDataRole.UserRole) or None
+        return None
+
+    def _on_cell_clicked(self, index: QModelIndex):
+        url = self._url_en(index)
+        if url:
+            self.image_view_requested.emit(url)
+
+    def eventFilter(self, watched, event) -> bool:
+        if watched is self.table_view.viewport() and event.type() == QEvent.Type.MouseMove:
+            # Mano solo sobre las celdas de imagen con URL, como el botón anterior
+            hay_url = self._url_en(self.table_view.indexAt(event.position().toPoint())) is not None
+            self.table_view.viewport().setCursor(
+                Qt.CursorShape.PointingHandCursor if hay_url else Qt.CursorShape.ArrowCursor
+            )
+        return super().eventFilter(watched, event)
 
 if __name__ == '__main__':
     from PySide6.QtWidgets import QApplication
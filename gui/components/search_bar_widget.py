@@ -1,17 +1,29 @@
 import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QFrame, QCheckBox, QGraphicsOpacityEffect, QApplication, QGridLayout
+    QLineEdit, QFrame, QCheckBox, QGraphicsOpacityEffect, QApplication, QGridLayout,
+    QListView, QAbstractItemView
 )
 from PySide6.QtGui import QFont, QPixmap, QIcon
-from PySide6.QtCore import Qt, QSize, QEasingCurve, QPropertyAnimation, Signal, QParallelAnimationGroup
+from PySide6.QtCore import Qt, QSize, QEasingCurve, QPropertyAnimation, Signal, QParallelAnimationGroup, QTimer, QModelIndex
+from typing import Any, Dict, List, Optional
 
 from gui.common.styles import FONTS # Asumiendo que FONTS está en styles
+from gui.common.item_models import DictListModel
+from gui.components.result_list_widget import SearchResultDelegate
 
 class SearchBarWidget(QFrame):
     search_requested = Signal(str, dict) # Término de búsqueda, filtros seleccionados
+    # Búsqueda en vivo: se emite mientras se escribe, cuando el texto deja de cambiar
+    live_search_requested = Signal(str, dict)
+    live_search_cancelled = Signal() # El texto quedó demasiado corto para buscar
+    live_result_selected = Signal(str, dict, int) # Término, filtros, fila pulsada en la vista previa
     # Podríamos añadir una señal para cuando se expande/colapsa si es necesario
 
+    LIVE_SEARCH_DELAY_MS = 250 # Espera tras la última tecla antes de buscar
+    LIVE_SEARCH_MIN_CHARS = 2
+    LIVE_RESULTS_MAX_HEIGHT = 260
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.font_family = FONTS.get("family", "Arial") # Usar .get con fallback
@@ -19,7 +31,14 @@ class SearchBarWidget(QFrame):
         self._filters_visible = False
         self.filter_checkboxes_effects = []
         self.animation_group = None # Se creará bajo demanda
-        
+        self._live_term = "" # Término cuyos resultados muestra la vista previa
+
+        # Cada tecla reinicia el temporizador: solo se busca cuando el texto deja de cambiar
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(self.LIVE_SEARCH_DELAY_MS)
+        self.live_search_timer.timeout.connect(self._emit_live_search_requested)
+
         self._setup_ui()
 
     def __del__(self):
@@ -84,6 +103,7 @@ class SearchBarWidget(QFrame):
             }
         """)
         self.search_input.returnPressed.connect(self._emit_search_requested)
+        self.search_input.textChanged.connect(self._on_search_text_changed)
         
         self.menu_icon_label = QLabel("≡") # Hacerlo atributo de instancia
         menu_icon_font = QFont(self.font_family, FONTS.get("size_large", 16), QFont.Weight.Bold)
@@ -157,6 +177,7 @@ class SearchBarWidget(QFrame):
             checkbox = QCheckBox(text)
             checkbox.setChecked(False)
             checkbox.setCursor(Qt.CursorShape.PointingHandCursor)
+            checkbox.toggled.connect(self._on_search_text_changed)
             
             icon_path = os.path.join(icon_base_dir, icon_filename)
             if os.path.exists(icon_path):
@@ -185,17 +206,112 @@ class SearchBarWidget(QFrame):
         
         self.filter_options_widget.hide()
         main_search_layout.addWidget(self.filter_options_widget)
+
+        # --- Vista previa de resultados (búsqueda en vivo) ---
+        # Las filas las pinta SearchResultDelegate: no hay un widget por resultado
+        self.live_results_widget = QWidget(self)
+        self.live_results_widget.setObjectName("liveResultsWidget")
+        self.live_results_widget.setStyleSheet("QWidget#liveResultsWidget { background-color: transparent; }")
+        layout_live_results = QVBoxLayout(self.live_results_widget)
+        layout_live_results.setContentsMargins(10, 0, 10, 10)
+        layout_live_results.setSpacing(4)
+
+        self.live_status_label = QLabel()
+        self.live_status_label.setFont(QFont(self.font_family, FONTS.get("size_small", 10)))
+        self.live_status_label.setStyleSheet("QLabel { background-color: transparent; border: none; color: #555; padding-left: 5px; }")
+        layout_live_results.addWidget(self.live_status_label)
+
+        self.live_results_model = DictListModel(clave_texto="Título", texto_vacio="Sin resultados", parent=self)
+        self.live_results_view = QListView()
+        self.live_results_view.setModel(self.live_results_model)
+        self.live_results_view.setItemDelegate(SearchResultDelegate(self.live_results_view))
+        self.live_results_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.live_results_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.live_results_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.live_results_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.live_results_view.setMaximumHeight(self.LIVE_RESULTS_MAX_HEIGHT)
+        self.live_results_view.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.live_results_view.setStyleSheet("QListView { background-color: transparent; border: none; }")
+        self.live_results_view.clicked.connect(self._on_live_result_clicked)
+        self.live_results_view.activated.connect(self._on_live_result_clicked)
+        layout_live_results.addWidget(self.live_results_view)
+
+        self.live_results_widget.hide()
+        main_search_layout.addWidget(self.live_results_widget)
         main_search_layout.addStretch(1)
 
-    def _emit_search_requested(self):
-        term = self.search_input.text().strip()
+    def current_filters(self) -> Dict[str, bool]:
         filters = {}
         for item_data in self.filter_checkboxes_effects:
             # Usar el nombre del atributo guardado para la clave del filtro
             # Asumimos que el nombre es algo como "filter_by_title_cb", lo simplificamos
             filter_key = item_data["name"].replace("filter_by_", "").replace("_cb", "")
             filters[filter_key] = item_data["checkbox"].isChecked()
-        self.search_requested.emit(term, filters)
+        return filters
+
+    def _emit_search_requested(self):
+        # Enter busca ya: la búsqueda en vivo pendiente sobra
+        self.live_search_timer.stop()
+        term = self.search_input.text().strip()
+        self.search_requested.emit(term, self.current_filters())
+
+    # --- Búsqueda en vivo ---
+
+    def _on_search_text_changed(self, *args):
+        term = self.search_input.text().strip()
+        if len(term) < self.LIVE_SEARCH_MIN_CHARS:
+            self.live_search_timer.stop()
+            if self._live_term or self.live_results_widget.isVisible():
+                self.clear_live_results()
+                self.live_search_cancelled.emit()
+            return
+        self.live_search_timer.start()
+
+    def _emit_live_search_requested(self):
+        term = self.search_input.text().strip()
+        if len(term) < self.LIVE_SEARCH_MIN_CHARS:
+            return
+        self.live_status_label.setText("Buscando…")
+        self.live_results_widget.show()
+        self.live_search_requested.emit(term, self.current_filters())
+
+    def show_live_results(self, term: str, books: List[Dict[str, Any]], total: Optional[int] = None):
+        """
+        Muestra la primera tanda de resultados de 'term'. 'total' puede llegar después
+        (set_live_total), porque contar todas las coincidencias tarda más que leer las primeras.
+        Los resultados de un término que ya no está escrito se ignoran.
+        """
+        if term != self.search_input.text().strip():
+            return
+        self._live_term = term
+        self.live_results_model.set_items(books)
+        self.live_results_view.scrollToTop()
+        self.set_live_total(term, total)
+        self.live_results_widget.show()
+
+    def set_live_total(self, term: str, total: Optional[int]):
+        if term != self._live_term:
+            return
+        if total is None:
+            shown = len(self.live_results_model.items())
+            self.live_status_label.setText(f"Primeros {shown} resultados…")
+        elif total == 0:
+            self.live_status_label.setText("Sin resultados")
+        else:
+            texto = "1 resultado" if total == 1 else f"{total} resultados"
+            self.live_status_label.setText(f"{texto} · Enter para ver todos")
+
+    def clear_live_results(self):
+        self.live_search_timer.stop()
+        self._live_term = ""
+        self.live_results_model.set_items([])
+        self.live_status_label.clear()
+        self.live_results_widget.hide()
+
+    def _on_live_result_clicked(self, index: QModelIndex):
+        if not index.isValid() or self.live_results_model.es_fila_vacia(index) or not self._live_term:
+            return
+        self.live_result_selected.emit(self._live_term, self.current_filters(), index.row())
 
     def _toggle_filter_expansion(self, event=None):
         if not hasattr(self, 'filter_options_widget') or not (hasattr(self, 'filter_checkboxes_effects') and bool(self.filter_checkboxes_effects)):
@@ -38,6 +38,8 @@ class AddBookDialog(BookFormDialog):
         success_inv, message_inv, cantidad_inv = self.book_service.guardar_libro_en_inventario(isbn, posicion)
         if success_inv:
             msg_exito = f"Cantidad incrementada en {posicion}. Nueva cantidad: {cantidad_inv}." if cantidad_inv > 1 else "Libro agregado al inventario exitosamente."
+            if not book_data.get("Título"):
+                msg_exito += "\nLos datos del libro se completarán automáticamente en segundo plano."
             QMessageBox.information(self, "Éxito", msg_exito)
             
             if self.cerrar_al_terminar_toggle.isChecked():
@@ -14,11 +14,12 @@ from PySide6.QtWidgets import (
     QSpacerItem, QGraphicsBlurEffect
 )
 from PySide6.QtGui import QFont, QPixmap, QPainter, QColor, QBrush, QMouseEvent, QFontDatabase, QIcon
-from PySide6.QtCore import Qt, QPoint, Signal, QTimer, Property, QEasingCurve, QPropertyAnimation, QUrl, QSize
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PySide6.QtCore import Qt, QPoint, Signal, QTimer, Property, QEasingCurve, QPropertyAnimation, QSize
 from typing import Dict, Any, Optional
 
 from gui.common.styles import COLORS, FONTS, STYLES
+from gui.common.async_service import AsyncServiceRunner
+from gui.components.image_manager import shared_image_manager
 from features.book_service import BookService
 from core.validator import Validator
 
@@ -90,8 +91,14 @@ class BookFormDialog(QDialog):
             QFontDatabase.addApplicationFont(os.path.join(font_dir, font_file))
         self.font_family = "Montserrat"
 
-        self.network_manager = QNetworkAccessManager(self)
-        self.network_manager.finished.connect(self._on_image_loaded)
+        # Portadas a través del gestor de imágenes compartido (cachés en memoria y disco)
+        self.image_manager = shared_image_manager()
+        self.image_manager.image_loaded.connect(self._on_image_loaded)
+        self.image_manager.image_failed.connect(self._on_image_failed)
+        self._portadas_conectadas = True
+        self._portada_isbn = None
+        # Las búsquedas por ISBN (base de datos y APIs) se hacen en segundo plano
+        self.tareas = AsyncServiceRunner(self)
 
         self._drag_pos = QPoint()
         self.title_bar_height = 50
@@ -340,7 +347,37 @@ class BookFormDialog(QDialog):
         if not Validator.is_valid_isbn(isbn):
             QMessageBox.warning(self, "Error de Validación", "El ISBN ingresado no es válido.")
             return
-        search_result = self.book_service.buscar_libro_por_isbn(isbn)
+        self._set_busqueda_en_curso(True)
+        self.tareas.submit(
+            self.book_service.buscar_libro_por_isbn, isbn,
+            on_result=lambda resultado: self._on_isbn_encontrado(isbn, resultado),
+            on_error=self._on_error_busqueda_isbn,
+            key="buscar_isbn"
+        )
+
+    def _set_busqueda_en_curso(self, en_curso: bool):
+        """Bloquea el campo ISBN mientras la búsqueda se ejecuta en segundo plano."""
+        self.isbn_input.setReadOnly(en_curso)
+        self.search_isbn_button.setEnabled(not en_curso)
+        self.setCursor(Qt.CursorShape.BusyCursor if en_curso else Qt.CursorShape.ArrowCursor)
+
+    def _on_error_busqueda_isbn(self, error: Exception):
+        self._set_busqueda_en_curso(False)
+        print(f"\033[1;31m❌ Error al buscar el ISBN: {error}\033[0m")
+        if self.mode == 'ADD':
+            # No bloquear el ingreso: se puede guardar solo con precio y posición
+            QMessageBox.information(self, "Búsqueda no disponible",
+                                    "No se pudo consultar la información del libro.\n"
+                                    "Puede ingresar solo el precio y la posición; los datos se completarán más tarde.")
+            self.ultimo_isbn_procesado_con_enter = self.isbn_input.text().strip()
+            self.original_book_data = None
+            self._fill_form_fields({}, make_editable=True)
+            self.precio_input.setFocus()
+        else:
+            QMessageBox.critical(self, "Error", f"No se pudo buscar el libro:\n{error}")
+
+    def _on_isbn_encontrado(self, isbn: str, search_result: Dict[str, Any]):
+        self._set_busqueda_en_curso(False)
         status = search_result["status"]
         book_details = search_result.get("book_details")
 
@@ -391,7 +428,10 @@ class BookFormDialog(QDialog):
                 QMessageBox.critical(self, "Error", f"No se encontró el libro con ISBN {isbn} para modificar.")
                 self._reset_for_next_book()
             else:
-                QMessageBox.information(self, "Libro no Encontrado", "Por favor, ingrese los datos manualmente.")
+                QMessageBox.information(self, "Libro no Encontrado",
+                                        "Por favor, ingrese los datos manualmente.\n"
+                                        "Si deja el título vacío, basta con el precio y la posición: "
+                                        "los datos se completarán automáticamente más tarde.")
                 self._fill_form_fields({}, make_editable=True)
                 self.titulo_input.setFocus()
 
@@ -399,7 +439,11 @@ class BookFormDialog(QDialog):
         titulo = self.titulo_input.text().strip()
         posicion = self.posicion_input.text().strip().upper()
         precio_limpio = self._limpiar_valor_precio(self.precio_input.text())
-        if not all([titulo, posicion, precio_limpio]):
+        if self.mode == 'ADD':
+            # Sin título, el libro queda en la cola de datos pendientes (ver EnrichmentService)
+            if not all([posicion, precio_limpio]):
+                QMessageBox.warning(self, "Campos Incompletos", "Precio y Posición son obligatorios."); return
+        elif not all([titulo, posicion, precio_limpio]):
             QMessageBox.warning(self, "Campos Incompletos", "Título, Precio y Posición son obligatorios."); return
         if int(precio_limpio) < 1000:
              QMessageBox.warning(self, "Error", "El precio debe ser igual o mayor a 1000."); self.precio_input.setFocus(); self.precio_input.selectAll(); return
@@ -420,6 +464,17 @@ class BookFormDialog(QDialog):
     
     def reject(self):
         super().reject()
+
+    def done(self, result):
+        # Descarta las búsquedas pendientes para que no lleguen a un diálogo cerrado
+        self.tareas.cancel_all()
+        # Lo mismo con las portadas: el gestor de imágenes es compartido y, sin
+        # desconectar, mantendría vivo el diálogo cerrado
+        if self._portadas_conectadas: # done() puede llamarse más de una vez
+            self.image_manager.image_loaded.disconnect(self._on_image_loaded)
+            self.image_manager.image_failed.disconnect(self._on_image_failed)
+            self._portadas_conectadas = False
+        super().done(result)
     
     def closeEvent(self, event):
         super().closeEvent(event)
@@ -451,18 +506,14 @@ class BookFormDialog(QDialog):
 
         self.image_container_label.setPixmap(placeholder_pixmap)
 
-    def _on_image_loaded(self, reply: QNetworkReply):
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            if pixmap.loadFromData(image_data):
-                scaled_pixmap = pixmap.scaled(self.image_container_label.size(), Qt.AspectRatioMode.KeepAspectRatioByExpanding, Qt.TransformationMode.SmoothTransformation)
-                self.image_container_label.setPixmap(scaled_pixmap)
-            else:
-                self._set_placeholder_image()
-        else:
+    def _on_image_loaded(self, image_id, size_name, pixmap):
+        # La portada llega ya escalada al tamaño de la vista previa ("form")
+        if image_id == self._portada_isbn and size_name == "form":
+            self.image_container_label.setPixmap(pixmap)
+
+    def _on_image_failed(self, image_id):
+        if image_id == self._portada_isbn:
             self._set_placeholder_image()
-        reply.deleteLater()
 
     def _fill_form_fields(self, details, make_editable):
         self.titulo_input.setText(details.get("Título", "")); self.titulo_input.setReadOnly(not make_editable)
@@ -475,11 +526,11 @@ class BookFormDialog(QDialog):
         image_url = details.get("Imagen", "")
         self.imagen_input.setText(image_url); self.imagen_input.setReadOnly(not make_editable)
         
-        if image_url:
-            request = QNetworkRequest(QUrl(image_url))
-            self.network_manager.get(request)
-        else:
-            self._set_placeholder_image()
+        self._portada_isbn = details.get("ISBN") or self.isbn_input.text().strip()
+        self._set_placeholder_image()
+        if image_url and self._portada_isbn:
+            # Si la portada está en caché se muestra al instante, sin red
+            self.image_manager.get_image(self._portada_isbn, image_url, "form")
 
         if not self.detail_widgets_container.isVisible():
             self.detail_widgets_container.setVisible(True)
@@ -496,6 +547,7 @@ class BookFormDialog(QDialog):
         for field in [self.titulo_input, self.autor_input, self.editorial_input, self.categorias_input, self.precio_input, self.posicion_input, self.imagen_input]:
             field.clear(); field.setReadOnly(True)
         self.isbn_input.clear(); self.isbn_input.setReadOnly(False)
+        self._portada_isbn = None
         
         if self.detail_widgets_container.isVisible():
             self.detail_widgets_container.setVisible(False)
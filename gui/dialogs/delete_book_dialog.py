@@ -11,7 +11,7 @@ from PySide6.QtCore import Qt, QSize, QTimer
 
 from features.delete_service import DeleteService
 from gui.common.utils import get_icon_path, format_price
-from gui.components.image_manager import ImageManager
+from gui.components.image_manager import shared_image_manager
 
 class DeleteBookDialog(QDialog):
     """
@@ -23,8 +23,10 @@ class DeleteBookDialog(QDialog):
         self.current_book_data = None
         self.inventory_entries = []
 
-        self.image_manager = ImageManager()
+        self.image_manager = shared_image_manager()
         self.image_manager.image_loaded.connect(self._on_image_loaded)
+        self.image_manager.image_failed.connect(self._on_image_failed)
+        self._portadas_conectadas = True
 
         self.setWindowTitle("Eliminar Libro")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
@@ -245,7 +247,7 @@ class DeleteBookDialog(QDialog):
         
         self.current_book_data = result["book_details"]
         self.inventory_entries = result["inventory_entries"]
-        self.image_manager.get_image(self.current_book_data.get('ISBN', ''), self.current_book_data.get('Imagen', ''))
+        self.image_manager.get_image(self.current_book_data.get('ISBN', ''), self.current_book_data.get('Imagen', ''), "delete")
         
         self._display_book_info()
         self._display_inventory_info()
@@ -253,10 +255,13 @@ class DeleteBookDialog(QDialog):
         self.details_container.setVisible(True)
         QTimer.singleShot(0, self.adjustSize)
 
-    def _on_image_loaded(self, image_id, pixmap):
-        if self.current_book_data and image_id == self.current_book_data.get('ISBN'):
+    def _on_image_loaded(self, image_id, size_name, pixmap):
+        # El gestor de imágenes es compartido: ignorar las portadas de otros widgets
+        if self.current_book_data and image_id == self.current_book_data.get('ISBN') and size_name == "delete":
             self.image_label.setPixmap(pixmap)
-        else:
+
+    def _on_image_failed(self, image_id):
+        if self.current_book_data and image_id == self.current_book_data.get('ISBN'):
             self.image_label.setText("Imagen no disponible")
 
     def _display_book_info(self):
@@ -355,6 +360,15 @@ class DeleteBookDialog(QDialog):
 
     def reject(self):
         super().reject()
+
+    def done(self, result):
+        # El gestor de imágenes es compartido y sobrevive al diálogo: sin desconectar,
+        # cada diálogo cerrado seguiría vivo y recibiendo las portadas de los demás
+        if self._portadas_conectadas: # done() puede llamarse más de una vez
+            self.image_manager.image_loaded.disconnect(self._on_image_loaded)
+            self.image_manager.image_failed.disconnect(self._on_image_failed)
+            self._portadas_conectadas = False
+        super().done(result)
         
     def showEvent(self, event):
         super().showEvent(event)
@@ -1,15 +1,18 @@
-from PySide6.QtWidgets import (QDialog, QVBoxLayout, QListWidget, QListWidgetItem, 
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QListView, QAbstractItemView,
                              QWidget, QHBoxLayout, QLabel, QPushButton, QFrame,
                              QSizePolicy, QStackedWidget, QLineEdit, QMessageBox, QButtonGroup,
-                             QGraphicsDropShadowEffect, QInputDialog)
+                             QGraphicsScene, QGraphicsBlurEffect, QStyledItemDelegate, QStyle,
+                             QInputDialog)
 from PySide6.QtGui import (QFont, QPainter, QColor, QBrush, QPen, QFontMetrics,
-                         QFontDatabase, QPainterPath, QPixmap, QMouseEvent, QIcon)
-from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QPoint, QEasingCurve, Property
+                         QFontDatabase, QPainterPath, QPixmap, QImage, QMouseEvent, QIcon)
+from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QPoint, QEasingCurve, Property, QRect, QRectF
 from datetime import datetime
 from features.reservation_service import ReservationService
 from gui.resources.sfsymbols import SFSymbols
 from gui.common.utils import format_price
 from gui.common.styles import STYLES, FONTS
+from gui.common.async_service import AsyncServiceRunner
+from gui.common.item_models import DictListModel
 import os
 
 class FinalPaymentDialog(QDialog):
@@ -90,109 +93,145 @@ class ElidedLabel(QLabel):
         elided_text = metrics.elidedText(self.text(), Qt.ElideRight, self.width())
         painter.drawText(self.rect(), self.alignment() | Qt.AlignVCenter, elided_text)
 
-class ReservationItemWidget(QFrame):
-    def __init__(self, reservation_data, parent=None):
+def _render_card_shadow(width: int, height: int, radius: float, blur: float,
+                        color: QColor, dpr: float) -> QPixmap:
+    """
+    Pinta una vez la sombra difuminada de una tarjeta de width x height. Equivale a
+    lo que dibujaba un QGraphicsDropShadowEffect, pero sin recalcular el difuminado
+    en cada repintado. El pixmap incluye un margen de 'blur' píxeles por lado.
+    """
+    margin = int(blur)
+    scene = QGraphicsScene()
+    path = QPainterPath()
+    path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+    item = scene.addPath(path, QPen(Qt.NoPen), QBrush(color))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur)
+    item.setGraphicsEffect(effect)
+
+    full = QSize(width + 2 * margin, height + 2 * margin)
+    image = QImage(full * dpr, QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    scene.render(painter, QRectF(0, 0, full.width(), full.height()),
+                 QRectF(-margin, -margin, full.width(), full.height()))
+    painter.end()
+    return QPixmap.fromImage(image)
+
+
+class ReservationItemDelegate(QStyledItemDelegate):
+    """
+    Pinta cada reserva de la lista como una tarjeta, sin un widget por fila: icono
+    del cliente, nombre (recortado con "...") y número de reserva. La tarjeta de la
+    reserva seleccionada lleva una sombra azulada, pintada de antemano y reutilizada.
+    """
+
+    ITEM_HEIGHT = 75
+    RADIUS = 14
+    BORDER = 2
+    MARGIN_H, MARGIN_V = 20, 15
+    SPACING = 15
+    ICON_SIZE = 42
+    SHADOW_BLUR = 15
+    SHADOW_OFFSET = QPoint(0, 2)
+    SHADOW_COLOR = QColor(102, 126, 234, 40)
+
+    # (fondo, borde) de la tarjeta según su estado
+    NORMAL = (QColor(255, 255, 255, 217), QColor("#E2E8F0"))
+    HOVER = (QColor(255, 255, 255, 242), QColor("#667EEA"))
+    CHECKED = (QColor(235, 244, 255, 230), QColor(102, 126, 234, 230))
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.reservation_data = reservation_data
-        self.setCursor(Qt.PointingHandCursor)
-        self.is_checked = False
-        self.init_ui()
-        self.setProperty("checked", self.is_checked)
-
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(15)
-        shadow.setColor(QColor(102, 126, 234, 40))
-        shadow.setOffset(0, 2)
-        shadow.setEnabled(False)
-        self.setGraphicsEffect(shadow)
-        self.shadow_effect = shadow
-
-    def setChecked(self, checked):
-        if self.is_checked != checked:
-            self.is_checked = checked
-            self.shadow_effect.setEnabled(checked)
-            self.setProperty("checked", checked)
-            self.style().unpolish(self)
-            self.style().polish(self)
-            self.update()
-
-    def init_ui(self):
-        main_layout = QHBoxLayout(self)
-        main_layout.setContentsMargins(20, 15, 20, 15)
-        main_layout.setSpacing(15)
-        main_layout.setAlignment(Qt.AlignmentFlag.AlignVCenter)
-
-        icon_label = QLabel(self)
-        icon = SFSymbols.get_icon("person.add", color="white")
-        icon_label.setPixmap(icon.pixmap(QSize(28, 28)))
-        icon_label.setFixedSize(42, 42)
-        icon_label.setStyleSheet("background-color: #333; border-radius: 21px;")
-        icon_label.setAlignment(Qt.AlignCenter)
-        
-        content_widget = QWidget()
-        content_layout = QHBoxLayout(content_widget)
-        content_layout.setContentsMargins(0,0,0,0)
-        content_layout.setSpacing(15)
-
-        client_title_label = QLabel("Nombre del cliente:")
-        client_title_label.setFont(QFont("Montserrat", 11, QFont.Weight.DemiBold))
-        client_title_label.setStyleSheet("color: #4A5568;")
-        
-        client_name_label = ElidedLabel(self.reservation_data.get('cliente_nombre', 'N/A'))
-        client_name_label.setFont(QFont("Montserrat", 11))
-        client_name_label.setStyleSheet("color: #1A202C;")
-        client_name_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
-
-        res_id_widget = QWidget()
-        res_id_layout = QHBoxLayout(res_id_widget)
-        res_id_layout.setContentsMargins(0,0,0,0)
-        res_id_layout.setSpacing(8)
-        res_id_layout.setAlignment(Qt.AlignRight)
-
-        res_title_label = QLabel("Num Reserva:")
-        res_title_label.setFont(QFont("Montserrat", 11, QFont.Weight.DemiBold))
-        res_title_label.setStyleSheet("color: #4A5568;")
-        
-        res_id_label = QLabel(str(self.reservation_data.get('id_reserva', 'N/A')))
-        res_id_label.setFont(QFont("Montserrat", 11))
-        res_id_label.setStyleSheet("color: #1A202C;")
-        
-        res_id_layout.addWidget(res_title_label)
-        res_id_layout.addWidget(res_id_label)
-
-        content_layout.addWidget(client_title_label)
-        content_layout.addWidget(client_name_label, 1)
-        content_layout.addWidget(res_id_widget)
-
-        content_widget.setObjectName("contentWidget")
-
-        main_layout.addWidget(icon_label)
-        main_layout.addWidget(content_widget, 1)
-
-        self.setObjectName("ReservationItemWidget")
-        # Nivel 3: Elementos individuales - Color sólido más destacado
-        self.setStyleSheet("""
-            #ReservationItemWidget { 
-                background-color: rgba(255, 255, 255, 0.85); 
-                border: 2px solid #E2E8F0; 
-                border-radius: 14px; 
-            }
-            #ReservationItemWidget:hover { 
-                border-color: #667EEA;
-                background-color: rgba(255, 255, 255, 0.95);
-            }
-            #ReservationItemWidget[checked="true"] {
-                background-color: rgba(235, 244, 255, 0.9);
-                border: 2px solid rgba(102, 126, 234, 0.9);
-            }
-            #contentWidget, #contentWidget * {
-                background: transparent;
-                border: none;
-            }
-        """)
+        self.label_font = QFont("Montserrat", 11, QFont.Weight.DemiBold)
+        self.value_font = QFont("Montserrat", 11)
+        self.label_color = QColor("#4A5568")
+        self.value_color = QColor("#1A202C")
+        self._icon = SFSymbols.get_icon("person.add", color="white")
+        self._shadows = {}
+
+    def sizeHint(self, option, index):
+        view = option.widget
+        width = view.viewport().width() - 2 * view.spacing() if view is not None else option.rect.width()
+        return QSize(width, self.ITEM_HEIGHT)
+
+    def _shadow(self, size: QSize, dpr: float) -> QPixmap:
+        key = (size.width(), size.height(), dpr)
+        shadow = self._shadows.get(key)
+        if shadow is None:
+            if len(self._shadows) > 8: # el ancho solo cambia al redimensionar el diálogo
+                self._shadows.clear()
+            shadow = _render_card_shadow(size.width(), size.height(), self.RADIUS, self.SHADOW_BLUR,
+                                         self.SHADOW_COLOR, dpr)
+            self._shadows[key] = shadow
+        return shadow
+
+    def paint(self, painter, option, index):
+        reservation = index.data(Qt.UserRole)
+        if not reservation:
+            return
+        rect = option.rect
+        checked = bool(option.state & QStyle.State_Selected)
+        background, border = self.CHECKED if checked else (
+            self.HOVER if option.state & QStyle.State_MouseOver else self.NORMAL)
 
-    def sizeHint(self):
-        return QSize(super().sizeHint().width(), 75)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        if checked:
+            dpr = painter.device().devicePixelRatioF()
+            painter.drawPixmap(rect.topLeft() - QPoint(self.SHADOW_BLUR, self.SHADOW_BLUR) + self.SHADOW_OFFSET,
+                               self._shadow(rect.size(), dpr))
+
+        # Tarjeta: el borde de 2 px queda por dentro del rectángulo, como en la hoja de estilos
+        pen = QPen(border)
+        pen.setWidthF(self.BORDER)
+        painter.setPen(pen)
+        painter.setBrush(background)
+        half = self.BORDER / 2
+        painter.drawRoundedRect(QRectF(rect).adjusted(half, half, -half, -half), self.RADIUS - half, self.RADIUS - half)
+
+        content = rect.adjusted(self.BORDER + self.MARGIN_H, self.BORDER + self.MARGIN_V,
+                                -(self.BORDER + self.MARGIN_H), -(self.BORDER + self.MARGIN_V))
+        center_y = content.center().y()
+
+        # Icono: círculo oscuro con el símbolo en blanco
+        icon_rect = QRect(content.left(), center_y - self.ICON_SIZE // 2 + 1, self.ICON_SIZE, self.ICON_SIZE)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#333"))
+        painter.drawEllipse(icon_rect)
+        self._icon.paint(painter, icon_rect.adjusted(7, 7, -7, -7))
+
+        label_metrics = QFontMetrics(self.label_font)
+        value_metrics = QFontMetrics(self.value_font)
+        text_height = max(label_metrics.height(), value_metrics.height())
+        text_top = center_y - text_height // 2 + 1
+
+        def draw(x, width, text, font, color):
+            painter.setFont(font)
+            painter.setPen(color)
+            painter.drawText(QRect(x, text_top, width, text_height), Qt.AlignLeft | Qt.AlignVCenter, text)
+
+        # Número de reserva, alineado a la derecha
+        res_label = "Num Reserva:"
+        res_id = str(reservation.get('id_reserva', 'N/A'))
+        res_id_width = value_metrics.horizontalAdvance(res_id)
+        res_label_width = label_metrics.horizontalAdvance(res_label)
+        res_left = content.right() + 1 - res_id_width - 8 - res_label_width
+        draw(res_left, res_label_width, res_label, self.label_font, self.label_color)
+        draw(content.right() + 1 - res_id_width, res_id_width, res_id, self.value_font, self.value_color)
+
+        # Nombre del cliente, recortado al espacio libre
+        client_label = "Nombre del cliente:"
+        x = icon_rect.right() + 1 + self.SPACING
+        client_label_width = label_metrics.horizontalAdvance(client_label)
+        draw(x, client_label_width, client_label, self.label_font, self.label_color)
+        x += client_label_width + self.SPACING
+        name_width = max(res_left - self.SPACING - x, 0)
+        name = value_metrics.elidedText(reservation.get('cliente_nombre', 'N/A'), Qt.ElideRight, name_width)
+        draw(x, name_width, name, self.value_font, self.value_color)
+        painter.restore()
 
 class ReservedItemWidget(QFrame):
     def __init__(self, item_data, parent=None):
@@ -267,6 +306,7 @@ class ExistingReservationsDialog(QDialog):
         self.current_reservation_details = None
         self.needs_list_refresh = False
         self.deposit_payment_method = None
+        self.tareas = AsyncServiceRunner(self)
 
         if QFontDatabase.addApplicationFont(":/fonts/Montserrat-Regular.ttf") == -1:
             print("Warning: Could not load Montserrat-Regular.ttf")
@@ -382,49 +422,45 @@ class ExistingReservationsDialog(QDialog):
         container_layout.setContentsMargins(20, 20, 20, 20)
         container_layout.setSpacing(12)
         
-        self.list_widget = QListWidget()
-        self.list_widget.viewport().setAutoFillBackground(False)
-        self.list_widget.setSpacing(12)
-        # El QListWidget ahora solo es el fondo para los items, sin bordes propios
-        self.list_widget.setStyleSheet("""
-            QListWidget { 
+        # Las reservas viven en un modelo y las pinta ReservationItemDelegate (sin un widget por fila)
+        self.reservations_model = DictListModel(clave_texto="cliente_nombre", parent=self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.reservations_model)
+        self.list_view.setItemDelegate(ReservationItemDelegate(self.list_view))
+        self.list_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setResizeMode(QListView.Adjust)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setMouseTracking(True) # estado hover de las tarjetas
+        self.list_view.viewport().setAttribute(Qt.WA_Hover)
+        self.list_view.viewport().setCursor(Qt.PointingHandCursor)
+        self.list_view.viewport().setAutoFillBackground(False)
+        self.list_view.setSpacing(12)
+        # La QListView solo es el fondo para las tarjetas, sin bordes propios
+        self.list_view.setStyleSheet("""
+            QListView { 
                 background-color: transparent; 
                 border: none;
                 outline: none;
             }
-            QListWidget::viewport {
-                background: transparent;
-            }
-            QListWidget::item {
-                border: none;
+            QListView::viewport {
                 background: transparent;
             }
         """)
-        self.list_widget.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.list_widget.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.list_widget.verticalScrollBar().setStyleSheet("QScrollBar:vertical { border: none; background: transparent; width: 10px; margin: 10px 0 10px 0; } QScrollBar::handle:vertical { background: #CCCCCC; min-height: 20px; border-radius: 5px; } QScrollBar::handle:vertical:hover { background: #AAAAAA; } QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { border: none; background: none; height: 10px; } QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }")
+        self.list_view.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.list_view.verticalScrollBar().setStyleSheet("QScrollBar:vertical { border: none; background: transparent; width: 10px; margin: 10px 0 10px 0; } QScrollBar::handle:vertical { background: #CCCCCC; min-height: 20px; border-radius: 5px; } QScrollBar::handle:vertical:hover { background: #AAAAAA; } QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { border: none; background: none; height: 10px; } QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical { background: none; }")
         
-        self.list_widget.itemClicked.connect(self.on_reservation_activated)
-        self.list_widget.itemActivated.connect(self.on_reservation_activated)
-        self.list_widget.currentItemChanged.connect(self.on_current_item_changed)
+        self.list_view.clicked.connect(self.on_reservation_activated)
+        self.list_view.activated.connect(self.on_reservation_activated)
         
-        container_layout.addWidget(self.list_widget)
+        container_layout.addWidget(self.list_view)
         list_layout.addWidget(list_container)
 
-    def on_current_item_changed(self, current, previous):
-        if previous:
-            prev_widget = self.list_widget.itemWidget(previous)
-            if prev_widget:
-                prev_widget.setChecked(False)
-        if current:
-            curr_widget = self.list_widget.itemWidget(current)
-            if curr_widget:
-                curr_widget.setChecked(True)
-
-    def on_reservation_activated(self, item):
-        widget = self.list_widget.itemWidget(item)
-        if widget:
-            self.show_detail_view(widget.reservation_data)
+    def on_reservation_activated(self, index):
+        reservation = self.reservations_model.item(index.row())
+        if reservation:
+            self.show_detail_view(reservation)
 
     def show_detail_view(self, reservation_data):
         reservation_id = reservation_data['id_reserva']
@@ -781,7 +817,7 @@ class ExistingReservationsDialog(QDialog):
         self.slide_to_widget_index(0)
         # Re-ajustar al volver a la lista
         self._adjust_dialog_height(
-            item_count=self.list_widget.count(), 
+            item_count=self.reservations_model.rowCount(), 
             item_height=87, 
             base_height=200, 
             max_height=435
@@ -1055,28 +1091,29 @@ class ExistingReservationsDialog(QDialog):
             QMessageBox.critical(self, "Error", f"No se pudo completar la operación:\n{message}")
 
     def load_reservations(self):
-        reservations = self.reservation_service.get_all_reservations()
+        # La consulta se hace en segundo plano; una recarga nueva cancela la anterior
+        self.tareas.submit(
+            self.reservation_service.get_all_reservations,
+            on_result=self._on_reservations_loaded,
+            on_error=lambda error: self._on_reservations_loaded(None),
+            key="load_reservations"
+        )
+
+    def _on_reservations_loaded(self, reservations):
         if reservations is None:
             QMessageBox.critical(self, "Error de base de datos", "No se pudieron cargar las reservas.")
             return
 
-        self.list_widget.clear()
-        for i, reservation in enumerate(reservations):
-            item = QListWidgetItem(self.list_widget)
-            widget = ReservationItemWidget(reservation)
-
-            item.setSizeHint(widget.sizeHint())
-            self.list_widget.addItem(item)
-            self.list_widget.setItemWidget(item, widget)
+        self.reservations_model.set_items(reservations)
             
         # Ajustar altura para la lista de reservas
         # Base height: title bar + container paddings
-        # Item height: height of one ReservationItemWidget + spacing
+        # Item height: height of one reservation card + spacing
         self._adjust_dialog_height(item_count=len(reservations), item_height=87, base_height=200, max_height=435)
 
-        if self.list_widget.count() > 0:
-            self.list_widget.setCurrentRow(0)
-            self.list_widget.setFocus()
+        if self.reservations_model.rowCount() > 0:
+            self.list_view.setCurrentIndex(self.reservations_model.index(0))
+            self.list_view.setFocus()
 
     def _recenter_dialog(self):
         if self.parentWidget():
@@ -1090,5 +1127,9 @@ class ExistingReservationsDialog(QDialog):
         self.adjustSize()
         self._recenter_dialog()
 
+    def done(self, result):
+        self.tareas.cancel_all()
+        super().done(result)
+
     def closeEvent(self, event):
         self.accept()
\ No newline at end of file
@@ -16,6 +16,7 @@ if PROJECT_ROOT not in sys.path:
 
 from features.finance_service import FinanceService
 from gui.common.styles import FONTS
+from gui.common.async_service import AsyncServiceRunner
 from core.models import Ingreso, Egreso
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -110,6 +111,7 @@ class ModifyFinancesDialog(QDialog):
         self.font_family = FONTS["family"]
         self._drag_pos = QPoint()
         self.original_values = {}
+        self.tareas = AsyncServiceRunner(self)
 
         self._setup_window()
         self._init_ui()
@@ -251,8 +253,22 @@ class ModifyFinancesDialog(QDialog):
     def _load_finances_for_today(self):
         self.tree.clear()
         today = QDate.currentDate().toString("yyyy-MM-dd")
-        ingresos, egresos = self.finance_service.get_finances_by_date(today)
-        
+        # La consulta se hace en segundo plano para no congelar la ventana
+        self.tareas.submit(
+            self.finance_service.get_finances_by_date, today,
+            on_result=self._on_finances_loaded,
+            on_error=self._on_finances_error,
+            key="load_finances"
+        )
+
+    def _on_finances_error(self, error: Exception):
+        logging.error(f"Error al cargar las finanzas del día: {error}")
+        QMessageBox.critical(self, "Error", "No se pudieron cargar las finanzas del día.")
+
+    def _on_finances_loaded(self, finanzas):
+        ingresos, egresos = finanzas
+        self.tree.clear()
+
         all_transactions = [("ingreso", i) for i in ingresos] + [("egreso", e) for e in egresos]
         all_transactions.sort(key=lambda x: x[1].fecha, reverse=True)
 
@@ -369,6 +385,10 @@ class ModifyFinancesDialog(QDialog):
         self.accept() # Cierra el diálogo por ahora.
         return
 
+    def done(self, result):
+        self.tareas.cancel_all()
+        super().done(result)
+
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self._drag_pos = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
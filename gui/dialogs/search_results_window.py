@@ -9,7 +9,9 @@ from PySide6.QtGui import QIcon, QPainter, QPixmap, QMouseEvent, QFont, QDesktop
 from gui.components.result_list_widget import ResultListWidget
 from gui.components.book_detail_widget import BookDetailWidget
 from gui.components.book_list_view_widget import BookListViewWidget
-from gui.components.image_manager import ImageManager
+from gui.components.image_manager import shared_image_manager
+from gui.common.async_service import AsyncServiceRunner
+from features.paged_search import BusquedaPaginada
 from gui.common.styles import FONTS, COLORS
 
 # Attempt to get icon paths, provide defaults if not found
@@ -41,6 +43,10 @@ class SearchResultsWindow(QDialog):
         self.setMinimumSize(800, 410) # Reduced minimum height
         self.libros_actuales = [] # Store current books for view updates
         self.termino_busqueda_actual = termino_busqueda
+        # Paged searches (BusquedaPaginada): rows already handed to the lists
+        self._filas_mostradas = 0
+        self._pagina_pendiente = None
+        self.tareas = AsyncServiceRunner(self)
 
         # --- Main Layout --- (Vertical: Top Bar, Content Area)
         self.main_layout = QVBoxLayout(self)
@@ -134,8 +140,8 @@ class SearchResultsWindow(QDialog):
         detail_view_layout.setContentsMargins(8, 8, 8, 0)
         detail_view_layout.setSpacing(8)
 
-        # Crear el ImageManager
-        self.image_manager = ImageManager(parent=self)
+        # Gestor de imágenes compartido por toda la aplicación (cachés en memoria y disco)
+        self.image_manager = shared_image_manager()
 
         self.result_list_widget = ResultListWidget(image_manager=self.image_manager)
         # Set a maximum width for the list widget to control its size
@@ -161,6 +167,8 @@ class SearchResultsWindow(QDialog):
         # Connect the BookListViewWidget's signal as well
         if hasattr(self, 'book_list_view_widget') and self.book_list_view_widget:
             self.book_list_view_widget.image_view_requested.connect(self._handle_image_view_request)
+        self.result_list_widget.more_results_requested.connect(self._cargar_mas_resultados)
+        self.book_list_view_widget.more_results_requested.connect(self._cargar_mas_resultados)
 
         # Initial content update
         self.update_content(libros_encontrados, termino_busqueda)
@@ -218,6 +226,13 @@ class SearchResultsWindow(QDialog):
         if self.parent() and self._blur_effect: self._enable_blur(False)
         return result
 
+    def done(self, result):
+        # Leaving the results: drop the covers still queued for prefetch
+        self.tareas.cancel_all()
+        self.result_list_widget.cancel_cover_prefetch()
+        self.book_list_view_widget.cancel_cover_prefetch()
+        super().done(result)
+
     def accept(self):
         super().accept()
 
@@ -280,7 +295,16 @@ class SearchResultsWindow(QDialog):
         # if next_index == 0: self.view_toggle_button.setText("≡") 
         # else: self.view_toggle_button.setText("□") # Example for switching icon
 
-    def update_content(self, libros_encontrados: list, termino_busqueda: str):
+    def update_content(self, libros_encontrados, termino_busqueda: str, fila_seleccionada: int = 0):
+        """
+        Shows a search result. 'libros_encontrados' is either a plain list or a
+        BusquedaPaginada; in that case only its first page is loaded, and the lists
+        ask for more rows as the user scrolls. 'fila_seleccionada' (within that
+        first page) is the result selected on open, e.g. the one clicked in the
+        search bar preview.
+        """
+        self.tareas.cancel_all()
+        self._pagina_pendiente = None
         self.libros_actuales = libros_encontrados
         self.termino_busqueda_actual = termino_busqueda
         
@@ -290,16 +314,64 @@ class SearchResultsWindow(QDialog):
         else:
             self.window_title_label.setText(f"{count} resultados para \"{termino_busqueda}\"")
 
-        self.result_list_widget.update_results(libros_encontrados)
-        if libros_encontrados:
-            self.book_detail_widget.update_details(libros_encontrados[0])
-            self.result_list_widget.set_selected_index(0)
+        if isinstance(libros_encontrados, BusquedaPaginada):
+            libros_a_mostrar = libros_encontrados.pagina(0)
+        else:
+            libros_a_mostrar = libros_encontrados
+        self._filas_mostradas = len(libros_a_mostrar)
+
+        self.result_list_widget.update_results(libros_a_mostrar)
+        if libros_a_mostrar:
+            fila = fila_seleccionada if 0 <= fila_seleccionada < len(libros_a_mostrar) else 0
+            self.book_detail_widget.update_details(libros_a_mostrar[fila])
+            self.result_list_widget.set_selected_index(fila)
         else:
             self.book_detail_widget.update_details({})
         
         # Update other views if they exist and are implemented
         if hasattr(self, 'book_list_view_widget') and self.book_list_view_widget:
-            self.book_list_view_widget.update_results(libros_encontrados)
+            self.book_list_view_widget.update_results(libros_a_mostrar)
+        self._precargar_siguiente_pagina()
+
+    def _cargar_mas_resultados(self):
+        """Appends the next page of a paged search to both lists."""
+        resultados = self.libros_actuales
+        if not isinstance(resultados, BusquedaPaginada) or self._filas_mostradas >= len(resultados):
+            return
+        numero = resultados.pagina_de(self._filas_mostradas)
+        if resultados.pagina_cargada(numero):
+            self._mostrar_pagina(resultados, numero, resultados.pagina(numero))
+        else:
+            # Shown as soon as it arrives (its prefetch may already be running)
+            self._pagina_pendiente = numero
+            self._pedir_pagina(resultados, numero)
+
+    def _pedir_pagina(self, resultados: BusquedaPaginada, numero: int):
+        if not self.tareas.is_running(("pagina", numero)):
+            self.tareas.submit(resultados.pagina, numero, key=("pagina", numero),
+                               on_result=lambda libros: self._on_pagina_cargada(resultados, numero, libros))
+
+    def _on_pagina_cargada(self, resultados: BusquedaPaginada, numero: int, libros: list):
+        if self._pagina_pendiente == numero:
+            self._pagina_pendiente = None
+            self._mostrar_pagina(resultados, numero, libros)
+
+    def _mostrar_pagina(self, resultados: BusquedaPaginada, numero: int, libros: list):
+        # Ignore pages of a previous search or pages that are already shown
+        if resultados is not self.libros_actuales or resultados.pagina_de(self._filas_mostradas) != numero:
+            return
+        self._filas_mostradas += len(libros)
+        self.result_list_widget.append_results(libros)
+        self.book_list_view_widget.append_results(libros)
+        self._precargar_siguiente_pagina()
+
+    def _precargar_siguiente_pagina(self):
+        """Loads the page after the last shown row in the background."""
+        resultados = self.libros_actuales
+        if not isinstance(resultados, BusquedaPaginada):
+            return
+        for numero in resultados.paginas_sin_cargar(self._filas_mostradas, self._filas_mostradas + 1):
+            self._pedir_pagina(resultados, numero)
 
 # Example Usage for the new SearchResultsWindow
 if __name__ == '__main__':
@@ -8,6 +8,7 @@ que muestra el menú con las diferentes opciones disponibles para el usuario.
 """
 
 import os
+import threading
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QSizePolicy, QSpacerItem, QMessageBox, QFrame, QApplication,
@@ -15,9 +16,11 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QFont, QPixmap, QPainter, QIcon
 from PySide6.QtCore import Qt, QPoint, QSize, QTimer, QEvent
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from app.dependencies import DependencyFactory
+from core.interfaces import ConsultaCanceladaError
+from gui.common.async_service import AsyncServiceRunner
 from gui.common.widgets import CustomButton
 from gui.common.styles import BACKGROUND_IMAGE_PATH, FONTS
 from gui.dialogs.add_book_dialog import AddBookDialog
@@ -35,6 +38,7 @@ from features.return_service import ReturnService
 from features.delete_service import DeleteService
 from features.egreso_service import EgresoService
 from features.finance_service import FinanceService
+from features.paged_search import BusquedaPaginada
 from gui.dialogs.search_results_window import SearchResultsWindow
 from gui.dialogs.delete_book_dialog import DeleteBookDialog
 from gui.dialogs.egreso_dialog import EgresoDialog
@@ -45,6 +49,9 @@ class VentanaGestionLibreria(QMainWindow):
     """
     Ventana principal de la aplicación de gestión de librería.
     """
+    # Resultados por página de las búsquedas (la búsqueda en vivo muestra la primera)
+    TAMANO_PAGINA_BUSQUEDA = 50
+
     def __init__(self):
         super().__init__()
         self.background_pixmap = QPixmap()
@@ -62,6 +69,11 @@ class VentanaGestionLibreria(QMainWindow):
         self.main_menu_content = None
         self.current_search_results_window = None
 
+        # Las búsquedas se hacen en segundo plano; una búsqueda nueva cancela la anterior
+        self.tareas = AsyncServiceRunner(self)
+        self._busqueda_cancelada: Optional[threading.Event] = None
+        self._busqueda_en_vivo: Optional[BusquedaPaginada] = None
+
         self._init_background()
         self._setup_main_menu()
         
@@ -87,6 +99,9 @@ class VentanaGestionLibreria(QMainWindow):
             self.main_menu_content = MenuSectionWidget()
             self.main_menu_content.action_triggered.connect(self._handle_menu_action)
             self.main_menu_content.search_requested.connect(self._iniciar_busqueda_desde_componente)
+            self.main_menu_content.live_search_requested.connect(self._buscar_en_vivo)
+            self.main_menu_content.live_search_cancelled.connect(self._cancelar_busqueda)
+            self.main_menu_content.live_result_selected.connect(self._iniciar_busqueda_desde_componente)
             self.root_layout_main_menu.addWidget(self.main_menu_content)
             self.root_layout_main_menu.addStretch(1)
             self.main_menu_widget.setStyleSheet("QWidget { background-color: #D32F2F; }")
@@ -106,6 +121,9 @@ class VentanaGestionLibreria(QMainWindow):
             self.main_menu_content = MenuSectionWidget()
             self.main_menu_content.action_triggered.connect(self._handle_menu_action)
             self.main_menu_content.search_requested.connect(self._iniciar_busqueda_desde_componente)
+            self.main_menu_content.live_search_requested.connect(self._buscar_en_vivo)
+            self.main_menu_content.live_search_cancelled.connect(self._cancelar_busqueda)
+            self.main_menu_content.live_result_selected.connect(self._iniciar_busqueda_desde_componente)
             self.root_layout_main_menu.addWidget(self.main_menu_content)
             self.root_layout_main_menu.addStretch(1)
             self.main_menu_widget.setStyleSheet("QWidget { background: transparent; }")
@@ -132,11 +150,94 @@ class VentanaGestionLibreria(QMainWindow):
             self.current_search_results_window.finished.connect(self.main_menu_content.show)
             self.current_search_results_window.finished.connect(self.title_label.show)
         
-    def _iniciar_busqueda_desde_componente(self, termino_busqueda: str, filtros: dict):
+    def _iniciar_busqueda_desde_componente(self, termino_busqueda: str, filtros: dict, fila_seleccionada: int = 0):
         if not termino_busqueda: return
 
-        libros_encontrados = self.book_service.buscar_libros_por_termino(termino_busqueda, filtros)
-        
+        resultados = self._busqueda_en_vivo
+        if resultados is not None and resultados.termino == termino_busqueda and resultados.filtros == filtros:
+            # La búsqueda en vivo ya contó los resultados y leyó la primera página
+            self._mostrar_resultados_busqueda(resultados, termino_busqueda, fila_seleccionada)
+            return
+
+        # Solo se cuentan los resultados y se lee la primera página; el resto se carga
+        # por páginas al mostrarlas. Todo en segundo plano: la GUI no espera a SQLite.
+        cancelado = self._nueva_busqueda()
+        self.tareas.submit(
+            self._preparar_busqueda, termino_busqueda, filtros, cancelado,
+            key="busqueda",
+            on_result=lambda libros: self._mostrar_resultados_busqueda(libros, termino_busqueda, fila_seleccionada),
+            on_error=self._on_error_busqueda
+        )
+
+    def _preparar_busqueda(self, termino: str, filtros: dict, cancelado: threading.Event) -> BusquedaPaginada:
+        """Se ejecuta en segundo plano: primera página y total de resultados."""
+        primera_pagina = self.book_service.buscar_libros(
+            termino, filtros, 0, self.TAMANO_PAGINA_BUSQUEDA, cancelado=cancelado
+        )
+        return self.book_service.paginar_busqueda(
+            termino, filtros, self.TAMANO_PAGINA_BUSQUEDA, primera_pagina=primera_pagina, cancelado=cancelado
+        )
+
+    def _nueva_busqueda(self) -> threading.Event:
+        """Interrumpe la consulta de la búsqueda anterior y devuelve el evento de cancelación de la nueva."""
+        self._cancelar_busqueda()
+        self._busqueda_cancelada = threading.Event()
+        return self._busqueda_cancelada
+
+    def _cancelar_busqueda(self):
+        if self._busqueda_cancelada is not None:
+            # SQLite aborta la consulta en curso en el hilo de fondo (ver SQLManager.consulta_cancelable)
+            self._busqueda_cancelada.set()
+            self._busqueda_cancelada = None
+        self.tareas.cancel("busqueda")
+        self._busqueda_en_vivo = None
+
+    def _buscar_en_vivo(self, termino: str, filtros: dict):
+        """
+        Búsqueda mientras se escribe, en dos pasos para que los resultados lleguen cuanto antes:
+        primero la primera página (se muestra en la barra de búsqueda) y después el total.
+        Cada tecla que cambia el término cancela la consulta que siga en curso.
+        """
+        cancelado = self._nueva_busqueda()
+        self.tareas.submit(
+            self.book_service.buscar_libros, termino, filtros, 0, self.TAMANO_PAGINA_BUSQUEDA,
+            cancelado=cancelado, key="busqueda",
+            on_result=lambda libros: self._on_primera_pagina_en_vivo(termino, filtros, libros, cancelado),
+            on_error=self._on_error_busqueda
+        )
+
+    def _on_primera_pagina_en_vivo(self, termino: str, filtros: dict, libros: list, cancelado: threading.Event):
+        if cancelado.is_set():
+            return
+        search_bar = self.main_menu_content.search_bar
+        if len(libros) < self.TAMANO_PAGINA_BUSQUEDA:
+            # La primera página ya trae todos los resultados: no hace falta contar
+            self._busqueda_en_vivo = self.book_service.paginar_busqueda(
+                termino, filtros, self.TAMANO_PAGINA_BUSQUEDA, primera_pagina=libros
+            )
+            search_bar.show_live_results(termino, libros, len(libros))
+            return
+
+        search_bar.show_live_results(termino, libros)
+        self.tareas.submit(
+            self.book_service.paginar_busqueda, termino, filtros, self.TAMANO_PAGINA_BUSQUEDA,
+            primera_pagina=libros, cancelado=cancelado, key="busqueda",
+            on_result=lambda resultados: self._on_total_en_vivo(resultados, cancelado),
+            on_error=self._on_error_busqueda
+        )
+
+    def _on_total_en_vivo(self, resultados: BusquedaPaginada, cancelado: threading.Event):
+        if cancelado.is_set():
+            return
+        self._busqueda_en_vivo = resultados
+        self.main_menu_content.search_bar.set_live_total(resultados.termino, resultados.total)
+
+    def _on_error_busqueda(self, error: Exception):
+        if isinstance(error, ConsultaCanceladaError):
+            return # La reemplazó una búsqueda más reciente
+        print(f"\033[1;31m❌ Error al buscar libros: {error}\033[0m")
+
+    def _mostrar_resultados_busqueda(self, libros_encontrados, termino_busqueda: str, fila_seleccionada: int = 0):
         if self.current_search_results_window is None:
             self.current_search_results_window = SearchResultsWindow(
                 libros_encontrados, 
@@ -146,12 +247,19 @@ class VentanaGestionLibreria(QMainWindow):
             self.current_search_results_window.finished.connect(self.main_menu_content.show)
             self.current_search_results_window.finished.connect(self.title_label.show)
         else:
-            self.current_search_results_window.update_results(libros_encontrados, termino_busqueda)
+            self.current_search_results_window.update_content(libros_encontrados, termino_busqueda, fila_seleccionada)
 
+        # Al volver al menú no se reutiliza esta búsqueda: el catálogo puede cambiar entretanto
+        self._descartar_busqueda_en_vivo()
         self.main_menu_content.hide()
         self.title_label.hide()
         self.current_search_results_window.show()
 
+    def _descartar_busqueda_en_vivo(self):
+        """Cancela la búsqueda en vivo, olvida su resultado y oculta la vista previa."""
+        self._cancelar_busqueda()
+        self.main_menu_content.search_bar.clear_live_results()
+
     def paintEvent(self, event):
         """Pinta la imagen de fondo, asegurando que cubra toda la ventana y mantenga la relación de aspecto."""
         if self.background_pixmap.isNull():
@@ -190,6 +298,8 @@ class VentanaGestionLibreria(QMainWindow):
 
     def _handle_menu_action(self, accion: str):
         accion_limpia = accion.strip()
+        # Los diálogos pueden cambiar el catálogo: la vista previa de la búsqueda quedaría desactualizada
+        self._descartar_busqueda_en_vivo()
 
         dialog_map = {
             "Agregar Libro": (AddBookDialog, self.book_service),
@@ -0,0 +1,39 @@
+import json
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+from core.data_manager import DataManager
+from core.schema_migrator import SchemaMigrator
+from core.sqlmanager import SQLManager
+
+SCHEMAS_PATH = os.path.join(RAIZ, "core", "schemas.json")
+
+
+@pytest.fixture
+def sql_manager(tmp_path):
+    """SQLManager sobre una base de datos vacía en un directorio temporal."""
+    manager = SQLManager(db_path=str(tmp_path))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def data_manager(sql_manager):
+    """DataManager sobre una base de datos con el esquema completo de schemas.json."""
+    with open(SCHEMAS_PATH, "r", encoding="utf-8") as f:
+        SchemaMigrator(sql_manager).aplicar(json.load(f))
+    return DataManager(sql_manager)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """QApplication sin pantalla (plataforma offscreen) para las pruebas de la interfaz."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
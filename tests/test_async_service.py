@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication, QThreadPool
+
+from gui.common.async_service import AsyncServiceRunner, TaskHandle
+
+
+@pytest.fixture
+def pool(qapp):
+    """Pool de un solo hilo, para controlar qué tarea está en curso y cuáles en cola."""
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    yield pool
+    pool.waitForDone(5000)
+
+
+class Bloqueo:
+    """Tarea que ocupa el único hilo del pool hasta que se llama a soltar()."""
+
+    def __init__(self, valor=None):
+        self.valor = valor
+        self.empezo = threading.Event()
+        self._soltar = threading.Event()
+
+    def __call__(self):
+        self.empezo.set()
+        self._soltar.wait(5)
+        return self.valor
+
+    def soltar(self):
+        self._soltar.set()
+
+
+def _esperar(pool):
+    """Espera a que el pool termine y entrega las señales pendientes al hilo de la GUI."""
+    assert pool.waitForDone(5000)
+    QCoreApplication.processEvents()
+
+
+def _ocupar(runner, bloqueo, **kwargs):
+    runner.submit(bloqueo, **kwargs)
+    assert bloqueo.empezo.wait(5)
+
+
+def test_task_handle():
+    handle = TaskHandle("clave", None, None)
+    assert handle.key == "clave"
+    assert not handle.cancelled
+    handle.cancel()
+    assert handle.cancelled
+
+
+def test_resultado_en_el_hilo_de_la_gui(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    recibidos = []
+    runner.submit(lambda a, b=0: a + b, 2, b=3,
+                  on_result=lambda r: recibidos.append((r, threading.current_thread())))
+    _esperar(pool)
+    assert recibidos == [(5, threading.main_thread())]
+
+
+def test_error_va_a_on_error(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    resultados, errores = [], []
+
+    def falla():
+        raise ValueError("sin conexión")
+
+    runner.submit(falla, on_result=resultados.append, on_error=errores.append)
+    _esperar(pool)
+    assert resultados == []
+    assert len(errores) == 1 and isinstance(errores[0], ValueError)
+
+
+def test_error_sin_on_error_se_imprime(pool, capsys):
+    runner = AsyncServiceRunner(pool=pool)
+    runner.submit(lambda: 1 / 0)
+    _esperar(pool)
+    assert "division by zero" in capsys.readouterr().out
+
+
+def test_clave_retira_de_la_cola_la_peticion_anterior(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    bloqueo = Bloqueo()
+    _ocupar(runner, bloqueo)
+    ejecutadas, recibidos = [], []
+
+    def buscar(termino):
+        ejecutadas.append(termino)
+        return termino
+
+    runner.submit(buscar, "fic", on_result=recibidos.append, key="buscar")
+    runner.submit(buscar, "ficciones", on_result=recibidos.append, key="buscar")
+    assert runner.is_running("buscar")
+    bloqueo.soltar()
+    _esperar(pool)
+
+    # La primera no llegó a ejecutarse
+    assert ejecutadas == ["ficciones"]
+    assert recibidos == ["ficciones"]
+    assert not runner.is_running("buscar")
+
+
+def test_clave_descarta_el_resultado_de_la_peticion_en_curso(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    antigua = Bloqueo("antigua")
+    recibidos = []
+    _ocupar(runner, antigua, on_result=recibidos.append, key="buscar")
+
+    runner.submit(lambda: "nueva", on_result=recibidos.append, key="buscar")
+    antigua.soltar()
+    _esperar(pool)
+
+    assert recibidos == ["nueva"]
+
+
+def test_otras_claves_no_se_cancelan(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    recibidos = []
+    runner.submit(lambda: "pagina 1", on_result=recibidos.append, key=("pagina", 1))
+    runner.submit(lambda: "pagina 2", on_result=recibidos.append, key=("pagina", 2))
+    _esperar(pool)
+    assert sorted(recibidos) == ["pagina 1", "pagina 2"]
+
+
+def test_cancelar_el_handle(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    bloqueo = Bloqueo()
+    _ocupar(runner, bloqueo)
+    ejecutadas, recibidos = [], []
+    handle = runner.submit(lambda: ejecutadas.append(1), on_result=recibidos.append)
+
+    handle.cancel()
+    bloqueo.soltar()
+    _esperar(pool)
+
+    # Cancelada antes de empezar: ni se ejecuta ni entrega resultado
+    assert ejecutadas == [] and recibidos == []
+
+
+def test_cancel_all(pool):
+    runner = AsyncServiceRunner(pool=pool)
+    en_curso = Bloqueo("en curso")
+    recibidos, errores, ejecutadas = [], [], []
+    _ocupar(runner, en_curso, on_result=recibidos.append, key="a")
+    runner.submit(lambda: ejecutadas.append("b"), on_result=recibidos.append, key="b")
+    runner.submit(lambda: ejecutadas.append("c"), on_result=recibidos.append, on_error=errores.append)
+
+    runner.cancel_all()
+    assert not runner.is_running("a") and not runner.is_running("b")
+    en_curso.soltar()
+    _esperar(pool)
+
+    assert ejecutadas == []
+    assert recibidos == [] and errores == []
+    assert runner._tareas == {}
@@ -0,0 +1,60 @@
+import pytest
+
+from core.interfaces import ApiSinRespuestaError, HttpClientInterface
+from core.models import BookMetadata
+from features.book_api import GoogleBooksApi
+
+ISBN = "9780000000001"
+
+
+class _Respuesta:
+    def __init__(self, datos):
+        self.datos = datos
+
+    def json(self):
+        return self.datos
+
+
+class HttpFalso(HttpClientInterface):
+    def __init__(self, datos=None, error=None):
+        self.datos = datos
+        self.error = error
+        self.peticiones = []
+
+    def get(self, url, params=None, timeout=None):
+        self.peticiones.append((url, params))
+        if self.error:
+            raise self.error
+        return _Respuesta(self.datos)
+
+
+def test_normaliza_la_respuesta_de_google_books():
+    http = HttpFalso({"totalItems": 1, "items": [{"volumeInfo": {
+        "title": "Ficciones", "authors": ["Jorge Luis Borges", "Otro"], "publisher": "Sur",
+        "categories": ["Cuentos"], "imageLinks": {"thumbnail": "http://img/1.jpg"},
+    }}]})
+
+    metadatos = GoogleBooksApi(http).obtener_metadatos(ISBN)
+
+    assert metadatos == BookMetadata(isbn=ISBN, titulo="Ficciones", autor="Jorge Luis Borges",
+                                     editorial="Sur", imagen_url="http://img/1.jpg", categorias=["Cuentos"])
+    # Solo se piden los campos que se usan, y un único resultado
+    _, params = http.peticiones[0]
+    assert params["fields"] == GoogleBooksApi.CAMPOS
+    assert params["maxResults"] == 1
+
+
+def test_campos_ausentes():
+    http = HttpFalso({"totalItems": 1, "items": [{"volumeInfo": {"title": "Ficciones", "categories": "Cuentos"}}]})
+    metadatos = GoogleBooksApi(http).obtener_metadatos(ISBN)
+    assert (metadatos.autor, metadatos.editorial, metadatos.imagen_url) == ("", "", "")
+    assert metadatos.categorias == ["Cuentos"]
+
+
+def test_isbn_desconocido():
+    assert GoogleBooksApi(HttpFalso({"totalItems": 0})).obtener_metadatos(ISBN) is None
+
+
+def test_sin_respuesta():
+    with pytest.raises(ApiSinRespuestaError):
+        GoogleBooksApi(HttpFalso(error=ConnectionError("sin red"))).obtener_metadatos(ISBN)
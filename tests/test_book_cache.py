@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from features.book_cache import BookInfoCache
+
+DATOS = {"ISBN": "9780000000001", "Título": "Ficciones", "Categorías": ["Cuentos"]}
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Controla time.time() dentro de la caché."""
+    class Reloj:
+        def __init__(self):
+            self.ahora = 1_000_000.0
+
+        def avanzar(self, segundos):
+            self.ahora += segundos
+
+    reloj = Reloj()
+    monkeypatch.setattr(time, "time", lambda: reloj.ahora)
+    return reloj
+
+
+@pytest.fixture
+def cache(data_manager):
+    return BookInfoCache(data_manager, ttl_segundos=100, ttl_no_encontrado_segundos=10)
+
+
+def test_guarda_y_devuelve_datos(cache, reloj):
+    assert cache.obtener("9780000000001") is None
+    cache.guardar("9780000000001", DATOS)
+    assert cache.obtener("9780000000001") == {"encontrado": True, "datos": DATOS}
+
+
+def test_entrada_caduca_tras_el_ttl(cache, reloj):
+    cache.guardar("9780000000001", DATOS)
+    reloj.avanzar(99)
+    assert cache.obtener("9780000000001") is not None
+    reloj.avanzar(1)
+    assert cache.obtener("9780000000001") is None
+
+
+def test_no_encontrado_con_ttl_mas_corto(cache, reloj):
+    cache.guardar("9780000000002", None)
+    assert cache.obtener("9780000000002") == {"encontrado": False, "datos": None}
+    reloj.avanzar(10)
+    assert cache.obtener("9780000000002") is None
+
+
+def test_permitir_expirado(cache, reloj):
+    cache.guardar("9780000000001", DATOS)
+    reloj.avanzar(1000)
+    assert cache.obtener("9780000000001") is None
+    assert cache.obtener("9780000000001", permitir_expirado=True) == {"encontrado": True, "datos": DATOS}
+
+
+def test_estadisticas(cache, reloj):
+    cache.guardar("9780000000001", DATOS)
+    cache.guardar("9780000000002", None)
+    cache.obtener("9780000000001")
+    cache.obtener("9780000000002")
+    cache.obtener("9780000000003")
+    # Las lecturas de entradas caducadas (sin conexión) no cuentan
+    cache.obtener("9780000000003", permitir_expirado=True)
+
+    assert cache.estadisticas() == {
+        "aciertos": 1, "aciertos_no_encontrado": 1, "fallos": 1, "tasa_aciertos": pytest.approx(2 / 3),
+    }
+
+
+def test_invalidar_y_limpiar_expirados(cache, reloj, data_manager):
+    cache.guardar("9780000000001", DATOS)
+    cache.guardar("9780000000002", None)
+    cache.invalidar("9780000000001")
+    assert cache.obtener("9780000000001") is None
+
+    reloj.avanzar(10)
+    cache.limpiar_expirados()
+    assert data_manager.fetch_query("SELECT COUNT(*) AS total FROM api_cache")[0]["total"] == 0
+
+
+def test_limpiar_expirados_con_margen(cache, reloj, data_manager):
+    cache.guardar("9780000000001", DATOS)   # caduca a los 100 s
+    cache.guardar("9780000000002", None)    # caduca a los 10 s
+
+    reloj.avanzar(60)
+    # La no encontrada caducó hace 50 s: con margen de 100 s se conserva
+    assert cache.limpiar_expirados(margen_segundos=100) == 0
+    reloj.avanzar(100)
+    assert cache.limpiar_expirados(margen_segundos=100) == 1
+    assert cache.obtener("9780000000001", permitir_expirado=True)["datos"] == DATOS
+    assert cache.limpiar_expirados() == 1
@@ -0,0 +1,261 @@
+import threading
+import time
+
+import pytest
+
+from core.interfaces import ApiSinRespuestaError, BookApiInterface
+from core.models import BookMetadata
+from features.book_cache import BookInfoCache
+from features.book_info import GetBookInfo
+
+ISBN = "9780000000001"
+
+
+class ApiFalsa(BookApiInterface):
+    """
+    API de prueba: responde 'metadatos' tras 'demora' segundos, o lanza 'error'.
+    Con 'bloqueo' no responde hasta que se activa el evento (una API colgada).
+    """
+
+    def __init__(self, metadatos=None, demora=0.0, error=None, es_local=False, bloqueo=None):
+        self.metadatos = metadatos
+        self.demora = demora
+        self.bloqueo = bloqueo
+        self.error = error
+        self.es_local = es_local
+        self.consultas = []
+
+    def obtener_metadatos(self, isbn):
+        self.consultas.append(isbn)
+        if self.demora:
+            time.sleep(self.demora)
+        if self.bloqueo:
+            self.bloqueo.wait(5)
+        if self.error:
+            raise self.error
+        return self.metadatos
+
+
+def _meta(titulo="", autor="", editorial="", imagen_url="", categorias=None):
+    return BookMetadata(isbn=ISBN, titulo=titulo, autor=autor, editorial=editorial,
+                        imagen_url=imagen_url, categorias=categorias or [])
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        GetBookInfo([], modo="aleatorio")
+
+
+def test_secuencial_se_detiene_en_la_primera_que_conoce_el_libro():
+    sin_datos, con_datos, ultima = ApiFalsa(), ApiFalsa(_meta("Ficciones")), ApiFalsa(_meta("Otro"))
+    servicio = GetBookInfo([sin_datos, con_datos, ultima])
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Ficciones"
+    assert ultima.consultas == []
+
+
+def test_secuencial_salta_las_apis_que_fallan():
+    servicio = GetBookInfo([ApiFalsa(error=ApiSinRespuestaError("caída")), ApiFalsa(_meta("Ficciones"))])
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Ficciones"
+
+
+def test_primero_devuelve_la_respuesta_mas_rapida():
+    lenta = ApiFalsa(_meta("Lenta"), demora=0.5)
+    rapida = ApiFalsa(_meta("Rápida"))
+    servicio = GetBookInfo([lenta, rapida], modo="primero", plazo_segundos=5)
+
+    inicio = time.monotonic()
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Rápida"
+    assert time.monotonic() - inicio < 0.4
+
+
+def test_primero_consulta_antes_las_apis_locales():
+    remota = ApiFalsa(_meta("Remota"))
+    local = ApiFalsa(_meta("Local"), es_local=True)
+    servicio = GetBookInfo([remota, local], modo="primero")
+
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Local"
+    assert remota.consultas == []
+
+
+def test_primero_sale_a_la_red_si_la_local_no_conoce_el_libro():
+    servicio = GetBookInfo([ApiFalsa(es_local=True), ApiFalsa(_meta("Remota"))], modo="primero")
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Remota"
+
+
+def test_fusion_combina_por_prioridad():
+    principal = ApiFalsa(_meta("Ficciones", autor="Borges"), demora=0.1)
+    secundaria = ApiFalsa(_meta("Ficciones (otra edición)", editorial="Sur", categorias=["Cuentos"]))
+    servicio = GetBookInfo([principal, secundaria], modo="fusion", plazo_segundos=5)
+
+    detalles = servicio.extraer_info_json(ISBN)
+
+    # Gana la primera de la lista aunque responda después; la otra completa lo que falta
+    assert (detalles["Título"], detalles["Autor"], detalles["Editorial"]) == ("Ficciones", "Borges", "Sur")
+    assert detalles["Categorías"] == ["Cuentos"]
+
+
+def test_plazo_abandona_las_apis_rezagadas():
+    bloqueo = threading.Event()
+    servicio = GetBookInfo([ApiFalsa(_meta("Colgada"), bloqueo=bloqueo), ApiFalsa(_meta("A tiempo"))], modo="fusion", plazo_segundos=0.2)
+    try:
+        inicio = time.monotonic()
+        assert servicio.extraer_info_json(ISBN)["Título"] == "A tiempo"
+        assert time.monotonic() - inicio < 1.0
+    finally:
+        bloqueo.set()
+
+
+def test_plazo_agotado_sin_respuestas():
+    bloqueo = threading.Event()
+    servicio = GetBookInfo([ApiFalsa(bloqueo=bloqueo), ApiFalsa(error=ApiSinRespuestaError("caída"))], modo="primero", plazo_segundos=0.2)
+    try:
+        assert servicio._try_apis(ISBN) is None
+    finally:
+        bloqueo.set()
+
+
+@pytest.mark.parametrize("modo", GetBookInfo.MODOS)
+def test_distingue_no_encontrado_de_sin_respuesta(modo):
+    assert GetBookInfo([ApiFalsa(), ApiFalsa()], modo=modo)._try_apis(ISBN) == []
+    caidas = [ApiFalsa(error=ApiSinRespuestaError("caída")), ApiFalsa(error=ConnectionError("sin red"))]
+    assert GetBookInfo(caidas, modo=modo)._try_apis(ISBN) is None
+
+
+# --- Lotes ---
+
+class ApiContadora(BookApiInterface):
+    """API de prueba que registra cuántas consultas hay en curso a la vez."""
+
+    def __init__(self, demora=0.05):
+        self.demora = demora
+        self.consultas = []
+        self.en_curso = 0
+        self.max_en_curso = 0
+        self._lock = threading.Lock()
+
+    def obtener_metadatos(self, isbn):
+        with self._lock:
+            self.consultas.append(isbn)
+            self.en_curso += 1
+            self.max_en_curso = max(self.max_en_curso, self.en_curso)
+        time.sleep(self.demora)
+        with self._lock:
+            self.en_curso -= 1
+        return None if isbn.endswith("0") else BookMetadata(isbn=isbn, titulo=f"Libro {isbn}")
+
+
+def test_lote_sin_repetidos_en_orden_y_con_limite_de_hilos():
+    api = ApiContadora()
+    servicio = GetBookInfo([api])
+    isbns = [f"97800000000{i:02d}" for i in range(1, 13)]
+    progreso = []
+
+    resultados = servicio.extraer_info_batch(isbns + isbns[:3] + [" ", ""], max_hilos=3,
+                                             progreso=lambda hechos, total, isbn: progreso.append((hechos, total)))
+
+    assert list(resultados) == isbns
+    assert sorted(api.consultas) == isbns
+    assert api.max_en_curso <= 3
+    assert resultados["9780000000010"] is None
+    assert resultados["9780000000011"]["Título"] == "Libro 9780000000011"
+    assert progreso == [(i, 12) for i in range(1, 13)]
+
+
+def test_lote_resuelve_desde_la_cache_sin_red(data_manager):
+    api = ApiContadora(demora=0)
+    servicio = GetBookInfo([api], cache=BookInfoCache(data_manager))
+    isbns = ["9780000000001", "9780000000010"]
+    primera = servicio.extraer_info_batch(isbns)
+
+    assert servicio.extraer_info_batch(isbns) == primera
+    # El "no encontrado" también queda en la caché
+    assert len(api.consultas) == 2
+
+
+def test_lotes_reutilizan_el_executor():
+    servicio = GetBookInfo([ApiContadora(demora=0)])
+    servicio.extraer_info_batch(["9780000000001"], max_hilos=2)
+    executor = servicio._executor_lotes
+    servicio.extraer_info_batch(["9780000000002"], max_hilos=2)
+    assert servicio._executor_lotes is executor
+
+    servicio.extraer_info_batch(["9780000000003"], max_hilos=4)
+    assert servicio._executor_lotes is not executor
+    assert executor._shutdown
+
+
+def test_lote_en_paralelo_no_espera_turno_contra_el_plazo():
+    # 8 ISBN a la vez, dos APIs cada uno: las 16 consultas caben en el executor del
+    # lote, así que ninguna hace cola y todas responden dentro del plazo
+    apis = [ApiContadora(demora=0.3), ApiContadora(demora=0.3)]
+    servicio = GetBookInfo(apis, modo="fusion", plazo_segundos=0.6)
+    isbns = [f"97800000000{i:02d}" for i in range(1, 9)]
+    resultados = servicio.extraer_info_batch(isbns, max_hilos=8)
+
+    assert all(resultados[isbn]["Título"] == f"Libro {isbn}" for isbn in isbns)
+    assert apis[0].max_en_curso == 8
+    # Las consultas sueltas no comparten hilos con los lotes
+    assert servicio._executor._max_workers == 4
+
+
+def test_executor_unico_con_consultas_desde_varios_hilos():
+    servicio = GetBookInfo([ApiFalsa(_meta("Ficciones")), ApiFalsa(_meta("Ficciones"))], modo="fusion")
+    executor = servicio._executor
+    hilos = [threading.Thread(target=servicio.extraer_info_json, args=(ISBN,)) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert servicio._executor is executor
+
+
+# --- Sin respuesta de las APIs ---
+
+def test_sin_respuesta_como_error():
+    servicio = GetBookInfo([ApiFalsa(error=ApiSinRespuestaError("caída"))])
+    assert servicio.extraer_info_json(ISBN) is None
+    with pytest.raises(ApiSinRespuestaError):
+        servicio.extraer_info_json(ISBN, sin_respuesta_como_error=True)
+    # Que no exista el libro no es un error
+    assert GetBookInfo([ApiFalsa()]).extraer_info_json(ISBN, sin_respuesta_como_error=True) is None
+
+
+def test_sin_respuesta_usa_la_entrada_caducada(data_manager):
+    cache = BookInfoCache(data_manager, ttl_segundos=-1)
+    api = ApiFalsa(_meta("Ficciones"))
+    servicio = GetBookInfo([api], cache=cache)
+    assert servicio.extraer_info_json(ISBN)["Título"] == "Ficciones"
+
+    api.error = ApiSinRespuestaError("caída")
+
+    assert servicio.extraer_info_json(ISBN, sin_respuesta_como_error=True)["Título"] == "Ficciones"
+    assert len(api.consultas) == 2
+
+
+# --- Fusión de metadatos ---
+
+def test_fusionar_gana_la_primera_y_completa_lo_vacio():
+    principal = _meta("Ficciones", autor="Borges")
+    secundaria = _meta("Otro título", autor="Otro autor", editorial="Sur", categorias=["Cuentos"])
+    tercera = _meta(editorial="Emecé", imagen_url="http://img/1.jpg", categorias=["Ficción"])
+
+    fusion = GetBookInfo._fusionar([principal, secundaria, tercera])
+
+    assert fusion == BookMetadata(isbn=ISBN, titulo="Ficciones", autor="Borges", editorial="Sur",
+                                  imagen_url="http://img/1.jpg", categorias=["Cuentos"])
+
+
+def test_fusionar_no_modifica_las_respuestas():
+    principal = _meta("Ficciones")
+    secundaria = _meta(autor="Borges", categorias=["Cuentos"])
+
+    fusion = GetBookInfo._fusionar([principal, secundaria])
+    fusion.categorias.append("Otra")
+
+    assert principal == _meta("Ficciones")
+    assert secundaria.categorias == ["Cuentos"]
+
+
+def test_fusionar_una_sola_respuesta():
+    unica = _meta("Ficciones", categorias=["Cuentos"])
+    assert GetBookInfo._fusionar([unica]) == unica
@@ -0,0 +1,100 @@
+import sqlite3
+
+import pytest
+
+from features.book_service import BookService
+
+
+def _libro(isbn, titulo, autor="", editorial="", categorias=None):
+    return {"ISBN": isbn, "Título": titulo, "Autor": autor, "Editorial": editorial,
+            "Imagen": "", "Categorías": categorias or [], "Precio": 10000}
+
+
+@pytest.fixture
+def book_service(data_manager):
+    servicio = BookService(data_manager, book_info_service=None)
+    for libro in (
+        _libro("9780000000001", "Cien años de soledad", "Gabriel García Márquez", "Sudamericana", ["Novela"]),
+        _libro("9780000000002", 'El "otro" cuento', "Jorge Luis Borges", "Emecé"),
+        _libro("9780000000003", "Ficciones", "Jorge Luis Borges", "Sur", ["Cuentos"]),
+    ):
+        assert servicio.guardar_libro(libro)[0]
+    return servicio
+
+
+def test_consulta_fts_por_prefijo():
+    assert BookService._construir_consulta_fts("garc  marq", ["titulo", "autor"]) == '{titulo autor} : ("garc"* "marq"*)'
+
+
+def test_consulta_fts_escapa_comillas():
+    assert BookService._construir_consulta_fts('el "otro', ["titulo"]) == '{titulo} : ("el"* """otro"*)'
+
+
+def test_consulta_fts_vacia():
+    assert BookService._construir_consulta_fts("   ", ["titulo"]) == ""
+
+
+@pytest.mark.parametrize("termino", ['"', 'borges"', "AND", "NOT borges", "autor:borges", "bor*", "(", "a OR b", "-x", "^x"])
+def test_sintaxis_fts5_del_usuario_no_rompe_la_busqueda(book_service, termino):
+    if not book_service._usar_fts():
+        pytest.skip("SQLite sin FTS5")
+    # Cualquier texto se busca como palabras literales: nunca un error de sintaxis de MATCH
+    assert isinstance(book_service.buscar_libros(termino), list)
+
+
+def test_busqueda_fts_sin_tildes_y_por_prefijo(book_service):
+    if not book_service._usar_fts():
+        pytest.skip("SQLite sin FTS5")
+    assert [l["ISBN"] for l in book_service.buscar_libros("garcia marq")] == ["9780000000001"]
+    assert [l["ISBN"] for l in book_service.buscar_libros('"otro')] == ["9780000000002"]
+    assert {l["ISBN"] for l in book_service.buscar_libros("borg", {"autor": True})} == {"9780000000002", "9780000000003"}
+    assert book_service.buscar_libros("borges", {"titulo": True}) == []
+
+
+def test_busqueda_por_isbn(book_service):
+    assert [l["Título"] for l in book_service.buscar_libros("9780000000003")] == ["Ficciones"]
+
+
+@pytest.mark.parametrize("fts", [True, False], ids=["fts", "like"])
+def test_parte_de_un_isbn_se_busca_por_subcadena(book_service, fts):
+    if fts and not book_service._usar_fts():
+        pytest.skip("SQLite sin FTS5")
+    book_service._fts_disponible = fts
+    assert book_service.guardar_libro(_libro("978-84-376-0494-7", "Rayuela"))[0]
+    # Dígitos del medio del ISBN, con o sin guiones: FTS5 solo encontraría prefijos
+    assert [l["ISBN"] for l in book_service.buscar_libros("00000002")] == ["9780000000002"]
+    assert [l["ISBN"] for l in book_service.buscar_libros("0-0000-0002")] == ["9780000000002"]
+    assert [l["Título"] for l in book_service.buscar_libros("8437604947")] == ["Rayuela"]
+    assert book_service.contar_libros("000000000") == 3
+
+
+def test_termino_con_forma_de_isbn():
+    assert BookService._isbn_de_termino(" 978-84 ") == "97884"
+    assert BookService._isbn_de_termino("0-306-40615-x") == "030640615X"
+    assert BookService._isbn_de_termino("1984") == "1984"
+    for termino in ("borges", "X", "97X8", "ficciones 2", ""):
+        assert BookService._isbn_de_termino(termino) == ""
+
+
+def test_busqueda_like_sin_fts(book_service):
+    book_service._fts_disponible = False
+    assert [l["ISBN"] for l in book_service.buscar_libros("SOLEDAD")] == ["9780000000001"]
+    assert [l["ISBN"] for l in book_service.buscar_libros("márquez", {"autor": True})] == ["9780000000001"]
+    assert book_service.contar_libros("borges") == 2
+
+
+def test_escritura_externa_sin_normalize(book_service, sql_manager):
+    # Una conexión sin la función normalize() (otra herramienta, el CLI de sqlite3...)
+    # puede escribir en libros; el backfill completa después sus columnas *_norm.
+    externa = sqlite3.connect(sql_manager.db_path)
+    try:
+        externa.execute("INSERT INTO libros (isbn, titulo, autor) VALUES ('9780000000009', 'Rayuela', 'Julio Cortázar')")
+        externa.execute("UPDATE libros SET titulo = 'Ficciones (ed. bolsillo)' WHERE isbn = '9780000000003'")
+        externa.commit()
+    finally:
+        externa.close()
+
+    assert sql_manager.rellenar_columnas_normalizadas() == 4
+    book_service._fts_disponible = False
+    assert [l["ISBN"] for l in book_service.buscar_libros("cortazar")] == ["9780000000009"]
+    assert [l["ISBN"] for l in book_service.buscar_libros("bolsillo")] == ["9780000000003"]
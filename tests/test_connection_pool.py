@@ -0,0 +1,92 @@
+import gc
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.connection_pool import SQLiteConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close_all()
+
+
+def _en_otro_hilo(funcion):
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(funcion()))
+    hilo.start()
+    hilo.join()
+    return resultado[0]
+
+
+def _cerrada(conn):
+    try:
+        conn.execute("SELECT 1")
+    except sqlite3.ProgrammingError:
+        return True
+    return False
+
+
+def test_una_conexion_por_hilo_en_modo_wal(pool):
+    conn = pool.get()
+    assert pool.get() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    # FULL: un commit confirmado sobrevive a un corte de energía
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert _en_otro_hilo(pool.get) is not conn
+
+
+def test_conexion_de_hilo_terminado_se_cierra_desde_otro_hilo(pool):
+    pool.get()
+    ajena = _en_otro_hilo(pool.get)
+    gc.collect()
+
+    # El hilo que terminó no la cierra: la aparta para el siguiente que use el pool
+    assert ajena in pool._por_cerrar
+    assert not _cerrada(ajena)
+
+    pool.get()
+
+    assert pool._por_cerrar == []
+    assert _cerrada(ajena)
+    assert len(pool._connections) == 1
+
+
+def test_executor_no_acumula_conexiones(pool):
+    for _ in range(5):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: pool.get().execute("SELECT 1").fetchone(), range(20)))
+        gc.collect()
+        pool.get()
+    assert len(pool._connections) == 1
+    assert pool._por_cerrar == []
+
+
+def test_release_cierra_la_conexion_del_hilo(pool):
+    def trabajar_y_liberar():
+        conn = pool.get()
+        pool.release()
+        return conn
+
+    conn = _en_otro_hilo(trabajar_y_liberar)
+    gc.collect()
+
+    assert _cerrada(conn)
+    assert pool._connections == []
+    assert pool._por_cerrar == []
+    # Tras release() el hilo puede volver a pedir una conexión nueva
+    nueva = pool.get()
+    pool.release()
+    assert _cerrada(nueva)
+
+
+def test_close_all(pool):
+    propia = pool.get()
+    ajena = _en_otro_hilo(pool.get)
+    pool.close_all()
+    assert _cerrada(propia) and _cerrada(ajena)
+    assert not _cerrada(pool.get())
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+from gui.components.image_manager import shared_image_manager
+
+IMAGE_LOADED = "2image_loaded(QString,QString,QPixmap)"
+IMAGE_FAILED = "2image_failed(QString)"
+
+
+def _receptores(gestor):
+    return gestor.receivers(IMAGE_LOADED), gestor.receivers(IMAGE_FAILED)
+
+
+def test_eliminar_libro_desconecta_las_portadas_al_cerrar(qapp):
+    from gui.dialogs.delete_book_dialog import DeleteBookDialog
+
+    gestor = shared_image_manager()
+    antes = _receptores(gestor)
+    dialogo = DeleteBookDialog(delete_service=None)
+    assert _receptores(gestor) == (antes[0] + 1, antes[1] + 1)
+
+    dialogo.reject()
+    assert _receptores(gestor) == antes
+    dialogo.done(0)  # Una segunda vez no falla
+    assert _receptores(gestor) == antes
+
+
+@pytest.mark.parametrize("modo", ["ADD", "MODIFY"])
+def test_formulario_desconecta_las_portadas_al_cerrar(qapp, modo):
+    from gui.dialogs.book_form_dialog import BookFormDialog
+
+    gestor = shared_image_manager()
+    antes = _receptores(gestor)
+    dialogo = BookFormDialog(book_service=None, mode=modo)
+    assert _receptores(gestor) == (antes[0] + 1, antes[1] + 1)
+
+    dialogo.reject()
+    assert _receptores(gestor) == antes
+    dialogo.done(0)
+    assert _receptores(gestor) == antes
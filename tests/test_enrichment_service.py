@@ -0,0 +1,145 @@
+import time
+
+import pytest
+
+from core.interfaces import ApiSinRespuestaError
+from features.book_service import BookService
+from features.enrichment_service import TITULO_PENDIENTE, EnrichmentService
+
+ISBN = "9780000000001"
+DATOS = {"ISBN": ISBN, "Título": "Cien años de soledad", "Autor": "Gabriel García Márquez",
+         "Editorial": "Sudamericana", "Imagen": "http://img/1.jpg", "Categorías": ["Novela"]}
+
+
+class BookInfoFalso:
+    """Sustituye a GetBookInfo: devuelve (o lanza) la respuesta configurada para cada ISBN."""
+
+    def __init__(self):
+        self.respuestas = {}
+        self.consultas = []
+
+    def extraer_info_json(self, isbn, sin_respuesta_como_error=False):
+        self.consultas.append(isbn)
+        respuesta = self.respuestas.get(isbn)
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Controla time.time(), con el que la cola programa los reintentos."""
+    class Reloj:
+        def __init__(self):
+            self.ahora = 1_000_000.0
+
+        def avanzar(self, segundos):
+            self.ahora += segundos
+
+    reloj = Reloj()
+    monkeypatch.setattr(time, "time", lambda: reloj.ahora)
+    return reloj
+
+
+@pytest.fixture
+def book_info():
+    return BookInfoFalso()
+
+
+@pytest.fixture
+def servicios(data_manager, book_info):
+    enrichment = EnrichmentService(data_manager, book_info, peticiones_por_minuto=0, max_intentos=3,
+                                   espera_sin_respuesta_segundos=300)
+    book_service = BookService(data_manager, book_info, enrichment_service=enrichment)
+    assert book_service.guardar_libro({"ISBN": ISBN, "Título": "", "Precio": 15000})[0]
+    return enrichment, book_service
+
+
+def _cola(data_manager):
+    return {f["isbn"]: f for f in data_manager.fetch_query("SELECT * FROM enrichment_queue")}
+
+
+def test_libro_sin_titulo_se_encola_y_se_completa(servicios, book_info, data_manager, reloj):
+    enrichment, book_service = servicios
+    assert enrichment.pendientes() == 1
+    assert book_service.buscar_libro_por_isbn(ISBN)["book_details"]["Título"] == TITULO_PENDIENTE
+
+    book_info.respuestas[ISBN] = DATOS
+    assert enrichment.procesar_lote() == 1
+
+    assert enrichment.pendientes() == 0
+    libro = data_manager.fetch_query("SELECT * FROM libros WHERE isbn = ?", (ISBN,))[0]
+    assert (libro["titulo"], libro["autor"], libro["categorias"]) == ("Cien años de soledad", "Gabriel García Márquez", "Novela")
+    # Las columnas de búsqueda sin tildes se actualizan con los datos nuevos
+    assert (libro["titulo_norm"], libro["autor_norm"]) == ("cien anos de soledad", "gabriel garcia marquez")
+
+
+def test_no_pisa_lo_escrito_a_mano(servicios, book_info, data_manager, reloj):
+    enrichment, _ = servicios
+    data_manager.execute_query("UPDATE libros SET autor = 'G. G. Márquez' WHERE isbn = ?", (ISBN,))
+    book_info.respuestas[ISBN] = DATOS
+    enrichment.procesar_lote()
+
+    libro = data_manager.fetch_query("SELECT titulo, autor FROM libros WHERE isbn = ?", (ISBN,))[0]
+    assert (libro["titulo"], libro["autor"]) == ("Cien años de soledad", "G. G. Márquez")
+
+
+def test_no_encontrado_se_reintenta_con_espera_creciente(servicios, book_info, data_manager, reloj):
+    enrichment, _ = servicios
+    inicio = reloj.ahora
+    enrichment.procesar_lote()
+    fila = _cola(data_manager)[ISBN]
+    assert fila["intentos"] == 1
+    assert fila["proximo_intento"] == inicio + 60
+    assert fila["ultimo_error"] == "no encontrado"
+
+    # Antes de que venza el reintento no se vuelve a consultar
+    reloj.avanzar(59)
+    assert enrichment.procesar_lote() == 0
+
+    reloj.avanzar(1)
+    assert enrichment.procesar_lote() == 1
+    assert _cola(data_manager)[ISBN]["proximo_intento"] == reloj.ahora + 120
+
+
+def test_se_retira_tras_max_intentos(servicios, book_info, data_manager, reloj):
+    enrichment, _ = servicios
+    for _ in range(3):
+        assert enrichment.procesar_lote() == 1
+        reloj.avanzar(24 * 3600)
+
+    assert enrichment.pendientes() == 0
+    assert len(book_info.consultas) == 3
+    # El libro se conserva, solo sale de la cola
+    assert data_manager.fetch_query("SELECT COUNT(*) AS total FROM libros")[0]["total"] == 1
+
+
+def test_sin_respuesta_no_gasta_intentos(servicios, book_info, data_manager, reloj):
+    enrichment, _ = servicios
+    book_info.respuestas[ISBN] = ApiSinRespuestaError("sin conexión")
+
+    for _ in range(10):
+        assert enrichment.procesar_lote() == 1
+        fila = _cola(data_manager)[ISBN]
+        assert fila["intentos"] == 0
+        assert fila["proximo_intento"] == reloj.ahora + 300
+        assert fila["ultimo_error"] == "sin conexión"
+        reloj.avanzar(300)
+
+    # Cuando la red vuelve, el libro se completa
+    book_info.respuestas[ISBN] = DATOS
+    assert enrichment.procesar_lote() == 1
+    assert enrichment.pendientes() == 0
+
+
+def test_hilo_en_segundo_plano(servicios, book_info, data_manager):
+    enrichment, _ = servicios
+    book_info.respuestas[ISBN] = DATOS
+    enrichment.iniciar()
+    try:
+        limite = time.monotonic() + 5
+        while enrichment.pendientes() and time.monotonic() < limite:
+            time.sleep(0.01)
+    finally:
+        enrichment.detener()
+    assert enrichment.pendientes() == 0
@@ -0,0 +1,122 @@
+import csv
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def numeros(sql_manager):
+    sql_manager.execute_query("CREATE TABLE numeros (n INTEGER PRIMARY KEY, texto TEXT)")
+    sql_manager.execute_many("INSERT INTO numeros VALUES (?, ?)", [(n, f"fila {n}") for n in range(1, 8)])
+    return sql_manager
+
+
+@pytest.fixture
+def pasos(numeros):
+    """Función SQL que cuenta las filas que SQLite ya produjo (se evalúa en cada paso)."""
+    contador = {"filas": 0}
+
+    def contar(valor):
+        contador["filas"] += 1
+        return valor
+
+    numeros.conn.create_function("contar", 1, contar)
+    return contador
+
+
+@pytest.mark.parametrize("total, batch_size", [(0, 3), (3, 3), (6, 3), (7, 3), (7, 1), (7, 100)])
+def test_devuelve_todas_las_filas_en_cualquier_lote(numeros, total, batch_size):
+    filas = list(numeros.fetch_iter("SELECT n FROM numeros WHERE n <= ? ORDER BY n", (total,), batch_size=batch_size))
+    assert [f["n"] for f in filas] == list(range(1, total + 1))
+
+
+def test_lee_de_sqlite_un_lote_cada_vez(numeros, pasos):
+    filas = numeros.fetch_iter("SELECT contar(n) AS n FROM numeros", batch_size=3)
+    assert pasos["filas"] == 0  # Nada se lee hasta empezar a iterar
+
+    leidas_por_fila = []
+    for _ in filas:
+        leidas_por_fila.append(pasos["filas"])
+
+    # Las filas 1-3 salen del primer lote, 4-6 del segundo y la 7 del último
+    # (el cursor de sqlite3 siempre tiene leída una fila más de las que entregó)
+    assert leidas_por_fila == [4, 4, 4, 7, 7, 7, 7]
+
+
+@pytest.mark.parametrize("formato, esperado", [
+    ("dict", {"n": 1, "texto": "fila 1"}),
+    ("tuple", (1, "fila 1")),
+])
+def test_formatos(numeros, formato, esperado):
+    primera = next(numeros.fetch_iter("SELECT n, texto FROM numeros ORDER BY n", formato=formato))
+    assert primera == esperado
+    assert type(primera) is type(esperado)
+
+
+def test_formato_row(numeros):
+    primera = next(numeros.fetch_iter("SELECT n, texto FROM numeros ORDER BY n", formato="row"))
+    assert isinstance(primera, sqlite3.Row)
+    assert (primera["texto"], primera[0]) == ("fila 1", 1)
+
+
+def test_formato_tuple_no_cambia_la_conexion(numeros):
+    list(numeros.fetch_iter("SELECT n FROM numeros", formato="tuple"))
+    assert numeros.fetch_query("SELECT n FROM numeros WHERE n = 1") == [{"n": 1}]
+
+
+def test_formato_no_soportado(numeros):
+    # Se valida al llamar, no al empezar a iterar
+    with pytest.raises(ValueError):
+        numeros.fetch_iter("SELECT n FROM numeros", formato="lista")
+
+
+def test_error_a_mitad_de_la_lectura(numeros):
+    numeros.conn.create_function("fallar", 1, lambda n: 1 // (4 - n))
+    consulta = "SELECT fallar(n) AS x FROM numeros ORDER BY n"
+    # Fuera de una transacción el error se informa y la iteración termina
+    assert len(list(numeros.fetch_iter(consulta, batch_size=2))) == 2
+    with pytest.raises(sqlite3.Error):
+        with numeros.transaction():
+            list(numeros.fetch_iter(consulta, batch_size=2))
+
+
+# --- Exportación a CSV ---
+
+def test_exportar_hoja_csv(numeros, tmp_path):
+    numeros.execute_query("INSERT INTO numeros VALUES (8, ?)", ('con "comillas", comas\\ny salto',))
+    ruta = str(tmp_path / "numeros.csv")
+
+    assert numeros.exportar_hoja_csv("numeros", ruta, tamano_lote=3) == 8
+
+    with open(ruta, encoding="utf-8", newline="") as archivo:
+        filas = list(csv.reader(archivo))
+    assert filas[0] == ["n", "texto"]
+    assert filas[1] == ["1", "fila 1"]
+    assert filas[-1] == ["8", 'con "comillas", comas\\ny salto']
+    assert len(filas) == 9
+
+
+def test_exportar_tabla_vacia_o_inexistente(sql_manager, tmp_path):
+    sql_manager.execute_query("CREATE TABLE vacia (a TEXT, b INTEGER)")
+    assert sql_manager.exportar_hoja_csv("vacia", str(tmp_path / "vacia.csv")) == 0
+    assert (tmp_path / "vacia.csv").read_text(encoding="utf-8").splitlines() == ["a,b"]
+
+    assert sql_manager.exportar_hoja_csv("no_existe", str(tmp_path / "no_existe.csv")) == -1
+    assert sql_manager.exportar_hoja_csv("libros; DROP TABLE vacia", str(tmp_path / "x.csv")) == -1
+    assert not (tmp_path / "no_existe.csv").exists()
+
+
+def test_exportacion_fallida_no_deja_archivo(numeros, tmp_path):
+    numeros.conn.create_function("fallar", 1, lambda n: 1 // (4 - n))
+    numeros.execute_query("CREATE VIEW falla AS SELECT fallar(n) AS x FROM numeros")
+    ruta = tmp_path / "falla.csv"
+
+    assert numeros.exportar_hoja_csv("falla", str(ruta), tamano_lote=2) == -1
+    assert not ruta.exists()
+    assert not (tmp_path / "falla.csv.tmp").exists()
+
+
+def test_exportar_desde_data_manager(data_manager, tmp_path):
+    ruta = str(tmp_path / "libros.csv")
+    assert data_manager.exportar_hoja_csv("libros", ruta) == 0
+    assert open(ruta, encoding="utf-8").readline().startswith("isbn,titulo,")
@@ -0,0 +1,188 @@
+import time
+
+import pytest
+import requests
+
+from core import http_client
+from core.http_client import CircuitoAbiertoError, RequestsClient, _CircuitBreaker
+
+URL = "https://api.ejemplo.com/libros"
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Controla time.monotonic() y hace instantáneas las esperas entre reintentos."""
+    class Reloj:
+        def __init__(self):
+            self.ahora = 1000.0
+            self.esperas = []
+
+        def avanzar(self, segundos):
+            self.ahora += segundos
+
+    reloj = Reloj()
+    monkeypatch.setattr(time, "monotonic", lambda: reloj.ahora)
+    monkeypatch.setattr(time, "sleep", reloj.esperas.append)
+    return reloj
+
+
+class _Respuesta:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+
+def _cliente(respuestas, **kwargs):
+    """RequestsClient cuya sesión devuelve (o lanza) las respuestas dadas, en orden."""
+    cliente = RequestsClient(**kwargs)
+    pendientes = list(respuestas)
+    cliente.llamadas = 0
+
+    def get(url, params=None, timeout=None):
+        cliente.llamadas += 1
+        respuesta = pendientes.pop(0)
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+    cliente.session.get = get
+    return cliente
+
+
+# --- _CircuitBreaker ---
+
+def test_circuito_se_abre_tras_el_umbral(reloj):
+    circuito = _CircuitBreaker(umbral_fallos=3, enfriamiento_segundos=30)
+    for _ in range(2):
+        circuito.registrar_fallo()
+        assert circuito.permitir()
+    circuito.registrar_fallo()
+    assert circuito.abierto
+    assert not circuito.permitir()
+
+
+def test_exito_reinicia_los_fallos(reloj):
+    circuito = _CircuitBreaker(umbral_fallos=2, enfriamiento_segundos=30)
+    circuito.registrar_fallo()
+    circuito.registrar_exito()
+    circuito.registrar_fallo()
+    assert not circuito.abierto
+    assert circuito.permitir()
+
+
+def test_semiabierto_deja_pasar_una_sola_prueba(reloj):
+    circuito = _CircuitBreaker(umbral_fallos=1, enfriamiento_segundos=30)
+    circuito.registrar_fallo()
+    reloj.avanzar(29)
+    assert not circuito.permitir()
+
+    reloj.avanzar(1)
+    assert circuito.permitir()
+    assert not circuito.permitir()  # La prueba sigue en curso
+
+    circuito.registrar_exito()
+    assert not circuito.abierto
+    assert circuito.permitir()
+
+
+def test_prueba_fallida_reabre_el_circuito(reloj):
+    circuito = _CircuitBreaker(umbral_fallos=1, enfriamiento_segundos=30)
+    circuito.registrar_fallo()
+    reloj.avanzar(30)
+    assert circuito.permitir()
+
+    circuito.registrar_fallo()
+
+    assert not circuito.permitir()
+    reloj.avanzar(30)
+    assert circuito.permitir()
+
+
+# --- RequestsClient ---
+
+def test_reintenta_errores_5xx(reloj):
+    cliente = _cliente([_Respuesta(503), _Respuesta(502), _Respuesta(200)], max_reintentos=3)
+    assert cliente.get(URL).status_code == 200
+    assert cliente.llamadas == 3
+    assert len(reloj.esperas) == 2
+    metricas = cliente.metricas()["api.ejemplo.com"]
+    assert (metricas["peticiones"], metricas["errores"], metricas["reintentos"]) == (3, 2, 2)
+
+
+def test_respeta_retry_after(reloj):
+    cliente = _cliente([_Respuesta(429, {"Retry-After": "3"}), _Respuesta(200)], backoff_max=8.0)
+    cliente.get(URL)
+    assert reloj.esperas == [3.0]
+
+
+def test_no_reintenta_errores_4xx(reloj):
+    cliente = _cliente([_Respuesta(404)])
+    with pytest.raises(requests.exceptions.HTTPError):
+        cliente.get(URL)
+    assert cliente.llamadas == 1
+    # Un 404 no es culpa del host: no suma para abrir el circuito
+    assert not cliente.metricas()["api.ejemplo.com"]["circuito_abierto"]
+
+
+def test_circuito_abierto_rechaza_sin_llamar_al_host(reloj):
+    cliente = _cliente([requests.exceptions.ConnectionError("caído")] * 2,
+                       max_reintentos=0, umbral_fallos=2, enfriamiento_segundos=30)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cliente.get(URL)
+
+    with pytest.raises(CircuitoAbiertoError):
+        cliente.get(URL)
+
+    assert cliente.llamadas == 2
+    metricas = cliente.metricas()["api.ejemplo.com"]
+    assert metricas["circuito_abierto"]
+    assert metricas["rechazadas_por_circuito"] == 1
+
+
+def test_espera_exponencial_con_tope(monkeypatch):
+    monkeypatch.setattr(http_client.random, "uniform", lambda a, b: b)
+    cliente = RequestsClient(backoff_base=0.5, backoff_max=8.0)
+    assert [cliente._espera_reintento(i, None) for i in range(6)] == [0.5, 1.0, 2.0, 4.0, 8.0, 8.0]
+
+
+def test_plazo_total_corta_los_reintentos(reloj, monkeypatch):
+    monkeypatch.setattr(http_client.random, "uniform", lambda a, b: b)
+    monkeypatch.setattr(time, "sleep", reloj.avanzar)
+    cliente = _cliente([_Respuesta(503)] * 6, max_reintentos=5, plazo_total=10.0)
+    timeouts = []
+    get_original = cliente.session.get
+
+    def get_lento(url, params=None, timeout=None):
+        # Cada intento tarda 4 s, o lo que permita su timeout de lectura
+        timeouts.append(timeout)
+        reloj.avanzar(min(4.0, timeout[1]))
+        return get_original(url, params=params, timeout=timeout)
+
+    cliente.session.get = get_lento
+    inicio = reloj.ahora
+    with pytest.raises(requests.exceptions.HTTPError):
+        cliente.get(URL)
+
+    # Intentos a 0 s, 4.5 s y 9.5 s; la espera de 2 s tras el tercero ya no cabe
+    assert cliente.llamadas == 3
+    assert timeouts == [(3.05, 10.0), (3.05, 5.5), (0.5, 0.5)]
+    assert reloj.ahora - inicio <= 10.0
+
+
+def test_plazo_total_por_peticion(reloj):
+    cliente = _cliente([_Respuesta(503)] * 4, max_reintentos=3, backoff_base=0.5)
+    with pytest.raises(requests.exceptions.HTTPError):
+        cliente.get(URL, plazo_total=0.2)
+    assert cliente.llamadas == 1
+    assert reloj.esperas == []
+
+    # Sin plazo, se agotan los reintentos
+    cliente = _cliente([_Respuesta(503)] * 4, max_reintentos=3, plazo_total=None)
+    with pytest.raises(requests.exceptions.HTTPError):
+        cliente.get(URL)
+    assert cliente.llamadas == 4
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtGui import QPixmap
+
+from gui.components.image_manager import DiskCache, PixmapCache
+
+
+# --- PixmapCache ---
+
+def _pixmap(ancho=10, alto=10):
+    pixmap = QPixmap(ancho, alto)
+    pixmap.fill()
+    return pixmap
+
+
+@pytest.fixture
+def coste(qapp):
+    """Bytes que cuenta PixmapCache por un pixmap de 10x10."""
+    return PixmapCache._cost(_pixmap())
+
+
+def test_pixmaps_desaloja_el_menos_usado(coste):
+    cache = PixmapCache(max_bytes=2 * coste)
+    cache.put("a", _pixmap())
+    cache.put("b", _pixmap())
+    cache.get("a")  # "b" pasa a ser el menos usado
+    cache.put("c", _pixmap())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert len(cache) == 2
+    assert cache.total_bytes == 2 * coste
+
+
+def test_pixmaps_respeta_el_tope_de_bytes(coste):
+    cache = PixmapCache(max_bytes=5 * coste)
+    for i in range(20):
+        cache.put(str(i), _pixmap())
+        assert cache.total_bytes <= cache.max_bytes
+    assert len(cache) == 5
+    assert [cache.get(str(i)) is not None for i in range(14, 20)] == [False] + [True] * 5
+
+
+def test_pixmaps_conserva_la_entrada_que_sola_supera_el_tope(coste):
+    cache = PixmapCache(max_bytes=2 * coste)
+    cache.put("pequeña", _pixmap())
+    cache.put("grande", _pixmap(100, 100))
+    assert len(cache) == 1
+    assert cache.get("grande") is not None
+
+
+def test_pixmaps_reemplazar_no_duplica_el_coste(coste):
+    cache = PixmapCache(max_bytes=10 * coste)
+    cache.put("a", _pixmap())
+    cache.put("a", _pixmap(20, 10))
+    assert len(cache) == 1
+    assert cache.total_bytes == 2 * coste
+
+    cache.clear()
+    assert len(cache) == 0 and cache.total_bytes == 0
+
+
+# --- DiskCache ---
+
+def _archivos(directorio):
+    return sorted(os.listdir(directorio))
+
+
+def test_disco_poda_los_menos_usados(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=300)
+    for nombre in ("a", "b", "c"):
+        cache.write(nombre, b"x" * 100)
+    assert cache.read("a") == b"x" * 100  # "b" pasa a ser el menos usado
+    cache.write("d", b"x" * 100)
+
+    assert _archivos(tmp_path) == ["a", "c", "d"]
+    assert cache.read("b") is None
+    assert cache.total_bytes == 300
+
+
+def test_disco_respeta_el_tope(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=250)
+    for i in range(10):
+        cache.write(f"img{i}", b"x" * 100)
+        assert cache.total_bytes <= 250
+    assert _archivos(tmp_path) == ["img8", "img9"]
+    # Una imagen que sola supera el tope se conserva
+    cache.write("grande", b"x" * 400)
+    assert _archivos(tmp_path) == ["grande"]
+
+
+def test_disco_sobrescribir_no_duplica_el_tamano(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    cache.write("a", b"x" * 100)
+    cache.write("a", b"x" * 300)
+    assert cache.total_bytes == 300
+    assert cache.read("a") == b"x" * 300
+
+
+def test_disco_ordena_por_mtime_al_arrancar(tmp_path):
+    # Archivos de una ejecución anterior: el más antiguo (por mtime) se poda primero
+    for nombre, mtime in (("nuevo", 3000), ("viejo", 1000), ("medio", 2000)):
+        ruta = tmp_path / nombre
+        ruta.write_bytes(b"x" * 100)
+        os.utime(ruta, (mtime, mtime))
+    (tmp_path / "a_medias.123.tmp").write_bytes(b"x" * 500)
+
+    cache = DiskCache(str(tmp_path), max_bytes=300)
+    cache.write("otro", b"x" * 100)
+
+    assert "viejo" not in _archivos(tmp_path)
+    assert cache.total_bytes == 300
+    # Los temporales no cuentan ni se podan
+    assert "a_medias.123.tmp" in _archivos(tmp_path)
+
+
+def test_disco_archivo_borrado_por_fuera(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    cache.write("a", b"x" * 100)
+    os.remove(tmp_path / "a")
+    assert cache.read("a") is None
+    assert cache.total_bytes == 0
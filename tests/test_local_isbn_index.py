@@ -0,0 +1,150 @@
+import gzip
+import json
+import os
+import threading
+
+import pytest
+
+from core.interfaces import ApiSinRespuestaError
+from features.local_isbn_index import LocalIsbnIndex, LocalIsbnIndexApi
+
+# "Ficciones" con su ISBN-10; su ISBN-13 es 9780306406157
+EDICION = {
+    "key": "/books/OL1M", "title": "Ficciones", "subtitle": "Edición anotada",
+    "authors": [{"key": "/authors/OL1A"}], "publishers": ["Sur"],
+    "subjects": ["Cuentos", "Literatura argentina"], "isbn_10": ["0-306-40615-2"], "covers": [-1, 42],
+}
+
+
+def _linea_open_library(registro, tipo="/type/edition"):
+    return f"{tipo}\t{registro['key']}\t3\t2024-01-01T00:00:00\t{json.dumps(registro, ensure_ascii=False)}\n"
+
+
+def _escribir(ruta, texto):
+    abrir = gzip.open if str(ruta).endswith(".gz") else open
+    with abrir(ruta, "wt", encoding="utf-8") as archivo:
+        archivo.write(texto)
+    return str(ruta)
+
+
+@pytest.fixture
+def indice(tmp_path):
+    indice = LocalIsbnIndex(str(tmp_path / "isbn_index.db"))
+    yield indice
+    indice.cerrar()
+
+
+def test_volcado_de_open_library(indice, tmp_path):
+    volcado = _escribir(tmp_path / "ediciones.txt", _linea_open_library(EDICION) + "\nlínea rota\t{no es json\n")
+
+    assert indice.importar(volcado) == 1
+    fila = indice.buscar("9780306406157")
+    assert fila["titulo"] == "Ficciones: Edición anotada"
+    assert fila["editorial"] == "Sur"
+    assert fila["categorias"] == "Cuentos,Literatura argentina"
+    assert fila["imagen_url"] == "https://covers.openlibrary.org/b/id/42-M.jpg"
+    # Se busca igual con el ISBN-10, con o sin guiones
+    assert indice.buscar("0306406152") == fila
+    assert indice.buscar("0-306-40615-2") == fila
+
+
+def test_autores_citados_por_clave(indice, tmp_path):
+    con_firma = dict(EDICION, key="/books/OL2M", isbn_10=[], isbn_13=["9780000000002"], by_statement="J. L. Borges")
+    otra = dict(EDICION, key="/books/OL3M", isbn_10=[], isbn_13=["9780000000003"], authors=[{"key": "/authors/OL9A"}])
+    ediciones = _escribir(tmp_path / "ediciones.txt.gz", "".join(_linea_open_library(r) for r in (EDICION, con_firma, otra)))
+    autores = _escribir(tmp_path / "autores.txt.gz", _linea_open_library(
+        {"key": "/authors/OL1A", "name": "Jorge Luis Borges"}, tipo="/type/author"
+    ))
+
+    assert indice.importar(ediciones, ruta_autores=autores) == 3
+
+    assert indice.buscar("9780306406157")["autor"] == "Jorge Luis Borges"
+    # "by_statement" tiene prioridad sobre el nombre buscado por clave
+    assert indice.buscar("9780000000002")["autor"] == "J. L. Borges"
+    # Autor que no está en el volcado de autores
+    assert indice.buscar("9780000000003")["autor"] == ""
+
+
+def test_autores_por_clave_sin_volcado_de_autores(indice, tmp_path, capsys):
+    volcado = _escribir(tmp_path / "ediciones.txt", _linea_open_library(EDICION))
+    indice.importar(volcado)
+    assert indice.buscar("9780306406157")["autor"] == ""
+    assert "volcado de autores" in capsys.readouterr().out
+
+
+def test_csv_comprimido(indice, tmp_path):
+    volcado = _escribir(tmp_path / "libros.csv.gz", (
+        "ISBN,Title,Author,Publisher,Categories\n"
+        '978-0-306-40615-7,Rayuela,"Cortázar, Julio",Sudamericana,Novela; Clásicos\n'
+        "sin-isbn,Sin ISBN,,,\n"
+        "9780000000009,,Autor sin título,,\n"
+    ))
+
+    assert indice.importar(volcado) == 1
+    fila = indice.buscar("9780306406157")
+    assert (fila["titulo"], fila["autor"], fila["editorial"]) == ("Rayuela", "Cortázar, Julio", "Sudamericana")
+    assert fila["categorias"] == "Novela,Clásicos"
+
+
+def test_importacion_fallida_conserva_el_indice_anterior(indice, tmp_path):
+    indice.importar(_escribir(tmp_path / "ediciones.txt", _linea_open_library(EDICION)))
+    assert indice.buscar("9780306406157") is not None
+
+    def progreso(lineas, filas):
+        raise KeyboardInterrupt
+
+    nuevo = _escribir(tmp_path / "nuevo.jsonl", "".join(
+        json.dumps({"title": f"Libro {i}", "isbn_13": [f"97800000{i:05d}"]}) + "\n" for i in range(10)
+    ))
+    with pytest.raises(KeyboardInterrupt):
+        indice.importar(nuevo, tamano_lote=2, progreso=progreso)
+
+    assert not os.path.exists(indice.db_path + ".tmp")
+    assert indice.total() == 1
+
+    # Una importación completa reemplaza al índice, también para las conexiones ya abiertas
+    assert indice.importar(nuevo, tamano_lote=3) == 10
+    assert indice.buscar("9780306406157") is None
+    assert indice.total() == 10
+
+
+def test_formato_no_soportado(indice, tmp_path):
+    with pytest.raises(ValueError):
+        indice.importar(_escribir(tmp_path / "libros.csv", ""), formato="xml")
+
+
+def test_indice_inexistente(indice):
+    assert not indice.disponible()
+    assert indice.buscar("9780306406157") is None
+    assert indice.total() == 0
+
+
+def test_api_local(indice, tmp_path):
+    indice.importar(_escribir(tmp_path / "ediciones.txt", _linea_open_library(dict(EDICION, by_statement="Borges"))))
+    api = LocalIsbnIndexApi(indice)
+
+    metadatos = api.obtener_metadatos("0306406152")
+    assert (metadatos.isbn, metadatos.titulo, metadatos.autor) == ("0306406152", "Ficciones: Edición anotada", "Borges")
+    assert metadatos.categorias == ["Cuentos", "Literatura argentina"]
+    # Un ISBN que el índice no tiene no es un "no encontrado": podría estar en las APIs en línea
+    with pytest.raises(ApiSinRespuestaError):
+        api.obtener_metadatos("9780000000001")
+
+
+def test_busquedas_desde_varios_hilos(indice, tmp_path):
+    indice.importar(_escribir(tmp_path / "ediciones.txt", _linea_open_library(EDICION)))
+    errores = []
+
+    def buscar():
+        try:
+            for _ in range(50):
+                assert indice.buscar("9780306406157")["titulo"]
+        except Exception as e:
+            errores.append(e)
+
+    hilos = [threading.Thread(target=buscar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert errores == []
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from features.book_service import BookService
+from features.paged_search import BusquedaPaginada
+
+TITULOS = ["Árbol rojo", "arbol azul", "El árbol", "Ficciones", "Rayuela"]
+
+
+@pytest.fixture
+def book_service(data_manager, sql_manager):
+    """Catálogo con títulos repetidos y libros en varias posiciones (o en ninguna)."""
+    libros, inventario = [], []
+    for i in range(230):
+        isbn = f"9780000{i:06d}"
+        # Títulos repetidos: el orden depende del desempate por ISBN e inventario
+        libros.append((isbn, TITULOS[i % len(TITULOS)], f"Autor {i % 7}", "Editorial", "Novela"))
+        for posicion in range(i % 3):
+            inventario.append((isbn, f"A{posicion}"))
+    # En desorden, para que el orden de inserción no coincida con el de los resultados
+    random.Random(23).shuffle(libros)
+    random.Random(24).shuffle(inventario)
+    data_manager.execute_many(
+        "INSERT INTO libros (isbn, titulo, autor, editorial, categorias) VALUES (?, ?, ?, ?, ?)", libros
+    )
+    data_manager.execute_many("INSERT INTO inventario (libro_isbn, posicion) VALUES (?, ?)", inventario)
+    sql_manager.rellenar_columnas_normalizadas()
+    return BookService(data_manager, book_info_service=None)
+
+
+class BookServiceContador:
+    """Envuelve BookService para contar las consultas que llegan a SQLite."""
+
+    def __init__(self, book_service):
+        self.book_service = book_service
+        self.paginas_leidas = []
+        self.conteos = 0
+
+    def buscar_libros(self, termino, filtros=None, offset=0, limite=None, cancelado=None):
+        self.paginas_leidas.append(offset // limite)
+        return self.book_service.buscar_libros(termino, filtros, offset=offset, limite=limite)
+
+    def contar_libros(self, termino, filtros=None, cancelado=None):
+        self.conteos += 1
+        return self.book_service.contar_libros(termino, filtros)
+
+
+def _claves(libros):
+    return [(l["ISBN"], l["Posición"]) for l in libros]
+
+
+@pytest.mark.parametrize("fts", [True, False], ids=["fts", "like"])
+@pytest.mark.parametrize("termino", ["arbol", "autor", "ficciones", "9780000000"])
+def test_paginas_iguales_al_resultado_completo(book_service, fts, termino):
+    if fts and not book_service._usar_fts():
+        pytest.skip("SQLite sin FTS5")
+    book_service._fts_disponible = fts
+    completo = book_service.buscar_libros(termino)
+    assert completo
+    # Orden total y estable: título, ISBN y entrada de inventario
+    posiciones = {}
+    for fila in book_service.data_manager.fetch_query("SELECT id_inventario, libro_isbn, posicion FROM inventario"):
+        posiciones[(fila["libro_isbn"], fila["posicion"])] = fila["id_inventario"]
+    assert completo == sorted(completo, key=lambda l: (l["Título"], l["ISBN"], posiciones.get((l["ISBN"], l["Posición"]), 0)))
+
+    busqueda = book_service.paginar_busqueda(termino, tamano_pagina=17)
+
+    assert len(busqueda) == len(completo)
+    paginas = [busqueda.pagina(n) for n in range(busqueda.numero_paginas)]
+    assert all(len(p) == 17 for p in paginas[:-1])
+    assert _claves(l for p in paginas for l in p) == _claves(completo)
+    assert _claves(busqueda) == _claves(completo)
+
+
+def test_fts_y_like_devuelven_lo_mismo(book_service):
+    if not book_service._usar_fts():
+        pytest.skip("SQLite sin FTS5")
+    con_fts = book_service.paginar_busqueda("arbol", tamano_pagina=20)[:]
+    book_service._fts_disponible = False
+    assert _claves(book_service.paginar_busqueda("arbol", tamano_pagina=20)[:]) == _claves(con_fts)
+
+
+def test_indices_y_cortes(book_service):
+    completo = book_service.buscar_libros("autor")
+    busqueda = book_service.paginar_busqueda("autor", tamano_pagina=10)
+
+    assert busqueda[0] == completo[0]
+    assert busqueda[-1] == completo[-1]
+    assert busqueda[25] == completo[25]
+    for corte in (slice(5, 35), slice(0, 10), slice(9, 11), slice(-15, None), slice(40, 20), slice(3, 60, 7), slice(None)):
+        assert busqueda[corte] == completo[corte]
+    with pytest.raises(IndexError):
+        busqueda[len(completo)]
+    with pytest.raises(IndexError):
+        busqueda[-len(completo) - 1]
+
+
+def test_solo_lee_las_paginas_necesarias(book_service):
+    contador = BookServiceContador(book_service)
+    busqueda = BusquedaPaginada(contador, "autor", tamano_pagina=10)
+
+    busqueda[25:35]
+    busqueda[30]
+
+    assert contador.conteos == 1
+    assert contador.paginas_leidas == [2, 3]
+    assert busqueda.pagina_de(35) == 3
+    assert busqueda.paginas_sin_cargar(0, 50) == [0, 1, 4]
+    assert busqueda.paginas_sin_cargar(20, 40) == []
+    assert busqueda.paginas_sin_cargar(len(busqueda), len(busqueda) + 10) == []
+
+
+def test_cache_de_paginas_limitada(book_service):
+    contador = BookServiceContador(book_service)
+    busqueda = BusquedaPaginada(contador, "autor", tamano_pagina=10, paginas_en_cache=3)
+
+    for numero in (0, 1, 2, 0, 3):
+        busqueda.pagina(numero)
+
+    # Se descarta la página usada hace más tiempo (la 1), no la primera leída
+    assert [n for n in range(5) if busqueda.pagina_cargada(n)] == [0, 2, 3]
+    busqueda.pagina(1)
+    assert contador.paginas_leidas == [0, 1, 2, 3, 1]
+
+
+def test_primera_pagina_ya_leida(book_service):
+    contador = BookServiceContador(book_service)
+    primera = book_service.buscar_libros("autor", limite=10)
+
+    busqueda = BusquedaPaginada(contador, "autor", tamano_pagina=10, primera_pagina=primera)
+    assert busqueda[:10] == primera
+    assert contador.paginas_leidas == []
+    assert contador.conteos == 1
+
+    # Una primera página incompleta ya es el resultado entero: no hace falta el COUNT
+    pocos = book_service.buscar_libros("9780000000001", limite=10)
+    busqueda = BusquedaPaginada(contador, "9780000000001", tamano_pagina=10, primera_pagina=pocos)
+    assert len(busqueda) == len(pocos)
+    assert contador.conteos == 1
+
+
+def test_busqueda_vacia(book_service):
+    busqueda = book_service.paginar_busqueda("inexistente")
+    assert len(busqueda) == 0
+    assert busqueda[:] == []
+    assert list(busqueda) == []
+    assert busqueda.pagina(0) == []
+
+
+def test_tamano_de_pagina_invalido(book_service):
+    with pytest.raises(ValueError):
+        BusquedaPaginada(book_service, "autor", tamano_pagina=0)
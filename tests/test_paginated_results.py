@@ -0,0 +1,91 @@
+import pytest
+
+pytest.importorskip("PySide6")
+
+import shiboken6
+from PySide6.QtCore import QCoreApplication, QEvent
+
+from gui.components.paginated_results_widget import PaginatedResultsWidget
+
+# 8 libros por página: 7 páginas, la última con 2 libros
+LIBROS = [{"Título": f"Libro {i}", "Autor": "Autor", "Posición": "A1"} for i in range(50)]
+
+
+@pytest.fixture
+def widget(qapp):
+    widget = PaginatedResultsWidget()
+    widget.construidas = []
+    construir = widget._construir_pagina
+
+    def construir_contando(indice):
+        widget.construidas.append(indice)
+        return construir(indice)
+
+    widget._construir_pagina = construir_contando
+    widget.update_results(LIBROS, "libro")
+    yield widget
+    widget.deleteLater()
+
+
+def _liberar_pendientes():
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+
+
+def test_solo_construye_la_primera_pagina(widget):
+    assert widget.total_results_pages == 7
+    assert widget.construidas == [0]
+    assert list(widget._paginas_construidas) == [0]
+    assert widget.results_pages_stack.currentWidget() is widget._paginas_construidas[0]
+
+
+def test_construye_bajo_demanda_y_reutiliza(widget):
+    pagina = widget._obtener_pagina(1)
+    assert widget._obtener_pagina(1) is pagina
+    assert widget.construidas == [0, 1]
+    assert widget.results_pages_stack.count() == 2
+
+
+def test_libera_las_paginas_antiguas(widget):
+    paginas = {i: widget._obtener_pagina(i) for i in (1, 2)}
+    widget._obtener_pagina(3)
+
+    # La 1 era la menos usada que no está en pantalla
+    assert list(widget._paginas_construidas) == [0, 2, 3]
+    assert widget.results_pages_stack.count() == 3
+    _liberar_pendientes()
+    assert not shiboken6.isValid(paginas[1])
+    assert shiboken6.isValid(paginas[2])
+
+    # Volver a ella la reconstruye
+    widget._obtener_pagina(1)
+    assert widget.construidas == [0, 1, 2, 3, 1]
+    assert list(widget._paginas_construidas) == [0, 3, 1]
+
+
+def test_el_acceso_renueva_la_pagina(widget):
+    widget._obtener_pagina(1)
+    widget._obtener_pagina(2)
+    widget._obtener_pagina(1)
+    widget._obtener_pagina(3)
+    assert list(widget._paginas_construidas) == [0, 1, 3]
+
+
+def test_nunca_libera_la_pagina_en_pantalla(widget):
+    actual = widget._paginas_construidas[0]
+    for indice in range(1, 7):
+        widget._obtener_pagina(indice)
+        assert 0 in widget._paginas_construidas
+        assert len(widget._paginas_construidas) <= widget.MAX_PAGINAS_CONSTRUIDAS
+    _liberar_pendientes()
+    assert shiboken6.isValid(actual)
+    assert widget.results_pages_stack.currentWidget() is actual
+
+
+def test_nueva_busqueda_libera_todas_las_paginas(widget):
+    paginas = [widget._obtener_pagina(i) for i in (1, 2)]
+    widget.update_results(LIBROS[:3], "otro")
+    _liberar_pendientes()
+
+    assert list(widget._paginas_construidas) == [0]
+    assert widget.total_results_pages == 1
+    assert not any(shiboken6.isValid(p) for p in paginas)
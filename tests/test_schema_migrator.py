@@ -0,0 +1,115 @@
+import json
+import os
+
+from core.schema_migrator import SchemaMigrator
+
+SCHEMAS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "core", "schemas.json")
+
+TABLAS = [{"nombre": "libros", "definicion": "(isbn TEXT PRIMARY KEY, titulo TEXT)"}]
+
+
+def _tablas(sql_manager):
+    return {f["name"] for f in sql_manager.fetch_query("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_huella_estable_y_de_31_bits():
+    contenido = b'{"tablas": []}'
+    huella = SchemaMigrator.huella(contenido)
+    assert huella == SchemaMigrator.huella(contenido)
+    assert huella != SchemaMigrator.huella(contenido + b" ")
+    assert 0 < huella <= 0x7FFFFFFF
+
+
+def test_huella_nunca_es_cero():
+    # crc32(b"") es 0, el valor de una base de datos nueva
+    assert SchemaMigrator.huella(b"") == 1
+
+
+def test_esta_al_dia_tras_guardar_huella(sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    huella = SchemaMigrator.huella(b"esquema")
+    assert migrator.huella_guardada() == 0
+    assert not migrator.esta_al_dia(huella)
+
+    migrator.guardar_huella(huella)
+
+    assert migrator.esta_al_dia(huella)
+    assert not migrator.esta_al_dia(SchemaMigrator.huella(b"otro esquema"))
+
+
+def test_migraciones_en_orden_y_una_sola_vez(sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    migrator.crear_tablas(TABLAS)
+    migraciones = [
+        {"version": 2, "sentencias": ["ALTER TABLE libros ADD COLUMN precio INTEGER"]},
+        {"version": 1, "sentencias": ["ALTER TABLE libros ADD COLUMN autor TEXT"]},
+    ]
+
+    assert migrator.aplicar_migraciones(migraciones) == 2
+    # Repetirlas no vuelve a ejecutar los ALTER (fallarían por columna duplicada)
+    assert migrator.aplicar_migraciones(migraciones) == 2
+    assert migrator.version_actual() == 2
+
+
+def test_migracion_opcional_fallida_no_detiene_las_siguientes(sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    migraciones = [
+        {"version": 1, "opcional": True, "sentencias": ["CREATE VIRTUAL TABLE x USING modulo_inexistente(a)"]},
+        {"version": 2, "sentencias": ["CREATE TABLE despues (id INTEGER)"]},
+    ]
+
+    assert migrator.aplicar_migraciones(migraciones) == 2
+    tablas = _tablas(sql_manager)
+    assert "despues" in tablas
+    assert "x" not in tablas
+
+
+def test_migracion_obligatoria_fallida_detiene_las_siguientes(sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    migraciones = [
+        {"version": 1, "sentencias": ["CREATE TABLE primera (id INTEGER)"]},
+        {"version": 2, "sentencias": ["CREATE TABLE parcial (id INTEGER)", "SENTENCIA INVALIDA"]},
+        {"version": 3, "sentencias": ["CREATE TABLE tercera (id INTEGER)"]},
+    ]
+
+    assert migrator.aplicar_migraciones(migraciones) == 1
+    tablas = _tablas(sql_manager)
+    assert "primera" in tablas
+    # La migración fallida se deshace entera y las posteriores no se ejecutan
+    assert "parcial" not in tablas
+    assert "tercera" not in tablas
+    assert migrator.version_actual() == 1
+
+
+def test_verificar(sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    schemas = {
+        "tablas": TABLAS,
+        "migraciones": [
+            {"version": 1, "sentencias": ["ALTER TABLE libros ADD COLUMN autor TEXT"]},
+            {"version": 2, "opcional": True, "sentencias": ["CREATE VIRTUAL TABLE x USING modulo_inexistente(a)"]},
+        ],
+        "indices": [{"nombre": "idx_libros_autor", "tabla": "libros", "columnas": ["autor"]}],
+    }
+    assert not migrator.verificar(schemas)
+
+    migrator.aplicar(schemas)
+
+    # La migración opcional que falló no cuenta como pendiente
+    assert migrator.verificar(schemas)
+    assert migrator.crear_indices(schemas["indices"]) == 0
+
+
+def test_esquema_de_la_aplicacion(data_manager, sql_manager):
+    migrator = SchemaMigrator(sql_manager)
+    objetos = {
+        f["name"]: f["sql"] or ""
+        for f in sql_manager.fetch_query("SELECT name, sql FROM sqlite_master WHERE type IN ('trigger', 'index')")
+    }
+    # Nada del esquema depende de normalize(), que solo existe en las conexiones de la aplicación
+    assert not [nombre for nombre, sql in objetos.items() if "normalize(" in sql]
+    assert "idx_libros_titulo_norm" not in objetos
+    with open(SCHEMAS_PATH, encoding="utf-8") as f:
+        versiones = [m["version"] for m in json.load(f)["migraciones"]]
+    assert versiones == list(range(1, len(versiones) + 1))
+    assert migrator.version_actual() == versiones[-1]
@@ -0,0 +1,142 @@
+import threading
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from PySide6.QtCore import QCoreApplication
+
+from features.paged_search import BusquedaPaginada
+from gui.common.async_service import shared_thread_pool
+from gui.dialogs.search_results_window import SearchResultsWindow
+
+
+class ServicioFalso:
+    """BookService de prueba: 'total' libros; con 'bloqueo', las páginas > 0 esperan al evento."""
+
+    def __init__(self, total, prefijo="Libro", bloqueo=None):
+        self.total = total
+        self.prefijo = prefijo
+        self.bloqueo = bloqueo
+        self.paginas_leidas = []
+
+    def contar_libros(self, termino, filtros=None, cancelado=None):
+        return self.total
+
+    def buscar_libros(self, termino, filtros=None, offset=0, limite=None, cancelado=None):
+        if offset and self.bloqueo:
+            self.bloqueo.wait(5)
+        self.paginas_leidas.append(offset // limite)
+        return [{"ISBN": f"978{i:010d}", "Título": f"{self.prefijo} {i}", "Autor": "Autor"}
+                for i in range(offset, min(offset + limite, self.total))]
+
+
+def _busqueda(servicio):
+    return BusquedaPaginada(servicio, "libro", tamano_pagina=10)
+
+
+def _esperar():
+    """Espera a las consultas en segundo plano y entrega sus resultados a la ventana."""
+    assert shared_thread_pool().waitForDone(5000)
+    QCoreApplication.processEvents()
+
+
+def _titulos(ventana):
+    titulos = [libro["Título"] for libro in ventana.result_list_widget.books_data]
+    # Las dos vistas muestran siempre las mismas filas
+    assert [libro["Título"] for libro in ventana.book_list_view_widget.books_data] == titulos
+    return titulos
+
+
+@pytest.fixture
+def ventanas(qapp):
+    creadas = []
+
+    def crear(libros, termino="libro"):
+        ventana = SearchResultsWindow(libros, termino)
+        creadas.append(ventana)
+        return ventana
+
+    yield crear
+    for ventana in creadas:
+        ventana.done(0)
+        ventana.deleteLater()
+    _esperar()
+
+
+def test_cargar_mas_anexa_la_pagina_siguiente(ventanas):
+    busqueda = _busqueda(ServicioFalso(25))
+    ventana = ventanas(busqueda)
+    assert _titulos(ventana) == [f"Libro {i}" for i in range(10)]
+
+    _esperar()  # Precarga de la segunda página
+    assert busqueda.pagina_cargada(1)
+    assert len(_titulos(ventana)) == 10
+
+    ventana._cargar_mas_resultados()
+    assert _titulos(ventana) == [f"Libro {i}" for i in range(20)]
+
+    _esperar()
+    ventana._cargar_mas_resultados()
+    assert _titulos(ventana) == [f"Libro {i}" for i in range(25)]
+    # Sin más resultados no hace nada
+    ventana._cargar_mas_resultados()
+    _esperar()
+    assert len(_titulos(ventana)) == 25
+    assert busqueda.book_service.paginas_leidas == [0, 1, 2]
+
+
+def test_cargar_mas_espera_la_pagina_en_curso(ventanas):
+    bloqueo = threading.Event()
+    busqueda = _busqueda(ServicioFalso(25, bloqueo=bloqueo))
+    ventana = ventanas(busqueda)
+
+    # La precarga de la segunda página sigue en curso: no se pide otra vez
+    ventana._cargar_mas_resultados()
+    ventana._cargar_mas_resultados()
+    assert len(_titulos(ventana)) == 10
+
+    bloqueo.set()
+    _esperar()
+    assert _titulos(ventana) == [f"Libro {i}" for i in range(20)]
+    assert busqueda.book_service.paginas_leidas.count(1) == 1
+
+
+def test_descarta_la_pagina_de_una_busqueda_anterior(ventanas):
+    bloqueo = threading.Event()
+    anterior = _busqueda(ServicioFalso(25, bloqueo=bloqueo))
+    ventana = ventanas(anterior)
+    ventana._cargar_mas_resultados()
+
+    nueva = _busqueda(ServicioFalso(15, prefijo="Otro"))
+    ventana.update_content(nueva, "otro")
+    bloqueo.set()
+    _esperar()
+    assert _titulos(ventana) == [f"Otro {i}" for i in range(10)]
+
+    # Aunque llegue una página de la búsqueda anterior, no se anexa
+    ventana._mostrar_pagina(anterior, 1, anterior.pagina(1))
+    assert _titulos(ventana) == [f"Otro {i}" for i in range(10)]
+
+    ventana._cargar_mas_resultados()
+    assert _titulos(ventana) == [f"Otro {i}" for i in range(15)]
+
+
+def test_ignora_una_pagina_ya_mostrada(ventanas):
+    busqueda = _busqueda(ServicioFalso(25))
+    ventana = ventanas(busqueda)
+    _esperar()
+    ventana._cargar_mas_resultados()
+    assert len(_titulos(ventana)) == 20
+
+    # Una respuesta repetida (p. ej. precarga y petición de la misma página) no duplica filas
+    ventana._mostrar_pagina(busqueda, 1, busqueda.pagina(1))
+    ventana._mostrar_pagina(busqueda, 0, busqueda.pagina(0))
+    assert _titulos(ventana) == [f"Libro {i}" for i in range(20)]
+
+
+def test_lista_simple_no_pagina(ventanas):
+    libros = [{"ISBN": f"978{i:010d}", "Título": f"Libro {i}"} for i in range(3)]
+    ventana = ventanas(libros)
+    ventana._cargar_mas_resultados()
+    assert _titulos(ventana) == ["Libro 0", "Libro 1", "Libro 2"]
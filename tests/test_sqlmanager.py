@@ -0,0 +1,166 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from core.interfaces import ConsultaCanceladaError
+from features.book_service import BookService
+
+# Consulta que tarda varios segundos en SQLite: cuenta hasta 50 millones
+CONSULTA_LENTA = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 50000000) "
+    "SELECT COUNT(*) AS total FROM n"
+)
+
+
+@pytest.fixture
+def tabla(sql_manager):
+    sql_manager.execute_query("CREATE TABLE movimientos (id INTEGER PRIMARY KEY, monto INTEGER NOT NULL)")
+    return sql_manager
+
+
+def _montos(sql_manager):
+    return [f["monto"] for f in sql_manager.fetch_query("SELECT monto FROM movimientos ORDER BY id")]
+
+
+# --- Transacciones ---
+
+def test_transaccion_confirma_todo_junto(tabla):
+    with tabla.transaction():
+        tabla.execute_query("INSERT INTO movimientos (monto) VALUES (?)", (100,))
+        tabla.execute_query("INSERT INTO movimientos (monto) VALUES (?)", (200,))
+    assert _montos(tabla) == [100, 200]
+
+
+def test_transaccion_revierte_ante_un_error(tabla):
+    with pytest.raises(sqlite3.IntegrityError):
+        with tabla.transaction():
+            tabla.execute_query("INSERT INTO movimientos (monto) VALUES (?)", (100,))
+            # Dentro de la transacción el error se relanza en lugar de devolver None
+            tabla.execute_query("INSERT INTO movimientos (monto) VALUES (NULL)")
+    assert _montos(tabla) == []
+
+
+def test_transacciones_anidadas_se_unen_a_la_exterior(tabla):
+    with pytest.raises(RuntimeError):
+        with tabla.transaction():
+            with tabla.transaction():
+                tabla.execute_query("INSERT INTO movimientos (monto) VALUES (?)", (100,))
+            raise RuntimeError("falla después del bloque interior")
+    assert _montos(tabla) == []
+    # Fuera de una transacción los errores se informan con None
+    assert tabla.execute_query("INSERT INTO movimientos (monto) VALUES (NULL)") is None
+
+
+
+# --- Perfilado ---
+
+def test_perfilado_agrupa_por_plantilla(tabla):
+    profiler = tabla.activar_perfilado(umbral_lento_ms=10_000)
+    for monto in (100, 200, 300):
+        tabla.execute_query("INSERT INTO movimientos (monto)   VALUES (?)", (monto,))
+    tabla.fetch_query("SELECT monto FROM movimientos WHERE monto > ?", (150,))
+
+    resumen = {f["consulta"]: f for f in profiler.resumen()}
+    assert resumen["INSERT INTO movimientos (monto) VALUES (?)"]["llamadas"] == 3
+    assert resumen["SELECT monto FROM movimientos WHERE monto > ?"]["filas"] == 2
+
+    tabla.desactivar_perfilado()
+    tabla.fetch_query("SELECT monto FROM movimientos")
+    assert len(profiler.resumen()) == 2
+
+
+def test_consulta_lenta_con_plan(tabla, capsys):
+    tabla.activar_perfilado(umbral_lento_ms=0)
+    tabla.fetch_query("SELECT monto FROM movimientos WHERE monto = ?", (100,))
+    salida = capsys.readouterr().out
+    assert "Consulta lenta" in salida
+    assert "SCAN movimientos" in salida
+
+
+def test_cambiar_el_perfilado_durante_una_consulta(tabla):
+    # Las funciones SQL corren a mitad de la consulta: simulan a otro hilo que
+    # activa o desactiva el perfilado mientras esta se ejecuta.
+    tabla.conn.create_function("activar", 0, lambda: tabla.activar_perfilado(umbral_lento_ms=10_000) and 1)
+    tabla.conn.create_function("desactivar", 0, lambda: tabla.desactivar_perfilado() or 1)
+
+    tabla.fetch_query("SELECT activar() AS x")
+    profiler = tabla.profiler
+    # Empezó sin perfilado: no se registra (ni con una duración medida desde 0)
+    assert profiler.resumen() == []
+
+    tabla.fetch_query("SELECT desactivar() AS x")
+    assert tabla.profiler is None
+    # Empezó con el perfilado activo: se registra en el perfilador de ese momento
+    assert [f["consulta"] for f in profiler.resumen()] == ["SELECT desactivar() AS x"]
+
+# --- Consultas cancelables ---
+
+def _cancelar_en(evento, segundos):
+    temporizador = threading.Timer(segundos, evento.set)
+    temporizador.start()
+    return temporizador
+
+
+def test_consulta_cancelada_desde_otro_hilo(sql_manager):
+    evento = threading.Event()
+    _cancelar_en(evento, 0.1)
+
+    inicio = time.monotonic()
+    with pytest.raises(ConsultaCanceladaError):
+        with sql_manager.consulta_cancelable(evento):
+            sql_manager.fetch_query(CONSULTA_LENTA)
+
+    assert time.monotonic() - inicio < 2
+    # La conexión del hilo sigue sirviendo, y ya sin progress handler
+    assert sql_manager.fetch_query("SELECT 1 AS uno") == [{"uno": 1}]
+
+
+def test_fetch_iter_cancelado(sql_manager):
+    evento = threading.Event()
+    _cancelar_en(evento, 0.1)
+    with pytest.raises(ConsultaCanceladaError):
+        with sql_manager.consulta_cancelable(evento):
+            list(sql_manager.fetch_iter(CONSULTA_LENTA))
+
+
+def test_evento_ya_activo_no_ejecuta_la_consulta(sql_manager):
+    evento = threading.Event()
+    evento.set()
+    with pytest.raises(ConsultaCanceladaError):
+        with sql_manager.consulta_cancelable(evento):
+            pytest.fail("El bloque no debería ejecutarse")
+
+
+def test_sin_cancelar_devuelve_el_resultado(sql_manager):
+    evento = threading.Event()
+    with sql_manager.consulta_cancelable(evento):
+        resultado = sql_manager.fetch_query(
+            "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 100000) "
+            "SELECT COUNT(*) AS total FROM n"
+        )
+    assert resultado == [{"total": 100000}]
+
+
+def test_bloques_anidados(sql_manager):
+    exterior, interior = threading.Event(), threading.Event()
+    with sql_manager.consulta_cancelable(exterior):
+        with sql_manager.consulta_cancelable(interior):
+            pass
+        # Al salir del bloque interior vuelve a mandar el evento exterior
+        _cancelar_en(exterior, 0.1)
+        with pytest.raises(ConsultaCanceladaError):
+            sql_manager.fetch_query(CONSULTA_LENTA)
+
+
+def test_error_sql_no_se_confunde_con_cancelacion(sql_manager):
+    with sql_manager.consulta_cancelable(threading.Event()):
+        assert sql_manager.fetch_query("SELECT * FROM tabla_inexistente") == []
+
+
+def test_busqueda_cancelable(data_manager):
+    evento = threading.Event()
+    evento.set()
+    with pytest.raises(ConsultaCanceladaError):
+        BookService(data_manager, book_info_service=None).buscar_libros("borges", cancelado=evento)